@@ -47,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'predictions.utils.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
@@ -93,6 +94,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+# The live/ event stream needs an ASGI server, e.g. `uvicorn backend.asgi:application`
+ASGI_APPLICATION = 'backend.asgi.application'
 
 
 # Database
@@ -148,4 +151,69 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
\ No newline at end of file
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Poacher model inference (predictions.machine_learning.xgb_engine)
+XGB_NTHREAD = 0  # 0 lets XGBoost use every available core
+XGB_THRESHOLD = 0.5
+
+# Columnar float32 copy of AnimalMovement, partitioned by datetime and written by
+# import_data (predictions.utils.feature_store); None reads batches from the database.
+FEATURE_STORE_DIR = BASE_DIR / 'var' / 'feature_store'
+
+# Optional JSON file of camera zones {"Z01": [min_lat, max_lat, min_lon, max_lon], ...};
+# the zones built into predictions.machine_learning.zone_mapper are used when unset.
+CAMERA_ZONES_FILE = None
+
+# Camera-trap image model (predictions.machine_learning.predictor): 'keras' runs
+# ensemble_model.keras, 'tflite' the artifact written by `manage.py export_image_model`,
+# 'cascade' the EfficientNetB0 member first and the ensemble only when it is unsure.
+IMAGE_CLASSIFIER_BACKEND = 'keras'
+IMAGE_CLASSIFIER_THREADS = None  # TFLite interpreter threads; None lets it decide
+CASCADE_THRESHOLD = 0.9  # fast-model top probability needed to skip the ensemble
+CASCADE_FAST_LAYER = 'efficientnetb0_ft'  # member used when efficientnetb0_ft.keras is absent
+
+# Preprocessed camera images (predictions.machine_learning.image_cache). Set
+# DIRECTORY to None to keep only the in-memory tier; DISK_MAX_BYTES caps the
+# .npy files under it (about 150 KB each), least recently used deleted first,
+# None for no cap; REDUCED_DECODE False decodes every JPEG at full size before
+# resizing, as the training code did.
+IMAGE_CACHE = {
+    'MEMORY_ITEMS': 512,
+    'DIRECTORY': BASE_DIR / 'var' / 'image_cache',
+    'DISK_MAX_BYTES': 2 * 1024 ** 3,
+    'REDUCED_DECODE': True,
+}
+
+# Local SQLite memo of image model outputs keyed by image and model file hashes
+# (predictions.machine_learning.classification_memo); None disables it.
+CLASSIFICATION_MEMO = BASE_DIR / 'var' / 'classifications.sqlite3'
+
+# Live dashboard feed (predictions.utils.live_feed)
+LIVE_FEED_POLL_INTERVAL = 0.5  # seconds between checks for newly committed events
+LIVE_FEED_RETENTION_DAYS = 7  # events older than this are deleted as batches commit; None keeps them
+
+# Poaching history API (predictions.utils.history): rows per page by default and
+# the most a client may ask for with ?page_size=
+HISTORY_PAGE_SIZE = 20
+HISTORY_MAX_PAGE_SIZE = 100
+
+# Instrumentation (predictions.utils.metrics), exposed in the Prometheus text format
+# at metrics/ to the listed client addresses (None allows any). JSON_DUMP, if set,
+# is a file every process rewrites every DUMP_INTERVAL seconds; '{pid}' in it is
+# replaced by the process id.
+METRICS = {
+    'ALLOWED_IPS': ['127.0.0.1', '::1'],
+    'JSON_DUMP': None,
+    'DUMP_INTERVAL': 60,
+}
+
+# Batch result publication (predictions.utils.events). Use the "file" backend
+# with OPTIONS {'path': BASE_DIR / 'var' / 'results.jsonl'} so other processes can
+# subscribe by tailing the spool.
+RESULT_BUS = {
+    'BACKEND': 'memory',
+    'OPTIONS': {},
+    'QUEUE_SIZE': 100,
+    'PUT_TIMEOUT': 1.0,  # seconds a batch waits on a full queue before dropping
+}
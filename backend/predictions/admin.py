@@ -1,6 +1,8 @@
 from django.contrib import admin
 from .models import AnimalMovement
 from .models import PredictionResult
+from .models import BatchSnapshot
 
 admin.site.register(AnimalMovement)
-admin.site.register(PredictionResult)
\ No newline at end of file
+admin.site.register(PredictionResult)
+admin.site.register(BatchSnapshot)
\ No newline at end of file
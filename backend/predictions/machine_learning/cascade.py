@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CascadeDecision:
+    confidence: float   # top probability from the fast model
+    escalated: bool     # whether the full ensemble was run as well
+    agreed: object      # fast and full top-1 match; None when not escalated
+    fast_time: float    # seconds per image spent in the fast model
+    full_time: float    # seconds per image spent in the full ensemble
+
+
+def cascade_outputs(fast_probs, full_probs, threshold):
+    """
+    What the cascade returns for precomputed outputs of both models: the
+    fast model's probabilities where its top class reaches ``threshold``,
+    the ensemble's elsewhere. Used by the benchmark to sweep thresholds.
+    """
+    escalated = fast_probs.max(axis=1) < threshold
+    return np.where(escalated[:, None], full_probs, fast_probs), escalated
+
+
+class CascadeClassifier:
+    """
+    Early-exit inference: every image goes through the cheap model first
+    (the EfficientNetB0 member), and only those whose top probability is
+    below ``threshold`` are re-scored by the full ensemble.
+    """
+
+    def __init__(self, fast, full, threshold=0.9, history=1000):
+        self.fast = fast
+        self.full = full
+        self.threshold = threshold
+        self.decisions = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def predict(self, batch, **kwargs):
+        start = time.perf_counter()
+        probs = np.array(self.fast.predict(batch, verbose=0))
+        fast_time = (time.perf_counter() - start) / len(batch)
+
+        confidence = probs.max(axis=1)
+        escalated = confidence < self.threshold
+        full_probs, full_time = None, 0.0
+        if escalated.any():
+            start = time.perf_counter()
+            full_probs = np.asarray(self.full.predict(batch[escalated], verbose=0))
+            full_time = (time.perf_counter() - start) / int(escalated.sum())
+
+        fast_labels = probs.argmax(axis=1)
+        decisions = []
+        full_rows = iter(full_probs if full_probs is not None else ())
+        for index, conf in enumerate(confidence):
+            agreed = None
+            if escalated[index]:
+                row = next(full_rows)
+                agreed = bool(row.argmax() == fast_labels[index])
+                probs[index] = row
+            decision = CascadeDecision(float(conf), bool(escalated[index]), agreed,
+                                       fast_time, full_time if escalated[index] else 0.0)
+            decisions.append(decision)
+            logger.debug("cascade %s", decision)
+
+        with self._lock:
+            self.decisions.extend(decisions)
+        return probs
+
+    def summary(self):
+        with self._lock:
+            decisions = list(self.decisions)
+        if not decisions:
+            return {"images": 0}
+        escalated = [d for d in decisions if d.escalated]
+        return {
+            "images": len(decisions),
+            "threshold": self.threshold,
+            "early_exit_rate": 1 - len(escalated) / len(decisions),
+            "agreement_when_escalated": (
+                sum(d.agreed for d in escalated) / len(escalated) if escalated else None
+            ),
+            "avg_ms_per_image": 1000 * sum(d.fast_time + d.full_time for d in decisions) / len(decisions),
+        }
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from predictions.machine_learning.predictor import image_model_signature
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ClassificationMemo:
+    """
+    Image model outputs stored in a local SQLite file, keyed by the SHA-256
+    of the image bytes and of the model artifact. The same picture under a
+    different name hits; retraining ``ensemble_model.keras``, switching the
+    image backend or changing its options misses everything stored for the
+    previous model. Those entries stay, so switching back hits again, until
+    ``prune`` (the ``prune_classification_memo`` command) removes them.
+    """
+
+    def __init__(self, path, model_hash=None):
+        self.path = str(path)
+        self.counts = {"hits": 0, "misses": 0, "stored": 0}
+        self._model_hash = model_hash
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS classifications ("
+                " image_hash TEXT NOT NULL,"
+                " model_hash TEXT NOT NULL,"
+                " probabilities TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " PRIMARY KEY (image_hash, model_hash))"
+            )
+
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @property
+    def model_hash(self):
+        # Hashed once per process, matching the model instance the registry keeps loaded
+        if self._model_hash is None:
+            files, options = image_model_signature()
+            signature = [file_digest(path) for path in files] + [options]
+            self._model_hash = hashlib.sha256(json.dumps(signature, sort_keys=True).encode()).hexdigest()
+        return self._model_hash
+
+    def lookup(self, image_hashes):
+        """Maps each known image hash to its stored probability vector."""
+        image_hashes = list(dict.fromkeys(image_hashes))
+        found = {}
+        conn = self._connection()
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(image_hashes), 500):
+            chunk = image_hashes[start:start + 500]
+            rows = conn.execute(
+                f"SELECT image_hash, probabilities FROM classifications"
+                f" WHERE model_hash = ? AND image_hash IN ({','.join('?' * len(chunk))})",
+                [self.model_hash, *chunk],
+            )
+            found.update((image_hash, np.array(json.loads(probs))) for image_hash, probs in rows)
+        with self._lock:
+            self.counts["hits"] += len(found)
+            self.counts["misses"] += len(image_hashes) - len(found)
+        return found
+
+    def store(self, outputs):
+        """Saves ``image_hash -> probability vector`` pairs for the current model."""
+        if not outputs:
+            return
+        now = time.time()
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO classifications VALUES (?, ?, ?, ?)",
+                [
+                    (image_hash, self.model_hash, json.dumps([float(p) for p in probs]), now)
+                    for image_hash, probs in outputs.items()
+                ],
+            )
+        with self._lock:
+            self.counts["stored"] += len(outputs)
+
+    def prune(self, older_than=None):
+        """
+        Deletes entries made by other models, only those stored before the
+        ``older_than`` epoch time when given; returns how many.
+        """
+        query, params = "DELETE FROM classifications WHERE model_hash != ?", [self.model_hash]
+        if older_than is not None:
+            query, params = query + " AND created_at < ?", params + [older_than]
+        with self._connection() as conn:
+            return conn.execute(query, params).rowcount
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+_memo = None
+_memo_lock = threading.Lock()
+
+
+def get_classification_memo():
+    """The memo at ``settings.CLASSIFICATION_MEMO``, or None when disabled."""
+    global _memo
+    path = getattr(settings, 'CLASSIFICATION_MEMO', None)
+    if path and _memo is None:
+        with _memo_lock:
+            if _memo is None:
+                _memo = ClassificationMemo(path)
+    return _memo
@@ -0,0 +1,167 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from predictions.models import AnimalMovement
+
+_FIELDS = [field.attname for field in AnimalMovement._meta.concrete_fields]
+
+# Per-fix measurements the rolling statistics are computed over (speed, SCL*, sp*, MURHO*, centr_ta_*, ...)
+BASE_FEATURES = [name[len('currentmean_'):] for name in _FIELDS if name.startswith('currentmean_')]
+WINDOWS = (10, 20)
+# Derived column prefixes, in the order ``FeatureEngine.update`` returns them
+STATISTICS = ['currentmean', 'currentsd'] + [
+    f'{kind}{window}{stat}' for kind in ('past', 'diff') for window in WINDOWS for stat in ('mean', 'sd')
+]
+DERIVED_COLUMNS = [f'{stat}_{feature}' for stat in STATISTICS for feature in BASE_FEATURES]
+# Ring buffer length: the longest window plus the current fix, for when windows exclude it
+RING = max(WINDOWS) + 1
+
+
+class FeatureEngine:
+    """
+    Streaming computation of the rolling movement features, one GPS fix at
+    a time, with per-animal state held in fixed-size numpy arrays:
+
+    * ``currentmean_X`` / ``currentsd_X``: mean and standard deviation of X
+      over every fix of the animal so far (Welford's update).
+    * ``pastNmean_X`` / ``pastNsd_X``: the same over its last N fixes, read
+      from a ring buffer of the last ``RING`` values.
+    * ``diffNmean_X`` / ``diffNsd_X``: current statistic minus the past-N one.
+
+    Work per fix is bounded by the window size, never by the history length.
+    ``ddof`` and ``window_includes_current`` pick the conventions the
+    offline computation used; ``verify_feature_engine`` checks them against
+    the stored columns. Statistics that are undefined for an animal's first
+    fixes come out as ``fill_value``, since AnimalMovement has no NULLs.
+    """
+
+    def __init__(self, ddof=1, window_includes_current=True, fill_value=0.0, capacity=1024):
+        self.ddof = ddof
+        self.window_includes_current = window_includes_current
+        self.fill_value = fill_value
+        self.slots = {}
+        n_features = len(BASE_FEATURES)
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.mean = np.zeros((capacity, n_features))
+        self.m2 = np.zeros((capacity, n_features))
+        self.ring = np.zeros((capacity, RING, n_features))
+        self.position = np.zeros(capacity, dtype=np.int64)
+
+    def _slots_for(self, animal_ids):
+        for animal_id in animal_ids:
+            if animal_id not in self.slots:
+                self.slots[animal_id] = len(self.slots)
+        needed = len(self.slots)
+        if needed > len(self.count):
+            grow = max(needed, 2 * len(self.count)) - len(self.count)
+            self.count = np.concatenate([self.count, np.zeros(grow, dtype=np.int64)])
+            self.position = np.concatenate([self.position, np.zeros(grow, dtype=np.int64)])
+            for name in ('mean', 'm2', 'ring'):
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate([array, np.zeros((grow,) + array.shape[1:])]))
+        return np.fromiter((self.slots[a] for a in animal_ids), dtype=np.int64, count=len(animal_ids))
+
+    def _window_stats(self, slots, window):
+        # Called after the current fix was stored; when it is excluded, start one slot further back
+        offset = 1 if self.window_includes_current else 2
+        filled = np.minimum(self.count[slots] - (offset - 1), RING - (offset - 1))
+        steps = np.arange(window)
+        index = (self.position[slots, None] - offset - steps) % RING
+        values = self.ring[slots[:, None], index]
+        valid = (steps[None, :] < np.minimum(filled, window)[:, None])[:, :, None]
+
+        k = valid.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(valid, values, 0.0).sum(axis=1) / k
+            squares = np.where(valid, (values - mean[:, None, :]) ** 2, 0.0).sum(axis=1)
+            sd = np.sqrt(squares / (k - self.ddof))
+        return mean, np.where(k > self.ddof, sd, np.nan)
+
+    def update(self, animal_ids, values):
+        """
+        Adds one fix for each animal in ``animal_ids`` (no repeats within a
+        call) and returns their derived features, shaped
+        ``(len(animal_ids), len(DERIVED_COLUMNS))``.
+        """
+        slots = self._slots_for(list(animal_ids))
+        values = np.asarray(values, dtype=np.float64)
+
+        self.count[slots] += 1
+        count = self.count[slots][:, None]
+        delta = values - self.mean[slots]
+        self.mean[slots] += delta / count
+        self.m2[slots] += delta * (values - self.mean[slots])
+        self.ring[slots, self.position[slots]] = values
+        self.position[slots] = (self.position[slots] + 1) % RING
+
+        current_mean = self.mean[slots]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            current_sd = np.sqrt(self.m2[slots] / (count - self.ddof))
+        current_sd = np.where(count > self.ddof, current_sd, np.nan)
+
+        blocks = [current_mean, current_sd]
+        diffs = []
+        for window in WINDOWS:
+            mean, sd = self._window_stats(slots, window)
+            blocks += [mean, sd]
+            diffs += [current_mean - mean, current_sd - sd]
+        derived = np.concatenate(blocks + diffs, axis=1)
+        if self.fill_value is not None:
+            derived[np.isnan(derived)] = self.fill_value
+        return derived
+
+    def update_frame(self, frame):
+        """
+        Fills ``DERIVED_COLUMNS`` of ``frame`` (needs ``animal_id``,
+        ``datetime`` and ``BASE_FEATURES``) by feeding its rows in time order.
+        Returns the frame with the derived columns set.
+        """
+        frame = frame.sort_values('datetime', kind='stable')
+        derived = np.empty((len(frame), len(DERIVED_COLUMNS)))
+        # One update per (timestamp, n-th fix of an animal at it), so no animal repeats within a call
+        repeat = frame.groupby(['datetime', 'animal_id'], sort=False).cumcount().to_numpy()
+        ids = frame['animal_id'].to_numpy()
+        base = frame[BASE_FEATURES].to_numpy(dtype=np.float64)
+        groups = pd.Series(np.arange(len(frame))).groupby([frame['datetime'].to_numpy(), repeat]).indices
+        for _, positions in sorted(groups.items()):
+            derived[positions] = self.update(ids[positions], base[positions])
+
+        derived = pd.DataFrame(derived, columns=DERIVED_COLUMNS, index=frame.index)
+        return pd.concat([frame.drop(columns=DERIVED_COLUMNS, errors='ignore'), derived], axis=1)
+
+    def save(self, path):
+        """
+        Persists the per-animal state so a live feed can resume after a
+        restart. The file is replaced atomically, never left half written.
+        """
+        n = len(self.slots)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            self._savez(f, n)
+        os.replace(tmp, path)
+
+    def _savez(self, f, n):
+        np.savez(
+            f,
+            animal_ids=np.array(list(self.slots)),
+            count=self.count[:n], mean=self.mean[:n], m2=self.m2[:n],
+            ring=self.ring[:n], position=self.position[:n],
+            options=np.array([self.ddof, int(self.window_includes_current)]),
+            fill_value=np.array(np.nan if self.fill_value is None else self.fill_value),
+        )
+
+    @classmethod
+    def load(cls, path):
+        state = np.load(path)
+        ddof, includes_current = state['options']
+        fill_value = float(state['fill_value'])
+        engine = cls(ddof=int(ddof), window_includes_current=bool(includes_current),
+                     fill_value=None if np.isnan(fill_value) else fill_value,
+                     capacity=max(len(state['animal_ids']), 1))
+        engine._slots_for(state['animal_ids'].tolist())
+        n = len(engine.slots)
+        for name in ('count', 'mean', 'm2', 'ring', 'position'):
+            getattr(engine, name)[:n] = state[name]
+        return engine
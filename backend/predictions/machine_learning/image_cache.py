@@ -0,0 +1,260 @@
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from django.conf import settings
+
+IMAGE_SIZE = 224
+
+# JPEG start-of-frame markers (0xC0-0xCF minus DHT, JPG and DAC) carry the image size
+_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def jpeg_size(path):
+    """(height, width) read from the JPEG frame header, or None if not a JPEG."""
+    with open(path, 'rb') as f:
+        if f.read(2) != b'\xff\xd8':
+            return None
+        while True:
+            byte = f.read(1)
+            if not byte:
+                return None
+            if byte != b'\xff':
+                continue
+            marker = f.read(1)
+            while marker == b'\xff':
+                marker = f.read(1)
+            if not marker or marker[0] in (0xD8, 0xD9, 0x01) or 0xD0 <= marker[0] <= 0xD7:
+                continue  # markers without a length field
+            length = struct.unpack('>H', f.read(2))[0]
+            if marker[0] in _SOF_MARKERS:
+                _precision, height, width = struct.unpack('>BHH', f.read(5))
+                return height, width
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def decode_image(path, reduced=True):
+    """
+    Decodes ``path`` to a 224x224 BGR uint8 array. With ``reduced``, a JPEG
+    large enough is decoded at 1/2, 1/4 or 1/8 scale by libjpeg first, which
+    skips most of the IDCT work for the full-size frame.
+    """
+    flag = cv2.IMREAD_COLOR
+    size = jpeg_size(path) if reduced else None
+    if size:
+        for factor, reduced_flag in _REDUCED_FLAGS:
+            if min(size) // factor >= IMAGE_SIZE:
+                flag = reduced_flag
+                break
+
+    image = cv2.imread(path, flag)
+    if image is None:
+        raise ValueError(f"Could not read image: {path}")
+    return cv2.resize(image, (IMAGE_SIZE, IMAGE_SIZE))
+
+
+class ImageCache:
+    """
+    Preprocessed 224x224 tensors keyed by image path, mtime and size, so a
+    replaced file is never served stale.
+
+    Lookups try an LRU of recent arrays, then ``.npy`` files under
+    ``directory`` opened as read-only memory maps, and only decode the JPEG
+    on a miss. Cached arrays are read-only and shared between callers.
+
+    With ``max_disk_bytes`` set, disk hits refresh a file's mtime and the
+    least recently used files are deleted once the directory outgrows it.
+    """
+
+    def __init__(self, max_items=512, directory=None, reduced=True, max_disk_bytes=None):
+        self.max_items = max_items
+        self.directory = str(directory) if directory else None
+        self.reduced = reduced
+        self.max_disk_bytes = max_disk_bytes
+        self.counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0,
+                       "disk_evictions": 0, "errors": 0}
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._trim_lock = threading.Lock()
+        # Bytes under directory, counted on the first write and recounted by every trim
+        self._disk_bytes = None
+
+    def key(self, path):
+        stat = os.stat(path)
+        ident = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{int(self.reduced)}"
+        return hashlib.sha1(ident.encode()).hexdigest()
+
+    def get(self, path):
+        try:
+            key = self.key(path)
+        except OSError:
+            self._count("errors")
+            raise
+
+        with self._lock:
+            array = self._items.get(key)
+            if array is not None:
+                self._items.move_to_end(key)
+                self.counts["memory_hits"] += 1
+                return array
+
+        array = self._read_disk(key)
+        if array is not None:
+            self._count("disk_hits")
+        else:
+            self._count("misses")
+            try:
+                array = decode_image(path, self.reduced)
+            except Exception:
+                self._count("errors")
+                raise
+            array.flags.writeable = False
+            self._write_disk(key, array)
+
+        self._remember(key, array)
+        return array
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self.counts)
+            counts["memory_items"] = len(self._items)
+        lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+        counts["hit_rate"] = (counts["memory_hits"] + counts["disk_hits"]) / lookups if lookups else 0.0
+        return counts
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def _count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def _remember(self, key, array):
+        with self._lock:
+            self._items[key] = array
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.counts["evictions"] += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.npy')
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        path = self._disk_path(key)
+        try:
+            array = np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        if self.max_disk_bytes:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return array
+
+    def _write_disk(self, key, array):
+        if not self.directory:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so concurrent readers never map a half-written file
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp, path)
+        if self.max_disk_bytes:
+            self._account_disk(os.path.getsize(path))
+
+    def _account_disk(self, size):
+        if self._disk_bytes is None:
+            # The first count already includes the file just written
+            total = sum(entry[1] for entry in self._disk_entries())
+            with self._lock:
+                self._disk_bytes = total
+        else:
+            with self._lock:
+                self._disk_bytes += size
+        if self._disk_bytes > self.max_disk_bytes:
+            self.trim_disk()
+
+    def _disk_entries(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.npy'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return entries
+
+    def trim_disk(self, target=None):
+        """
+        Deletes the least recently used ``.npy`` files until the directory
+        holds at most ``target`` bytes (90% of ``max_disk_bytes`` by default,
+        so a full cache isn't rescanned on every write). Returns how many
+        files were deleted.
+        """
+        if not self.directory:
+            return 0
+        if target is None:
+            target = int(self.max_disk_bytes * 0.9)
+        # Another thread already trimming will bring the total down
+        if not self._trim_lock.acquire(blocking=False):
+            return 0
+        try:
+            entries = sorted(self._disk_entries())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    # Gone already, or still mapped by a reader on Windows
+                    continue
+                total -= size
+                removed += 1
+            with self._lock:
+                self._disk_bytes = total
+                self.counts["disk_evictions"] += removed
+            return removed
+        finally:
+            self._trim_lock.release()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache():
+    """The process-wide cache configured by ``settings.IMAGE_CACHE``."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = getattr(settings, 'IMAGE_CACHE', {})
+                _cache = ImageCache(
+                    max_items=config.get("MEMORY_ITEMS", 512),
+                    directory=config.get("DIRECTORY"),
+                    reduced=config.get("REDUCED_DECODE", True),
+                    max_disk_bytes=config.get("DISK_MAX_BYTES"),
+                )
+    return _cache
@@ -1,19 +1,48 @@
-import pickle
-import tensorflow as tf
-import numpy as np
+import os
+from django.conf import settings
+from predictions.machine_learning.registry import get_model, registry
+from predictions.utils.metrics import IMAGE_PREDICT_IMAGES, IMAGE_PREDICT_SECONDS
 
-def load_model(path="predictions/machine_learning/models/xgboost_poacher_model.pkl"):
-    with open(path, "rb") as f:
-        model = pickle.load(f)
-        return model
+class_names = ['elephant', 'poacher', 'rhino']
 
-def run_prediction(model, data):
-    return model.predict(data)
+# settings.IMAGE_CLASSIFIER_BACKEND -> registry artifact serving it
+IMAGE_BACKENDS = {
+    'keras': 'ensemble_model',
+    'tflite': 'ensemble_tflite',
+    'cascade': 'ensemble_cascade',
+}
+
+
+def image_model_name():
+    return IMAGE_BACKENDS[getattr(settings, 'IMAGE_CLASSIFIER_BACKEND', 'keras')]
+
+
+def serving_models():
+    """Registry artifacts the batch path scores with under the current settings."""
+    return ['feature_pipeline', 'xgb_booster', image_model_name()]
+
+
+def image_model_signature():
+    """
+    Artifact files and options that determine what the configured image
+    model outputs, so caches of its results can tell when they go stale.
+    """
+    name = image_model_name()
+    if name != 'ensemble_cascade':
+        return [registry.path(name)], {}
+    files = [path for path in (registry.path('ensemble_fast'), registry.path('ensemble_model'))
+             if os.path.exists(path)]
+    return files, {
+        "threshold": getattr(settings, 'CASCADE_THRESHOLD', 0.9),
+        "fast_layer": getattr(settings, 'CASCADE_FAST_LAYER', 'efficientnetb0_ft'),
+    }
 
 
-    
-path= 'C:/Users/HP/Documents/EcoGuard Trials/movement data/saved models/final_ensemble_model.keras'
-ensemble_model = tf.keras.models.load_model(path)
-class_names = ['elephant', 'poacher', 'rhino']
 def image_classifier(image):
-    return ensemble_model.predict(image)
\ No newline at end of file
+    # The configured model (and its runtime with it) loads on the first call
+    name = image_model_name()
+    model = get_model(name)
+    with IMAGE_PREDICT_SECONDS.time((name,)):
+        predictions = model.predict(image)
+    IMAGE_PREDICT_IMAGES.inc(len(image), (name,))
+    return predictions
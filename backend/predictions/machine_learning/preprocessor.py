@@ -1,19 +1,23 @@
+import glob
+import os
 import pandas as pd
-import joblib
-import tensorflow as tf
 import numpy as np
 import cv2  # Added for fallback processing
+from predictions.machine_learning.image_cache import decode_image, get_image_cache
+from predictions.machine_learning.registry import get_model
+from predictions.utils.metrics import IMAGE_DECODE_SECONDS
 
-# Load saved scaler and encoders
-scaler = joblib.load("predictions/machine_learning/mappings/standard_scaler.pkl")
-le_sex = joblib.load("predictions/machine_learning/mappings/label_encoder_sex.pkl")
-le_tod = joblib.load("predictions/machine_learning/mappings/label_encoder_tod.pkl")
+DROP_COLUMNS = ['species', 'animal_id', 'id', 'datetime', 'latitude', 'longtitude']
 
 def data_prep(df):
+    # Saved scaler and encoders, loaded once on first use
+    scaler = get_model('standard_scaler')
+    le_sex = get_model('label_encoder_sex')
+    le_tod = get_model('label_encoder_tod')
+
     data = df.copy()
     # Drop unwanted columns
-    data = data.drop(columns=['species', 'animal_id', 'id',
-                             'datetime', 'latitude', 'longtitude'], errors='ignore')
+    data = data.drop(columns=DROP_COLUMNS, errors='ignore')
     
     num_cols = data.select_dtypes(include=['number']).columns
     data[num_cols] = scaler.transform(data[num_cols])
@@ -24,9 +28,96 @@ def data_prep(df):
     
     return data
 
+
+class FeaturePipeline:
+    """
+    Compiled equivalent of ``data_prep``.
+
+    Mean/scale vectors and category lookup tables are taken from the fitted
+    scaler and label encoders once; ``transform`` then fills a single
+    preallocated matrix instead of copying the frame at every step.
+    """
+
+    def __init__(self, scaler, le_sex, le_tod):
+        self.scaled_columns = list(scaler.feature_names_in_)
+        n = len(self.scaled_columns)
+        self.mean = np.zeros(n) if scaler.mean_ is None else np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.ones(n) if scaler.scale_ is None else np.asarray(scaler.scale_, dtype=np.float64)
+        self.lookups = {
+            'sex': {label: code for code, label in enumerate(le_sex.classes_)},
+            'ToD': {label: code for code, label in enumerate(le_tod.classes_)},
+        }
+        self._plans = {}
+
+    @classmethod
+    def from_registry(cls):
+        return cls(get_model('standard_scaler'), get_model('label_encoder_sex'), get_model('label_encoder_tod'))
+
+    def output_columns(self, columns):
+        return [c for c in columns if c not in DROP_COLUMNS]
+
+    def _plan(self, columns):
+        # Output positions of the scaled block and of each categorical column
+        key = tuple(columns)
+        if key not in self._plans:
+            position = {c: i for i, c in enumerate(columns)}
+            missing = [c for c in self.scaled_columns + list(self.lookups) if c not in position]
+            extra = [c for c in columns if c not in self.lookups and c not in self.scaled_columns]
+            if missing or extra:
+                raise ValueError(f"Feature columns do not match the fitted scaler: missing {missing}, unexpected {extra}")
+            scaled_idx = np.array([position[c] for c in self.scaled_columns])
+            self._plans[key] = (scaled_idx, {c: position[c] for c in self.lookups})
+        return self._plans[key]
+
+    def encode(self, column, values):
+        lookup = self.lookups[column]
+        try:
+            return np.fromiter((lookup[str(v)] for v in values), dtype=np.int64, count=len(values))
+        except KeyError as e:
+            raise ValueError(f"y contains previously unseen labels: {e.args[0]!r}") from None
+
+    def transform(self, df, columns=None, dtype=np.float64):
+        """
+        Turns raw rows into the model input matrix. ``columns`` fixes the
+        output order (defaults to the frame order, as ``data_prep`` does).
+        """
+        columns = list(columns) if columns is not None else self.output_columns(df.columns)
+        scaled_idx, categorical_idx = self._plan(columns)
+
+        out = np.empty((len(df), len(columns)), dtype=dtype)
+        block = df[self.scaled_columns].to_numpy(dtype=np.float64, copy=True)
+        block -= self.mean
+        block /= self.scale
+        out[:, scaled_idx] = block
+        for column, idx in categorical_idx.items():
+            out[:, idx] = self.encode(column, df[column].to_numpy())
+        return out
+
 def preprocess_image(image):
-    image = cv2.imread(image)
-    img_resized = cv2.resize(image, (224, 224))
+    """
+    (1, 224, 224, 3) uint8 batch for the image at path ``image``, served from
+    the preprocessing cache when it was decoded before.
+    """
+    with IMAGE_DECODE_SECONDS.time():
+        img_resized = get_image_cache().get(image)
     img_array = np.expand_dims(img_resized, axis=0)
-    
+
     return img_array
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def labelled_images(folder, class_names=('elephant', 'poacher', 'rhino')):
+    """(path, class index) for every image under ``folder/<class name>/``."""
+    images = []
+    for index, name in enumerate(class_names):
+        for path in sorted(glob.glob(os.path.join(folder, name, '*'))):
+            if path.lower().endswith(IMAGE_EXTENSIONS):
+                images.append((path, index))
+    return images
+
+
+def load_tensor(path):
+    # Same decode and resize as preprocess_image, without filling the cache
+    return np.expand_dims(decode_image(path, get_image_cache().reduced), axis=0).astype(np.float32)
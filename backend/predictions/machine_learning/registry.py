@@ -0,0 +1,136 @@
+import os
+import pickle
+import threading
+import time
+
+from django.conf import settings
+
+
+def _load_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _load_joblib(path):
+    import joblib
+    return joblib.load(path)
+
+
+def _load_xgb_booster(path):
+    from predictions.machine_learning.xgb_engine import XGBoostEngine
+    return XGBoostEngine.load(
+        path,
+        nthread=getattr(settings, 'XGB_NTHREAD', 0),
+        threshold=getattr(settings, 'XGB_THRESHOLD', 0.5),
+    )
+
+
+def _load_feature_pipeline(path):
+    # Compiled from the scaler and encoders, which load through the registry too
+    from predictions.machine_learning.preprocessor import FeaturePipeline
+    return FeaturePipeline.from_registry()
+
+
+def _load_keras(path):
+    # TensorFlow is only imported by processes that actually classify images
+    import tensorflow as tf
+    return tf.keras.models.load_model(path)
+
+
+def _load_tflite(path):
+    from predictions.machine_learning.tflite_engine import TFLiteEngine
+    return TFLiteEngine.load(path, num_threads=getattr(settings, 'IMAGE_CLASSIFIER_THREADS', None))
+
+
+def _load_fast_member(path):
+    # A separately saved model wins; otherwise reuse the member inside the ensemble
+    if os.path.exists(path):
+        return _load_keras(path)
+    ensemble = registry.get('ensemble_model')
+    return ensemble.get_layer(getattr(settings, 'CASCADE_FAST_LAYER', 'efficientnetb0_ft'))
+
+
+def _load_cascade(path):
+    from predictions.machine_learning.cascade import CascadeClassifier
+    return CascadeClassifier(
+        registry.get('ensemble_fast'),
+        registry.get('ensemble_model'),
+        threshold=getattr(settings, 'CASCADE_THRESHOLD', 0.9),
+    )
+
+
+class ModelRegistry:
+    """
+    Lazily loads ML artifacts from paths relative to ``settings.BASE_DIR``.
+
+    Each artifact is loaded on first use, exactly once per process, and the
+    time it took is recorded so warm-up cost can be reported.
+    """
+
+    def __init__(self):
+        self._artifacts = {}
+        self._models = {}
+        self._load_times = {}
+        self._locks = {}
+
+    def register(self, name, relative_path, loader):
+        self._artifacts[name] = (relative_path, loader)
+        self._locks[name] = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(settings.BASE_DIR, self._artifacts[name][0])
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def get(self, name):
+        if name in self._models:
+            return self._models[name]
+        with self._locks[name]:
+            if name not in self._models:
+                loader = self._artifacts[name][1]
+                start = time.perf_counter()
+                model = loader(self.path(name))
+                self._load_times[name] = time.perf_counter() - start
+                self._models[name] = model
+        return self._models[name]
+
+    def warm_up(self, names):
+        """
+        Loads the given artifacts, and whatever they load in turn, and returns
+        the load times of everything loaded so far. There is no "all" default:
+        alternative backends such as the TFLite export need not exist.
+        """
+        for name in names:
+            self.get(name)
+        return self.load_times()
+
+    def load_times(self):
+        return dict(self._load_times)
+
+    def metrics(self):
+        return {
+            name: {
+                "path": self.path(name),
+                "loaded": self.is_loaded(name),
+                "load_time": self._load_times.get(name),
+            }
+            for name in self._artifacts
+        }
+
+
+registry = ModelRegistry()
+registry.register('xgb_model', 'predictions/machine_learning/models/xgboost_poacher_model.pkl', _load_pickle)
+registry.register('xgb_booster', 'predictions/machine_learning/models/xgb_model.json', _load_xgb_booster)
+registry.register('ensemble_model', 'predictions/machine_learning/models/ensemble_model.keras', _load_keras)
+registry.register('ensemble_tflite', 'predictions/machine_learning/models/ensemble_model.tflite', _load_tflite)
+registry.register('ensemble_fast', 'predictions/machine_learning/models/efficientnetb0_ft.keras', _load_fast_member)
+registry.register('ensemble_cascade', 'predictions/machine_learning/models/ensemble_model.keras', _load_cascade)
+registry.register('standard_scaler', 'predictions/machine_learning/mappings/standard_scaler.pkl', _load_joblib)
+registry.register('label_encoder_sex', 'predictions/machine_learning/mappings/label_encoder_sex.pkl', _load_joblib)
+registry.register('label_encoder_tod', 'predictions/machine_learning/mappings/label_encoder_tod.pkl', _load_joblib)
+registry.register('feature_pipeline', 'predictions/machine_learning/mappings/standard_scaler.pkl', _load_feature_pipeline)
+
+
+def get_model(name):
+    return registry.get(name)
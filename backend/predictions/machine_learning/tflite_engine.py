@@ -0,0 +1,61 @@
+import threading
+
+import numpy as np
+
+
+def _interpreter_class():
+    # The standalone runtimes are much lighter than TensorFlow on field servers
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class TFLiteEngine:
+    """
+    Runs an image model exported by ``export_image_model`` with the TFLite
+    interpreter. Takes and returns the same arrays as the Keras model's
+    ``predict``, so it can stand in for it behind ``image_classifier``.
+    """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.input = interpreter.get_input_details()[0]
+        self.output = interpreter.get_output_details()[0]
+        self._batch_size = None
+        # One interpreter holds one set of tensors: calls must not overlap
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, num_threads=None):
+        interpreter = _interpreter_class()(model_path=str(path), num_threads=num_threads)
+        return cls(interpreter)
+
+    def _quantize(self, batch):
+        scale, zero_point = self.input['quantization']
+        if self.input['dtype'] in (np.int8, np.uint8) and scale:
+            batch = np.round(batch / scale + zero_point)
+        return batch.astype(self.input['dtype'])
+
+    def _dequantize(self, output):
+        scale, zero_point = self.output['quantization']
+        if self.output['dtype'] in (np.int8, np.uint8) and scale:
+            return (output.astype(np.float32) - zero_point) * scale
+        return output
+
+    def predict(self, batch, **kwargs):
+        batch = self._quantize(np.asarray(batch, dtype=np.float32))
+        with self._lock:
+            if len(batch) != self._batch_size:
+                self.interpreter.resize_tensor_input(self.input['index'], batch.shape)
+                self.interpreter.allocate_tensors()
+                self._batch_size = len(batch)
+            self.interpreter.set_tensor(self.input['index'], batch)
+            self.interpreter.invoke()
+            output = self.interpreter.get_tensor(self.output['index']).copy()
+        return self._dequantize(output)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+
+class XGBoostEngine:
+    """
+    Scores feature matrices with the native XGBoost booster saved in
+    ``xgb_model.json``, bypassing the pickled sklearn wrapper and pandas.
+    """
+
+    def __init__(self, booster, nthread=0, threshold=0.5):
+        self.booster = booster
+        self.nthread = nthread
+        self.threshold = threshold
+        self.feature_names = booster.feature_names
+        if nthread:
+            booster.set_param({'nthread': nthread})
+
+    @classmethod
+    def load(cls, path, nthread=0, threshold=0.5):
+        import xgboost as xgb
+        booster = xgb.Booster()
+        booster.load_model(path)
+        return cls(booster, nthread=nthread, threshold=threshold)
+
+    def as_matrix(self, data):
+        """Contiguous float32 matrix in the column order the booster was trained on."""
+        if isinstance(data, pd.DataFrame) and self.feature_names:
+            data = data[self.feature_names]
+        return np.ascontiguousarray(data, dtype=np.float32)
+
+    def predict_proba(self, data, inplace=True):
+        matrix = self.as_matrix(data)
+        if inplace:
+            return self.booster.inplace_predict(matrix, validate_features=False)
+
+        import xgboost as xgb
+        dmatrix = xgb.DMatrix(matrix, nthread=self.nthread or -1)
+        return self.booster.predict(dmatrix, validate_features=False)
+
+    def labels(self, proba):
+        if proba.ndim == 2:
+            return proba.argmax(axis=1)
+        return (proba > self.threshold).astype(np.int64)
+
+    def predict(self, data, inplace=True):
+        return self.labels(self.predict_proba(data, inplace=inplace))
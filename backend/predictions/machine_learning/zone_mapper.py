@@ -1,4 +1,5 @@
-
+import json
+import numpy as np
 
 zones = {
     # Format: "ZoneID": [min_latitude, max_latitude, min_longitude, max_longitude]
@@ -14,12 +15,150 @@ zones = {
     "Z10": [-20.9, -20.8, 31.9, 32.0]
 }
 
+
+def _grid_offset(value, origin, cell_size):
+    """
+    Cell offset of ``value`` along one axis, for scalars or arrays. Grid
+    sizing, zone placement and point lookups all go through it so floating
+    point rounding can't make them disagree.
+    """
+    return np.floor((value - origin) / cell_size)
+
+
+class ZoneIndex:
+    """
+    Uniform grid over the zone bounding boxes for constant-time lookups.
+
+    Each grid cell lists the zones whose box overlaps it, in definition
+    order, so results match the linear scan exactly: bounds are inclusive
+    and the first zone listed wins where boxes touch or overlap.
+    """
+
+    def __init__(self, zones, cell_size=None, max_cells=1_000_000):
+        self.ids = list(zones)
+        self.bounds = np.array([zones[z] for z in self.ids], dtype=np.float64).reshape(-1, 4)
+        min_lat, max_lat, min_lon, max_lon = self.bounds.T
+
+        if not self.ids:
+            self.lat0 = self.lon0 = 0.0
+            self.cell_size, self.rows, self.cols = 1.0, 0, 0
+            self.candidates = np.full((0, 1), -1, dtype=np.int64)
+            return
+
+        self.lat0, self.lon0 = min_lat.min(), min_lon.min()
+        self.lat1, self.lon1 = max_lat.max(), max_lon.max()
+        if cell_size is None:
+            # Roughly one zone per cell for evenly sized zones
+            spans = np.maximum(max_lat - min_lat, max_lon - min_lon)
+            cell_size = float(np.median(spans)) or 1.0
+        while True:
+            self.rows = int(_grid_offset(self.lat1, self.lat0, cell_size)) + 1
+            self.cols = int(_grid_offset(self.lon1, self.lon0, cell_size)) + 1
+            if self.rows * self.cols <= max_cells:
+                break
+            cell_size *= 2
+        self.cell_size = cell_size
+
+        # Zones overlapping each cell, computed with the same floor() used for points
+        cells = [[] for _ in range(self.rows * self.cols)]
+        for z, (zmin_lat, zmax_lat, zmin_lon, zmax_lon) in enumerate(self.bounds):
+            r0, c0 = self._cell(zmin_lat, zmin_lon)
+            r1, c1 = self._cell(zmax_lat, zmax_lon)
+            for r in range(r0, r1 + 1):
+                for c in range(c0, c1 + 1):
+                    cells[r * self.cols + c].append(z)
+
+        self._cells = cells
+        self._bounds = [tuple(b) for b in self.bounds.tolist()]
+        width = max(1, max(len(c) for c in cells))
+        self.candidates = np.full((len(cells), width), -1, dtype=np.int64)
+        for i, zone_list in enumerate(cells):
+            self.candidates[i, :len(zone_list)] = zone_list
+
+    def _cell(self, lat, lon):
+        r = int(_grid_offset(lat, self.lat0, self.cell_size))
+        c = int(_grid_offset(lon, self.lon0, self.cell_size))
+        return min(max(r, 0), self.rows - 1), min(max(c, 0), self.cols - 1)
+
+    def lookup(self, lat, lon):
+        if not self.ids or not (self.lat0 <= lat <= self.lat1 and self.lon0 <= lon <= self.lon1):
+            return None
+        r, c = self._cell(lat, lon)
+        for z in self._cells[r * self.cols + c]:
+            min_lat, max_lat, min_lon, max_lon = self._bounds[z]
+            if (min_lat <= lat <= max_lat) and (min_lon <= lon <= max_lon):
+                return self.ids[z]
+        return None
+
+    def lookup_indices(self, lats, lons):
+        """Zone positions for whole coordinate arrays, -1 where outside every zone."""
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        result = np.full(lats.shape, -1, dtype=np.int64)
+        if not self.ids:
+            return result
+
+        inside = (lats >= self.lat0) & (lats <= self.lat1) & (lons >= self.lon0) & (lons <= self.lon1)
+        idx = np.nonzero(inside)[0]
+        lat, lon = lats[idx], lons[idx]
+        rows = np.clip(_grid_offset(lat, self.lat0, self.cell_size).astype(np.int64), 0, self.rows - 1)
+        cols = np.clip(_grid_offset(lon, self.lon0, self.cell_size).astype(np.int64), 0, self.cols - 1)
+        candidates = self.candidates[rows * self.cols + cols]
+
+        found = np.full(len(idx), -1, dtype=np.int64)
+        # Walk candidate slots in order; the first matching zone per point wins
+        for slot in range(candidates.shape[1]):
+            z = candidates[:, slot]
+            open_ = (found < 0) & (z >= 0)
+            if not open_.any():
+                break
+            b = self.bounds[np.where(z >= 0, z, 0)]
+            hit = open_ & (b[:, 0] <= lat) & (lat <= b[:, 1]) & (b[:, 2] <= lon) & (lon <= b[:, 3])
+            found[hit] = z[hit]
+
+        result[idx] = found
+        return result
+
+    def lookup_many(self, lats, lons):
+        """Zone ids for whole coordinate arrays, None where outside every zone."""
+        ids = np.array(self.ids + [None], dtype=object)
+        return ids[self.lookup_indices(lats, lons)]
+
+
+def load_zones(path):
+    """
+    Reads zones from a JSON file mapping zone id to
+    [min_latitude, max_latitude, min_longitude, max_longitude].
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+_zone_index = None
+
+
+def get_zone_index():
+    """
+    Index over ``settings.CAMERA_ZONES_FILE`` when set, else the built-in zones.
+    """
+    global _zone_index
+    if _zone_index is None:
+        from django.conf import settings
+        path = getattr(settings, 'CAMERA_ZONES_FILE', None)
+        _zone_index = ZoneIndex(load_zones(path) if path else zones)
+    return _zone_index
+
+
 def coordinate_to_zone(lat, lon):
     """
     Maps coordinates to a zone ID (e.g., "Z01").
     Returns None if outside all zones.
     """
-    for zone_id, (min_lat, max_lat, min_lon, max_lon) in zones.items():
-        if (min_lat <= lat <= max_lat) and (min_lon <= lon <= max_lon):
-            return zone_id
-    return None
\ No newline at end of file
+    return get_zone_index().lookup(lat, lon)
+
+
+def coordinates_to_zones(lats, lons):
+    """
+    Bulk version of coordinate_to_zone for latitude/longitude arrays.
+    """
+    return get_zone_index().lookup_many(lats, lons).tolist()
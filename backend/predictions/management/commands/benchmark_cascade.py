@@ -0,0 +1,87 @@
+import json
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.machine_learning.cascade import cascade_outputs
+from predictions.machine_learning.predictor import class_names
+from predictions.machine_learning.preprocessor import labelled_images, load_tensor
+from predictions.machine_learning.registry import get_model
+
+DEFAULT_THRESHOLDS = "0.5,0.6,0.7,0.8,0.9,0.95,0.99"
+
+
+def timed_predict(model, images, batch_size):
+    """Probabilities for every image and the mean model time per image."""
+    outputs, elapsed = [], 0.0
+    for start in range(0, len(images), batch_size):
+        batch = np.concatenate([load_tensor(path) for path, _ in images[start:start + batch_size]])
+        began = time.perf_counter()
+        outputs.append(np.asarray(model.predict(batch, verbose=0)))
+        elapsed += time.perf_counter() - began
+    return np.concatenate(outputs), elapsed / len(images)
+
+
+class Command(BaseCommand):
+    help = "Accuracy and throughput of cascade image inference at several confidence thresholds"
+
+    def add_arguments(self, parser):
+        parser.add_argument('image_dir',
+                            help="Labelled images in one sub-folder per class: " + ", ".join(class_names))
+        parser.add_argument('--thresholds', default=DEFAULT_THRESHOLDS,
+                            help="Comma-separated fast-model confidence thresholds")
+        parser.add_argument('--batch-size', type=int, default=16)
+        parser.add_argument('--json', dest='json_path', help="Also write the results to this file")
+
+    def handle(self, *args, **options):
+        images = labelled_images(options['image_dir'])
+        if not images:
+            raise CommandError(f"No images found under {options['image_dir']}/<{'|'.join(class_names)}>/")
+        thresholds = [float(t) for t in options['thresholds'].split(',')]
+        labels = np.array([label for _, label in images])
+
+        # Both models score every image once; each threshold is then a selection over those outputs
+        self.stdout.write(f"Scoring {len(images)} images with the fast model and the full ensemble...")
+        fast_probs, fast_time = timed_predict(get_model('ensemble_fast'), images, options['batch_size'])
+        full_probs, full_time = timed_predict(get_model('ensemble_model'), images, options['batch_size'])
+
+        def row(probs, seconds_per_image, escalated=None):
+            entry = {
+                "accuracy": float((probs.argmax(axis=1) == labels).mean()),
+                "ms_per_image": 1000 * seconds_per_image,
+                "images_per_sec": 1 / seconds_per_image if seconds_per_image else None,
+            }
+            if escalated is not None:
+                entry["escalation_rate"] = float(escalated.mean())
+                entry["agreement_with_ensemble"] = float(
+                    (probs.argmax(axis=1) == full_probs.argmax(axis=1)).mean()
+                )
+            return entry
+
+        report = {
+            "images": len(images),
+            "fast_only": row(fast_probs, fast_time),
+            "ensemble_only": row(full_probs, full_time),
+            "cascade": {},
+        }
+        for threshold in thresholds:
+            probs, escalated = cascade_outputs(fast_probs, full_probs, threshold)
+            # Escalated images pay for both models
+            seconds = fast_time + escalated.mean() * full_time
+            report["cascade"][str(threshold)] = row(probs, seconds, escalated)
+
+        self.stdout.write(f"{'mode':<18}{'accuracy':>10}{'escalated':>11}{'agree':>8}{'ms/img':>9}{'img/s':>9}")
+        lines = [("fast only", report["fast_only"]), ("ensemble only", report["ensemble_only"])]
+        lines += [(f"cascade @ {t}", r) for t, r in report["cascade"].items()]
+        for name, r in lines:
+            escalated = f"{r['escalation_rate']:.1%}" if "escalation_rate" in r else "-"
+            agree = f"{r['agreement_with_ensemble']:.1%}" if "agreement_with_ensemble" in r else "-"
+            self.stdout.write(
+                f"{name:<18}{r['accuracy']:>10.4f}{escalated:>11}{agree:>8}"
+                f"{r['ms_per_image']:>9.1f}{r['images_per_sec'] or 0:>9.1f}"
+            )
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump(report, f, indent=2)
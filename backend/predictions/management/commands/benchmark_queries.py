@@ -0,0 +1,140 @@
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from predictions.models import AnimalMovement, PredictionResult
+
+
+def _ddl(model):
+    """CREATE TABLE and CREATE INDEX statements Django would run for ``model``."""
+    with connection.schema_editor(collect_sql=True) as editor:
+        editor.create_model(model)
+    statements = [sql.rstrip(';') for sql in editor.collected_sql]
+    tables = [sql for sql in statements if sql.startswith('CREATE TABLE')]
+    indexes = [sql for sql in statements if sql.startswith('CREATE INDEX')]
+    return tables, indexes
+
+
+def _sql(queryset):
+    """Raw SQLite SQL and params for a queryset, as the ORM would send it."""
+    sql, params = queryset.query.sql_with_params()
+    adapt = connection.ops.adapt_datetimefield_value
+    params = [adapt(p) if isinstance(p, datetime) else p for p in params]
+    return sql.replace('%s', '?'), params
+
+
+def _hot_queries(latest):
+    """The lookups issued by the dashboard views and query_batches."""
+    results = PredictionResult.objects
+    movements = AnimalMovement.objects
+    return {
+        "latest_timestamp": results.order_by('-timestamp').values_list('timestamp', flat=True)[:1],
+        "latest_batch_rows": results.filter(timestamp=latest),
+        "latest_xgb_poacher": results.filter(xgb_prediction="poacher").order_by('-timestamp')[:1],
+        "latest_image_poacher": results.filter(image_class_prediction="poacher").order_by('-timestamp')[:1],
+        "poaching_history": results.filter(xgb_prediction="poacher").order_by('-timestamp')[:20],
+        "movement_timestamps": movements.values_list('datetime', flat=True).distinct().order_by('datetime'),
+        "movement_batch": movements.filter(datetime=latest).values_list('id', 'animal_id'),
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark the hot prediction/movement queries on synthetic SQLite data, with and without indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000_000)
+        parser.add_argument('--animals', type=int, default=300, help="Rows per timestamp")
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--db', help="Scratch SQLite file (defaults to a temp file)")
+        parser.add_argument('--json', dest='json_path', help="Also write the results to this file")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("benchmark_queries builds its scratch tables with the SQLite backend")
+
+        path = options['db'] or os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+        db = sqlite3.connect(path)
+        rows, animals = options['rows'], options['animals']
+
+        result_tables, result_indexes = _ddl(PredictionResult)
+        movement_tables, movement_indexes = _ddl(AnimalMovement)
+        for sql in result_tables:
+            db.execute(sql)
+        # Only the columns the movement queries touch; 270 float columns add nothing but disk
+        db.execute(f'CREATE TABLE "{AnimalMovement._meta.db_table}" '
+                   '("id" integer PRIMARY KEY AUTOINCREMENT, "datetime" datetime NOT NULL, "animal_id" integer NOT NULL)')
+
+        self.stdout.write(f"Generating {rows:,} rows in {path}...")
+        latest = self.populate(db, rows, animals, options['seed'])
+        queries = {name: _sql(qs) for name, qs in _hot_queries(latest).items()}
+
+        report = {"rows": rows, "animals_per_timestamp": animals, "queries": {}}
+        for name, (sql, params) in queries.items():
+            report["queries"][name] = {"without_index_ms": self.time_query(db, sql, params, options['repeat'])}
+
+        start = time.perf_counter()
+        for sql in result_indexes + movement_indexes:
+            db.execute(sql)
+        db.execute("ANALYZE")
+        report["index_build_s"] = time.perf_counter() - start
+
+        for name, (sql, params) in queries.items():
+            entry = report["queries"][name]
+            entry["with_index_ms"] = self.time_query(db, sql, params, options['repeat'])
+            entry["plan"] = [row[-1] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+            self.stdout.write(
+                f"{name:<22} {entry['without_index_ms']:>10.2f} ms -> {entry['with_index_ms']:>8.2f} ms   "
+                f"{'; '.join(entry['plan'])}"
+            )
+        self.stdout.write(f"Index build: {report['index_build_s']:.1f}s")
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump(report, f, indent=2)
+        db.close()
+
+    def populate(self, db, rows, animals, seed):
+        rng = random.Random(seed)
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        adapt = connection.ops.adapt_datetimefield_value
+        timestamps = [adapt(start + timedelta(minutes=i)) for i in range(rows // animals + 1)]
+
+        def results():
+            for i in range(rows):
+                poacher = rng.random() < 0.01
+                image = rng.choice(['elephant', 'poacher', 'rhino']) if poacher else None
+                yield (timestamps[i // animals], i % animals, rng.choice(['elephant', 'rhino']),
+                       'poacher' if poacher else 'normal', -21.5, 31.9, None, image, None)
+
+        def movements():
+            for i in range(rows):
+                yield (timestamps[i // animals], i % animals)
+
+        table = PredictionResult._meta.db_table
+        db.executemany(
+            f'INSERT INTO "{table}" (timestamp, animal_id, species, xgb_prediction, latitude, '
+            'longtitude, image_path, image_class_prediction, probability) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            results(),
+        )
+        db.executemany(
+            f'INSERT INTO "{AnimalMovement._meta.db_table}" (datetime, animal_id) VALUES (?, ?)',
+            movements(),
+        )
+        db.commit()
+        return start + timedelta(minutes=(rows - 1) // animals)
+
+    def time_query(self, db, sql, params, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            db.execute(sql, params).fetchall()
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
@@ -0,0 +1,210 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+
+from predictions.machine_learning.image_cache import get_image_cache
+from predictions.machine_learning.preprocessor import FeaturePipeline, data_prep
+from predictions.machine_learning.zone_mapper import coordinate_to_zone, coordinates_to_zones
+from predictions.management.commands.import_data import column_values, insert_sql
+from predictions.models import AnimalMovement, BatchSnapshot, LiveEvent, PredictionResult
+from predictions.utils.batch_engine import commit_batch
+from predictions.utils.predict_tools import (
+    classify_image, classify_images, fetch_batch, run_xgboost_on_batch,
+)
+from predictions.utils.synthetic import movement_frame, write_camera_images
+
+GET_ENDPOINTS = ['mapview', 'xgb-results', 'image-results', 'history',
+                 'admin-notification', 'ranger-notification']
+
+
+def measure(fn, repeat, setup=None):
+    """Wall-clock seconds of ``fn`` over ``repeat`` runs; ``setup`` runs untimed before each."""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "repeat": repeat,
+    }
+
+
+def insert_movements(frame, chunk_size=20000):
+    columns = list(frame.columns)
+    sql = insert_sql(columns)
+    with connection.cursor() as cursor:
+        for start in range(0, len(frame), chunk_size):
+            chunk = frame.iloc[start:start + chunk_size]
+            arrays = [column_values(AnimalMovement._meta.get_field(c), chunk[c]) for c in columns]
+            with transaction.atomic():
+                cursor.executemany(sql, list(zip(*arrays)))
+
+
+def synthetic_scored(frame, zones):
+    """Scored triples for ``commit_batch`` when the XGBoost model is unavailable."""
+    rows = frame[['animal_id', 'species', 'datetime', 'latitude', 'longtitude']].to_dict('records')
+    for index, row in enumerate(rows):
+        row['prediction'] = int(index % 10 == 0)
+    return [(row, zone, {}) for row, zone in zip(rows, zones)]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ("Time the prediction hot paths on seeded synthetic movement rows and camera images "
+            "at several batch sizes, in a throwaway test database, and write the results as JSON")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default="100,10000,1000000",
+                            help="Comma-separated AnimalMovement rows per batch")
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--image-size', default="720x1280", help="Camera JPEG height x width")
+        parser.add_argument('--json', dest='json_path', default='benchmark_results.json',
+                            help="Where to write the results")
+        parser.add_argument('--baseline', help="Earlier results file to compare medians against")
+        parser.add_argument('--regression-threshold', type=float, default=0.2,
+                            help="Flag cases whose median slowed down by more than this fraction")
+
+    def handle(self, *args, **options):
+        scales = [int(s) for s in options['scales'].split(',')]
+        height, width = (int(v) for v in options['image_size'].split('x'))
+        self.repeat = options['repeat']
+
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "created": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "seed": options['seed'],
+                "repeat": self.repeat,
+            },
+            "camera": {},
+            "scales": {},
+        }
+
+        # Nothing touches the configured database, media, feature store or memo
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with tempfile.TemporaryDirectory() as media, override_settings(
+                MEDIA_ROOT=media, FEATURE_STORE_DIR=None, CLASSIFICATION_MEMO=None,
+                IMAGE_CACHE={**getattr(settings, 'IMAGE_CACHE', {}), 'DIRECTORY': None},
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            ):
+                for scale in scales:
+                    self.stdout.write(self.style.NOTICE(f"Scale {scale:,} rows per batch"))
+                    report["scales"][str(scale)] = self.run_scale(scale, options['seed'])
+                self.stdout.write(self.style.NOTICE("Camera images"))
+                report["camera"] = self.run_camera(options['seed'], (height, width))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        with open(options['json_path'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['json_path']}"))
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                self.compare(json.load(f), report, options['regression_threshold'])
+
+    def case(self, results, name, fn, setup=None, rows=None):
+        try:
+            result = measure(fn, self.repeat, setup)
+        except Exception as e:
+            # A missing model artifact shouldn't hide the other timings
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            self.stdout.write(self.style.WARNING(f"  {name:<28} failed: {e}"))
+            return
+        if rows:
+            result["rows_per_sec"] = rows / result["median"] if result["median"] else None
+        results[name] = result
+        self.stdout.write(f"  {name:<28} median {result['median'] * 1000:10.2f} ms")
+
+    def run_scale(self, scale, seed):
+        results = {}
+        for model in (AnimalMovement, PredictionResult, BatchSnapshot, LiveEvent):
+            model.objects.all().delete()
+
+        frame = movement_frame(scale, seed=seed)
+        ts = frame['datetime'].iloc[0]
+        start = time.perf_counter()
+        insert_movements(frame)
+        results["insert_movements"] = {"seconds": time.perf_counter() - start}
+
+        raw = frame.drop(columns=['datetime'])
+        self.case(results, "data_prep", lambda: data_prep(raw.copy()), rows=scale)
+        self.case(results, "feature_pipeline", lambda: FeaturePipeline.from_registry().transform(raw), rows=scale)
+        self.case(results, "fetch_batch", lambda: fetch_batch(ts), rows=scale)
+        self.case(results, "run_xgboost_on_batch", lambda: run_xgboost_on_batch(ts), rows=scale)
+
+        lats, lons = frame['latitude'].tolist(), frame['longtitude'].tolist()
+        self.case(results, "coordinate_to_zone",
+                  lambda: [coordinate_to_zone(lat, lon) for lat, lon in zip(lats, lons)], rows=scale)
+        self.case(results, "coordinates_to_zones", lambda: coordinates_to_zones(lats, lons), rows=scale)
+
+        zones = coordinates_to_zones(lats, lons)
+        rows = run_xgboost_on_batch(ts)
+        scored = ([(row, zone, {}) for row, zone in zip(rows, zones)] if rows
+                  else synthetic_scored(frame, zones))
+
+        def clear():
+            PredictionResult.objects.all().delete()
+        self.case(results, "commit_batch", lambda: commit_batch(ts, scored), setup=clear, rows=scale)
+
+        client = Client()
+        for endpoint in GET_ENDPOINTS:
+            self.case(results, f"GET /{endpoint}/", lambda: client.get(f'/{endpoint}/'))
+        return results
+
+    def run_camera(self, seed, size):
+        results = {}
+        ts = movement_frame(1, seed=seed)['datetime'].iloc[0]
+        paths = write_camera_images([ts], seed=seed, size=size)
+        keys = [(path.split(os.sep)[-2], ts) for path in paths]
+        results["images"] = len(paths)
+
+        cold = get_image_cache().clear
+        self.case(results, "classify_image (cold)",
+                  lambda: [classify_image(zone, when) for zone, when in keys], setup=cold, rows=len(keys))
+        self.case(results, "classify_image (cached)",
+                  lambda: [classify_image(zone, when) for zone, when in keys], rows=len(keys))
+        self.case(results, "classify_images (cold)", lambda: classify_images(keys), setup=cold, rows=len(keys))
+        return results
+
+    def compare(self, baseline, report, threshold):
+        self.stdout.write(self.style.NOTICE(f"Compared with {baseline['meta'].get('commit')}"))
+        sections = [("camera", baseline.get("camera", {}), report["camera"])]
+        sections += [(f"{scale} rows", baseline.get("scales", {}).get(scale, {}), cases)
+                     for scale, cases in report["scales"].items()]
+        for label, old_cases, new_cases in sections:
+            for name, new in new_cases.items():
+                old = old_cases.get(name)
+                if not isinstance(new, dict) or not isinstance(old, dict) or "median" not in new or "median" not in old:
+                    continue
+                ratio = new["median"] / old["median"] if old["median"] else float('inf')
+                style = self.style.ERROR if ratio > 1 + threshold else self.style.SUCCESS
+                self.stdout.write(style(f"  {label:<14} {name:<28} {ratio:6.2f}x"))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.models import AnimalMovement
+from predictions.utils.feature_store import get_feature_store
+from predictions.utils.predict_tools import fetch_batch_from_db
+
+
+class Command(BaseCommand):
+    help = "Write the columnar feature store from rows already in AnimalMovement"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true',
+                            help="Skip timestamps whose partition already holds all their rows")
+
+    def handle(self, *args, **options):
+        store = get_feature_store()
+        if store is None:
+            raise CommandError("FEATURE_STORE_DIR is not set")
+
+        timestamps = (
+            AnimalMovement.objects
+            .values_list('datetime', flat=True)
+            .distinct()
+            .order_by('datetime')
+        )
+        written = 0
+        started = time.perf_counter()
+        for ts in timestamps:
+            if options['missing_only'] and store.is_complete(ts):
+                continue
+            written += store.write(fetch_batch_from_db(ts))
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {written} rows in {store.root} ({time.perf_counter() - started:.1f}s)"
+        ))
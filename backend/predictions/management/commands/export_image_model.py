@@ -0,0 +1,139 @@
+import json
+import os
+import random
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.machine_learning.predictor import class_names
+from predictions.machine_learning.preprocessor import labelled_images, load_tensor
+from predictions.machine_learning.registry import get_model, registry
+from predictions.machine_learning.tflite_engine import TFLiteEngine
+
+
+def convert(model, quantization, calibration):
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == 'int8':
+        def representative_dataset():
+            for path in calibration:
+                yield [load_tensor(path)]
+        converter.representative_dataset = representative_dataset
+        # Integer kernels everywhere they exist; inputs and outputs stay float32
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+            tf.lite.OpsSet.TFLITE_BUILTINS,
+        ]
+    return converter.convert()
+
+
+def evaluate(predict, images, batch_size):
+    """Top-1 accuracy, per-image latency and the probabilities for ``images``."""
+    outputs, elapsed = [], 0.0
+    for start in range(0, len(images), batch_size):
+        batch = np.concatenate([load_tensor(path) for path, _ in images[start:start + batch_size]])
+        began = time.perf_counter()
+        outputs.append(np.asarray(predict(batch)))
+        elapsed += time.perf_counter() - began
+    probs = np.concatenate(outputs)
+    labels = np.array([label for _, label in images])
+    return {
+        "accuracy": float((probs.argmax(axis=1) == labels).mean()),
+        "ms_per_image": 1000 * elapsed / len(images),
+    }, probs
+
+
+class Command(BaseCommand):
+    help = ("Export the Keras image ensemble to a quantized TFLite model for CPU inference "
+            "and report its accuracy against a held-out image folder")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quantization', choices=['float16', 'int8', 'dynamic'], default='float16',
+                            help="float16 weights, full int8 (needs calibration images) or dynamic-range int8")
+        parser.add_argument('--eval-dir', required=True,
+                            help="Held-out images in one sub-folder per class: " + ", ".join(class_names))
+        parser.add_argument('--calibration-dir',
+                            help="Images for int8 calibration (same layout); defaults to --eval-dir")
+        parser.add_argument('--calibration-samples', type=int, default=200)
+        parser.add_argument('--output', default=registry.path('ensemble_tflite'),
+                            help="Where to write the .tflite model")
+        parser.add_argument('--report',
+                            help="JSON accuracy report path; defaults to <output>.report.json")
+        parser.add_argument('--batch-size', type=int, default=16)
+        parser.add_argument('--threads', type=int, default=None,
+                            help="TFLite interpreter threads used for the evaluation")
+        parser.add_argument('--seed', type=int, default=123)
+
+    def handle(self, *args, **options):
+        held_out = labelled_images(options['eval_dir'])
+        if not held_out:
+            raise CommandError(f"No images found under {options['eval_dir']}/<{'|'.join(class_names)}>/")
+
+        calibration = []
+        if options['quantization'] == 'int8':
+            pool = [path for path, _ in labelled_images(options['calibration_dir'] or options['eval_dir'])]
+            random.Random(options['seed']).shuffle(pool)
+            calibration = pool[:options['calibration_samples']]
+            if not calibration:
+                raise CommandError("int8 quantization needs calibration images")
+            if not options['calibration_dir']:
+                self.stdout.write(self.style.WARNING(
+                    "Calibrating on the evaluation images; pass --calibration-dir for an unbiased report"
+                ))
+
+        self.stdout.write("Loading the Keras ensemble...")
+        model = get_model('ensemble_model')
+
+        self.stdout.write(f"Converting with {options['quantization']} quantization...")
+        started = time.perf_counter()
+        flatbuffer = convert(model, options['quantization'], calibration)
+        convert_seconds = time.perf_counter() - started
+
+        output = options['output']
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        with open(output, 'wb') as f:
+            f.write(flatbuffer)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output} ({len(flatbuffer) / 1e6:.1f} MB)"))
+
+        self.stdout.write(f"Evaluating on {len(held_out)} held-out images...")
+        engine = TFLiteEngine.load(output, num_threads=options['threads'])
+        keras_metrics, keras_probs = evaluate(
+            lambda batch: model.predict(batch, verbose=0), held_out, options['batch_size'])
+        tflite_metrics, tflite_probs = evaluate(engine.predict, held_out, options['batch_size'])
+        diff = np.abs(keras_probs - tflite_probs)
+
+        report = {
+            "quantization": options['quantization'],
+            "output": output,
+            "convert_seconds": convert_seconds,
+            "images": len(held_out),
+            "per_class": {name: sum(1 for _, label in held_out if label == i)
+                          for i, name in enumerate(class_names)},
+            "calibration_images": len(calibration),
+            "size_mb": {
+                "keras": os.path.getsize(registry.path('ensemble_model')) / 1e6,
+                "tflite": len(flatbuffer) / 1e6,
+            },
+            "keras": keras_metrics,
+            "tflite": tflite_metrics,
+            "top1_agreement": float((keras_probs.argmax(axis=1) == tflite_probs.argmax(axis=1)).mean()),
+            "max_abs_prob_diff": float(diff.max()),
+            "mean_abs_prob_diff": float(diff.mean()),
+        }
+        report_path = options['report'] or f"{output}.report.json"
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        self.stdout.write(
+            f"Accuracy keras {keras_metrics['accuracy']:.4f} vs tflite {tflite_metrics['accuracy']:.4f}, "
+            f"top-1 agreement {report['top1_agreement']:.4f}, "
+            f"{keras_metrics['ms_per_image']:.1f} -> {tflite_metrics['ms_per_image']:.1f} ms/image"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Report written to {report_path}. Set IMAGE_CLASSIFIER_BACKEND = 'tflite' to serve this model."
+        ))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.machine_learning.classification_memo import get_classification_memo
+
+
+class Command(BaseCommand):
+    help = "Delete classification memo entries made by image models other than the configured one"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=float, default=None, metavar='DAYS',
+                            help="Only delete entries stored more than DAYS days ago")
+
+    def handle(self, *args, **options):
+        memo = get_classification_memo()
+        if memo is None:
+            raise CommandError("CLASSIFICATION_MEMO is not set")
+
+        older_than = None
+        if options['older_than'] is not None:
+            older_than = time.time() - options['older_than'] * 86400
+        deleted = memo.prune(older_than=older_than)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} entries from {memo.path}"))
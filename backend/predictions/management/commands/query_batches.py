@@ -1,95 +1,142 @@
-from django.core.management.base import BaseCommand
-from time import sleep
-from predictions.models import AnimalMovement, PredictionResult
-from predictions.utils.predict_tools import run_xgboost_on_batch, classify_image
-from predictions.machine_learning.zone_mapper import coordinate_to_zone
-import requests
+from django.core.management.base import BaseCommand, CommandError
+from predictions.utils.backfill import backfill
+from predictions.utils.batch_engine import commit_batch, score_batch
+from predictions.utils.events import close_result_bus, get_result_bus
+from predictions.utils.metrics import start_json_dump, stop_json_dump
+from predictions.utils.pipeline import BatchPipeline
+from predictions.utils.scheduler import BatchScheduler
+from predictions.machine_learning.classification_memo import get_classification_memo
+from predictions.machine_learning.image_cache import get_image_cache
+from predictions.machine_learning.predictor import serving_models
+from predictions.machine_learning.registry import registry
 import os
+import time
 os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
 
-API_URL = "http://127.0.0.1:8000/api/receive-prediction/"
-
 class Command(BaseCommand):
-    help = "Process AnimalMovement batches by timestamp every 60 seconds"
+    help = "Process AnimalMovement batches by timestamp, catching up on backlog then polling every tick"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=60,
+                            help="Seconds between polls for new timestamps once caught up")
+        parser.add_argument('--once', action='store_true',
+                            help="Drain the current backlog and exit")
+        parser.add_argument('--from-start', action='store_true',
+                            help="Ignore stored predictions and reprocess every timestamp")
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help="Rows per INSERT when persisting a batch's predictions")
+        parser.add_argument('--warm-up', action='store_true',
+                            help="Load the configured models before the first batch")
+        parser.add_argument('--backfill', action='store_true',
+                            help="Replay the pending timestamps on a process pool, then exit")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes for --backfill")
+        parser.add_argument('--pipeline', action='store_true',
+                            help="Overlap fetch, scoring, image inference and writes across batches")
+        parser.add_argument('--decode-workers', type=int, default=4,
+                            help="Threads decoding camera images in --pipeline mode")
 
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **options):
+        if not options['interval'] > 0:
+            raise CommandError("--interval must be greater than 0")
         self.stdout.write(self.style.NOTICE("EcoGuard Batch Monitor Starting..."))
+        self.chunk_size = options['chunk_size']
+        if options['warm_up']:
+            for name, seconds in registry.warm_up(serving_models()).items():
+                self.stdout.write(f"Loaded {name} in {seconds:.2f}s")
+        start_json_dump()
         # Replace Animal Movement with actual DataBase table in production
-        timestamps = (
-            AnimalMovement.objects
-            .values_list('datetime', flat=True)
-            .distinct()
-            .order_by('datetime')
-        )
-
-        for ts in timestamps:
-            self.stdout.write(f"\nProcessing timestamp: {ts}")
-            batch_predictions = run_xgboost_on_batch(ts)
-            
+        watermark = None if options['from_start'] else BatchScheduler.resume_watermark()
+        if watermark:
+            self.stdout.write(f"Resuming after watermark {watermark}")
 
-            if not batch_predictions:
-                self.stdout.write(f"DEBUG: batch_predictions = {batch_predictions}")
+        scheduler = BatchScheduler(
+            self.process_batch,
+            interval=options['interval'],
+            watermark=watermark,
+            on_batch=self.report_batch,
+        )
+        pipeline = None
+        if options['pipeline']:
+            pipeline = BatchPipeline(self.commit, decode_workers=options['decode_workers'])
+            scheduler.process_pending = lambda pending: self.run_pipeline(scheduler, pipeline, pending)
+        try:
+            if options['backfill']:
+                self.run_backfill(scheduler, options['workers'])
             else:
-                self.stdout.write(self.style.WARNING(f"{len(batch_predictions)} predictions in batch"))
-
-                payload = []
+                scheduler.run(once=options['once'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            close_result_bus()
+            stop_json_dump()
+        self.stdout.write(f"Batch metrics: {scheduler.summary()}")
+        self.stdout.write(f"Image cache: {get_image_cache().stats()}")
+        if registry.is_loaded('ensemble_cascade'):
+            self.stdout.write(f"Image cascade: {registry.get('ensemble_cascade').summary()}")
+        memo = get_classification_memo()
+        if memo is not None:
+            self.stdout.write(f"Classification memo: {memo.stats()}")
+        if pipeline:
+            for stage, stats in pipeline.summary().items():
+                self.stdout.write(f"Stage {stage}: {stats}")
 
-                for row in batch_predictions:
-                    # for demo purposes
-                    try:
-                        zone = coordinate_to_zone(row['latitude'], row['longtitude'])
-                        result = {}
+    def report_batch(self, metrics):
+        self.stdout.write(
+            f"Batch {metrics.timestamp} done in {metrics.processing_time:.2f}s "
+            f"(lag {metrics.lag:.0f}s, {metrics.backlog} pending)"
+        )
 
-                        if row['prediction'] == 1:
-                            try:
-                                result = classify_image(zone, row['datetime'])
-                                print(f"Results: {result}")
-                            except FileNotFoundError:
-                                result = {}
+    def process_batch(self, ts):
+        self.stdout.write(f"\nProcessing timestamp: {ts}")
+        try:
+            scored = score_batch(ts)
+        except Exception as e:
+            # A batch that can't be scored is skipped so a bad row can't stall the loop;
+            # commit errors propagate and the scheduler retries the batch
+            print(f"[Batch Error] {ts}: {e}")
+            return
+        self.commit(ts, scored)
 
-                        # Save prediction to DB after result is defined
-                        PredictionResult.objects.create(
-                            timestamp=row.get("datetime"),
-                            animal_id=row.get("animal_id"),
-                            species=row.get("species"),
-                            xgb_prediction="poacher" if row.get("prediction") == 1 else "normal",
-                            latitude=row.get("latitude"),
-                            longtitude=row.get("longtitude"),
-                            image_path=result.get("image_path"),
-                            image_class_prediction=result.get("class_name"),
-                            probability=result.get("probability"),
-                        )
+    def commit(self, ts, scored):
+        if not scored:
+            self.stdout.write(f"DEBUG: no predictions for {ts}")
+            return
 
-                        self.stdout.write(self.style.SUCCESS(
-                            f"Saved prediction for {row['species']} ({row['animal_id']}) — {row['prediction']}"
-                        ))
+        self.stdout.write(self.style.WARNING(f"{len(scored)} predictions in batch"))
+        for _, _, result in scored:
+            if result:
+                print(f"Results: {result}")
 
-                        # Add to payload to POST
-                        payload.append({
-                            "animal_id": row.get("animal_id"),
-                            "species": row.get("species"),
-                            "datetime": str(row.get("datetime")),
-                            "timestamp": str(row.get("datetime")),
-                            "latitude": row.get("latitude"),
-                            "longtitude": row.get("longtitude"),
-                            "prediction": "poacher" if row.get("prediction") == 1 else "normal",
-                            "zone": zone,
-                            "image_url": result.get("image_path"),
-                            "class_name": result.get("class_name"),
-                            "probability": result.get("probability")
-                        })
+        saved, payload = commit_batch(ts, scored, chunk_size=self.chunk_size)
+        self.stdout.write(self.style.SUCCESS(f"Saved {saved} predictions for {ts}"))
 
-                    except Exception as e:
-                        self.stdout.write(self.style.ERROR(f"Error: {e}"))
+        # Hand the batch to subscribers without blocking on them
+        if get_result_bus().publish("batch", payload):
+            self.stdout.write(self.style.SUCCESS("Batch predictions published"))
+        else:
+            self.stdout.write(self.style.WARNING("⚠️ Result bus full, batch predictions dropped"))
 
-                # Send all predictions in one POST request after the loop
-                response = requests.post(API_URL, json=payload)
-                if response.status_code in (200, 201):
-                    self.stdout.write(self.style.SUCCESS("Batch predictions posted successfully"))
-                else:
-                    self.stdout.write(self.style.WARNING(
-                        f"⚠️ Failed to post batch predictions: {response.status_code}, {response.text}"
-                    ))
+    def run_pipeline(self, scheduler, pipeline, pending):
+        def on_batch(ts, started_at, processing_time, index):
+            scheduler.record(ts, started_at, processing_time, len(pending) - index - 1)
+        pipeline.on_batch = on_batch
+        if not pipeline.run(pending):
+            self.stdout.write(self.style.WARNING(f"Stopped after {scheduler.watermark}; retrying on the next tick"))
 
-            self.stdout.write("Waiting 60 seconds before next batch...\n")
-            sleep(60)
+    def run_backfill(self, scheduler, workers):
+        """
+        Scores the pending timestamps on a process pool and commits them here,
+        in order, as they come back.
+        """
+        timestamps = scheduler.pending()
+        self.stdout.write(f"Backfilling {len(timestamps)} timestamps on {workers} workers")
+        started = time.perf_counter()
+        for ts, scored in backfill(timestamps, workers):
+            self.commit(ts, scored)
+            scheduler.watermark = ts
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {len(timestamps)} timestamps in {elapsed:.1f}s "
+            f"({len(timestamps) / elapsed if elapsed else 0:.1f} batches/sec)"
+        ))
@@ -1,2 +1,3 @@
-from predictions.models import PredictionResult as p
+from predictions.models import BatchSnapshot, PredictionResult as p
 p.objects.all().delete()
+BatchSnapshot.objects.all().delete()
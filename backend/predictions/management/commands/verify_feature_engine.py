@@ -0,0 +1,86 @@
+import json
+import time
+from itertools import product
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from predictions.machine_learning.feature_engine import (
+    BASE_FEATURES, DERIVED_COLUMNS, STATISTICS, FeatureEngine,
+)
+from predictions.models import AnimalMovement
+from predictions.utils.predict_tools import fetch_batch_from_db
+
+
+class Command(BaseCommand):
+    help = ("Replay AnimalMovement through the streaming feature engine and compare its output "
+            "with the stored (offline) rolling feature columns")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tolerance', type=float, default=1e-6,
+                            help="Largest absolute difference counted as a match")
+        parser.add_argument('--limit', type=int, help="Only replay the first N timestamps")
+        parser.add_argument('--json', dest='json_path', help="Also write the results to this file")
+
+    def handle(self, *args, **options):
+        tolerance = options['tolerance']
+        # Every convention the offline computation may have used is replayed side by side
+        engines = {
+            (ddof, includes): FeatureEngine(ddof=ddof, window_includes_current=includes)
+            for ddof, includes in product((1, 0), (True, False))
+        }
+        n = len(DERIVED_COLUMNS)
+        max_error = {key: np.zeros(n) for key in engines}
+        mismatches = {key: np.zeros(n, dtype=np.int64) for key in engines}
+
+        timestamps = (
+            AnimalMovement.objects
+            .values_list('datetime', flat=True)
+            .distinct()
+            .order_by('datetime')
+        )
+        if options['limit']:
+            timestamps = timestamps[:options['limit']]
+
+        rows = 0
+        started = time.perf_counter()
+        for ts in timestamps:
+            # The float64 table values: the feature store's float32 copy would round both sides
+            batch = fetch_batch_from_db(ts)
+            expected = batch[DERIVED_COLUMNS].to_numpy(dtype=np.float64)
+            for key, engine in engines.items():
+                # Through update_frame, like import_data, so repeated ids at a timestamp are
+                # fed as successive fixes; one timestamp keeps the batch's row order
+                derived = engine.update_frame(batch)[DERIVED_COLUMNS].to_numpy(dtype=np.float64)
+                error = np.abs(derived - expected)
+                # NaN on exactly one side is a mismatch; NaN on both sides is a match
+                both_nan = np.isnan(derived) & np.isnan(expected)
+                error = np.where(both_nan, 0.0, np.where(np.isnan(error), np.inf, error))
+                max_error[key] = np.maximum(max_error[key], error.max(axis=0))
+                mismatches[key] += (error > tolerance).sum(axis=0)
+            rows += len(batch)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"Replayed {rows} fixes in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} fixes/sec)")
+        report = {"rows": rows, "tolerance": tolerance, "statistics": {}}
+        width = len(BASE_FEATURES)
+        for index, stat in enumerate(STATISTICS):
+            columns = slice(index * width, (index + 1) * width)
+            results = {
+                f"ddof={ddof}, window {'includes' if includes else 'excludes'} current": {
+                    "max_abs_error": float(max_error[(ddof, includes)][columns].max()),
+                    "mismatched_values": int(mismatches[(ddof, includes)][columns].sum()),
+                }
+                for ddof, includes in engines
+            }
+            best = min(results, key=lambda name: (results[name]["mismatched_values"], results[name]["max_abs_error"]))
+            report["statistics"][stat] = {"best": best, "conventions": results}
+            style = self.style.SUCCESS if results[best]["mismatched_values"] == 0 else self.style.WARNING
+            self.stdout.write(style(
+                f"{stat:<14} best: {best:<36} max error {results[best]['max_abs_error']:.3g}, "
+                f"{results[best]['mismatched_values']} mismatched values"
+            ))
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump(report, f, indent=2)
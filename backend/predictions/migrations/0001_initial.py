@@ -0,0 +1,312 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnimalMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('datetime', models.DateTimeField()),
+                ('animal_id', models.IntegerField()),
+                ('species', models.CharField(max_length=20)),
+                ('sex', models.CharField(max_length=5)),
+                ('ToD', models.CharField(max_length=5)),
+                ('speed', models.FloatField()),
+                ('latitude', models.FloatField()),
+                ('longtitude', models.FloatField()),
+                ('SCLAWTspeed', models.FloatField()),
+                ('SCLWTspeed', models.FloatField()),
+                ('SCLIDWTspeed', models.FloatField()),
+                ('spScale', models.FloatField()),
+                ('MURHOscale', models.FloatField()),
+                ('MURHOTODscale', models.FloatField()),
+                ('spShape', models.FloatField()),
+                ('MURHOshape', models.FloatField()),
+                ('MURHOTODshape', models.FloatField()),
+                ('spPcdf', models.FloatField()),
+                ('MURHOspeedP', models.FloatField()),
+                ('MURHOTODspeedP', models.FloatField()),
+                ('spLl', models.FloatField()),
+                ('spDevscld', models.FloatField()),
+                ('centr_ta_a', models.FloatField()),
+                ('SCLAWTcentr_ta_a', models.FloatField()),
+                ('SCLWTcentr_ta_a', models.FloatField()),
+                ('SCLIDWTcentr_ta_a', models.FloatField()),
+                ('centr_ta_c', models.FloatField()),
+                ('SCLAWTcentr_ta_c', models.FloatField()),
+                ('SCLWTcentr_ta_c', models.FloatField()),
+                ('SCLIDWTcentr_ta_c', models.FloatField()),
+                ('dirswitch_a', models.FloatField()),
+                ('currentmean_SCLAWTspeed', models.FloatField()),
+                ('currentmean_SCLIDWTspeed', models.FloatField()),
+                ('currentmean_SCLWTspeed', models.FloatField()),
+                ('currentmean_speed', models.FloatField()),
+                ('currentmean_MURHOTODscale', models.FloatField()),
+                ('currentmean_MURHOscale', models.FloatField()),
+                ('currentmean_spScale', models.FloatField()),
+                ('currentmean_MURHOTODshape', models.FloatField()),
+                ('currentmean_MURHOshape', models.FloatField()),
+                ('currentmean_spShape', models.FloatField()),
+                ('currentmean_MURHOTODspeedP', models.FloatField()),
+                ('currentmean_MURHOspeedP', models.FloatField()),
+                ('currentmean_spPcdf', models.FloatField()),
+                ('currentmean_spLl', models.FloatField()),
+                ('currentmean_spDevscld', models.FloatField()),
+                ('currentmean_SCLAWTcentr_ta_a', models.FloatField()),
+                ('currentmean_SCLIDWTcentr_ta_a', models.FloatField()),
+                ('currentmean_SCLWTcentr_ta_a', models.FloatField()),
+                ('currentmean_centr_ta_a', models.FloatField()),
+                ('currentmean_SCLAWTcentr_ta_c', models.FloatField()),
+                ('currentmean_SCLIDWTcentr_ta_c', models.FloatField()),
+                ('currentmean_SCLWTcentr_ta_c', models.FloatField()),
+                ('currentmean_centr_ta_c', models.FloatField()),
+                ('currentmean_dirswitch_a', models.FloatField()),
+                ('currentsd_SCLAWTspeed', models.FloatField()),
+                ('currentsd_SCLIDWTspeed', models.FloatField()),
+                ('currentsd_SCLWTspeed', models.FloatField()),
+                ('currentsd_speed', models.FloatField()),
+                ('currentsd_MURHOTODscale', models.FloatField()),
+                ('currentsd_MURHOscale', models.FloatField()),
+                ('currentsd_spScale', models.FloatField()),
+                ('currentsd_MURHOTODshape', models.FloatField()),
+                ('currentsd_MURHOshape', models.FloatField()),
+                ('currentsd_spShape', models.FloatField()),
+                ('currentsd_MURHOTODspeedP', models.FloatField()),
+                ('currentsd_MURHOspeedP', models.FloatField()),
+                ('currentsd_spPcdf', models.FloatField()),
+                ('currentsd_spLl', models.FloatField()),
+                ('currentsd_spDevscld', models.FloatField()),
+                ('currentsd_SCLAWTcentr_ta_a', models.FloatField()),
+                ('currentsd_SCLIDWTcentr_ta_a', models.FloatField()),
+                ('currentsd_SCLWTcentr_ta_a', models.FloatField()),
+                ('currentsd_centr_ta_a', models.FloatField()),
+                ('currentsd_SCLAWTcentr_ta_c', models.FloatField()),
+                ('currentsd_SCLIDWTcentr_ta_c', models.FloatField()),
+                ('currentsd_SCLWTcentr_ta_c', models.FloatField()),
+                ('currentsd_centr_ta_c', models.FloatField()),
+                ('currentsd_dirswitch_a', models.FloatField()),
+                ('diff10mean_SCLAWTspeed', models.FloatField()),
+                ('diff10mean_SCLIDWTspeed', models.FloatField()),
+                ('diff10mean_SCLWTspeed', models.FloatField()),
+                ('diff10mean_speed', models.FloatField()),
+                ('diff10mean_MURHOTODscale', models.FloatField()),
+                ('diff10mean_MURHOscale', models.FloatField()),
+                ('diff10mean_spScale', models.FloatField()),
+                ('diff10mean_MURHOTODshape', models.FloatField()),
+                ('diff10mean_MURHOshape', models.FloatField()),
+                ('diff10mean_spShape', models.FloatField()),
+                ('diff10mean_MURHOTODspeedP', models.FloatField()),
+                ('diff10mean_MURHOspeedP', models.FloatField()),
+                ('diff10mean_spPcdf', models.FloatField()),
+                ('diff10mean_spLl', models.FloatField()),
+                ('diff10mean_spDevscld', models.FloatField()),
+                ('diff10mean_SCLAWTcentr_ta_a', models.FloatField()),
+                ('diff10mean_SCLIDWTcentr_ta_a', models.FloatField()),
+                ('diff10mean_SCLWTcentr_ta_a', models.FloatField()),
+                ('diff10mean_centr_ta_a', models.FloatField()),
+                ('diff10mean_SCLAWTcentr_ta_c', models.FloatField()),
+                ('diff10mean_SCLIDWTcentr_ta_c', models.FloatField()),
+                ('diff10mean_SCLWTcentr_ta_c', models.FloatField()),
+                ('diff10mean_centr_ta_c', models.FloatField()),
+                ('diff10mean_dirswitch_a', models.FloatField()),
+                ('diff10sd_SCLAWTspeed', models.FloatField()),
+                ('diff10sd_SCLIDWTspeed', models.FloatField()),
+                ('diff10sd_SCLWTspeed', models.FloatField()),
+                ('diff10sd_speed', models.FloatField()),
+                ('diff10sd_MURHOTODscale', models.FloatField()),
+                ('diff10sd_MURHOscale', models.FloatField()),
+                ('diff10sd_spScale', models.FloatField()),
+                ('diff10sd_MURHOTODshape', models.FloatField()),
+                ('diff10sd_MURHOshape', models.FloatField()),
+                ('diff10sd_spShape', models.FloatField()),
+                ('diff10sd_MURHOTODspeedP', models.FloatField()),
+                ('diff10sd_MURHOspeedP', models.FloatField()),
+                ('diff10sd_spPcdf', models.FloatField()),
+                ('diff10sd_spLl', models.FloatField()),
+                ('diff10sd_spDevscld', models.FloatField()),
+                ('diff10sd_SCLAWTcentr_ta_a', models.FloatField()),
+                ('diff10sd_SCLIDWTcentr_ta_a', models.FloatField()),
+                ('diff10sd_SCLWTcentr_ta_a', models.FloatField()),
+                ('diff10sd_centr_ta_a', models.FloatField()),
+                ('diff10sd_SCLAWTcentr_ta_c', models.FloatField()),
+                ('diff10sd_SCLIDWTcentr_ta_c', models.FloatField()),
+                ('diff10sd_SCLWTcentr_ta_c', models.FloatField()),
+                ('diff10sd_centr_ta_c', models.FloatField()),
+                ('diff10sd_dirswitch_a', models.FloatField()),
+                ('diff20mean_SCLAWTspeed', models.FloatField()),
+                ('diff20mean_SCLIDWTspeed', models.FloatField()),
+                ('diff20mean_SCLWTspeed', models.FloatField()),
+                ('diff20mean_speed', models.FloatField()),
+                ('diff20mean_MURHOTODscale', models.FloatField()),
+                ('diff20mean_MURHOscale', models.FloatField()),
+                ('diff20mean_spScale', models.FloatField()),
+                ('diff20mean_MURHOTODshape', models.FloatField()),
+                ('diff20mean_MURHOshape', models.FloatField()),
+                ('diff20mean_spShape', models.FloatField()),
+                ('diff20mean_MURHOTODspeedP', models.FloatField()),
+                ('diff20mean_MURHOspeedP', models.FloatField()),
+                ('diff20mean_spPcdf', models.FloatField()),
+                ('diff20mean_spLl', models.FloatField()),
+                ('diff20mean_spDevscld', models.FloatField()),
+                ('diff20mean_SCLAWTcentr_ta_a', models.FloatField()),
+                ('diff20mean_SCLIDWTcentr_ta_a', models.FloatField()),
+                ('diff20mean_SCLWTcentr_ta_a', models.FloatField()),
+                ('diff20mean_centr_ta_a', models.FloatField()),
+                ('diff20mean_SCLAWTcentr_ta_c', models.FloatField()),
+                ('diff20mean_SCLIDWTcentr_ta_c', models.FloatField()),
+                ('diff20mean_SCLWTcentr_ta_c', models.FloatField()),
+                ('diff20mean_centr_ta_c', models.FloatField()),
+                ('diff20mean_dirswitch_a', models.FloatField()),
+                ('diff20sd_SCLAWTspeed', models.FloatField()),
+                ('diff20sd_SCLIDWTspeed', models.FloatField()),
+                ('diff20sd_SCLWTspeed', models.FloatField()),
+                ('diff20sd_speed', models.FloatField()),
+                ('diff20sd_MURHOTODscale', models.FloatField()),
+                ('diff20sd_MURHOscale', models.FloatField()),
+                ('diff20sd_spScale', models.FloatField()),
+                ('diff20sd_MURHOTODshape', models.FloatField()),
+                ('diff20sd_MURHOshape', models.FloatField()),
+                ('diff20sd_spShape', models.FloatField()),
+                ('diff20sd_MURHOTODspeedP', models.FloatField()),
+                ('diff20sd_MURHOspeedP', models.FloatField()),
+                ('diff20sd_spPcdf', models.FloatField()),
+                ('diff20sd_spLl', models.FloatField()),
+                ('diff20sd_spDevscld', models.FloatField()),
+                ('diff20sd_SCLAWTcentr_ta_a', models.FloatField()),
+                ('diff20sd_SCLIDWTcentr_ta_a', models.FloatField()),
+                ('diff20sd_SCLWTcentr_ta_a', models.FloatField()),
+                ('diff20sd_centr_ta_a', models.FloatField()),
+                ('diff20sd_SCLAWTcentr_ta_c', models.FloatField()),
+                ('diff20sd_SCLIDWTcentr_ta_c', models.FloatField()),
+                ('diff20sd_SCLWTcentr_ta_c', models.FloatField()),
+                ('diff20sd_centr_ta_c', models.FloatField()),
+                ('diff20sd_dirswitch_a', models.FloatField()),
+                ('past10mean_SCLAWTspeed', models.FloatField()),
+                ('past10mean_SCLIDWTspeed', models.FloatField()),
+                ('past10mean_SCLWTspeed', models.FloatField()),
+                ('past10mean_speed', models.FloatField()),
+                ('past10mean_MURHOTODscale', models.FloatField()),
+                ('past10mean_MURHOscale', models.FloatField()),
+                ('past10mean_spScale', models.FloatField()),
+                ('past10mean_MURHOTODshape', models.FloatField()),
+                ('past10mean_MURHOshape', models.FloatField()),
+                ('past10mean_spShape', models.FloatField()),
+                ('past10mean_MURHOTODspeedP', models.FloatField()),
+                ('past10mean_MURHOspeedP', models.FloatField()),
+                ('past10mean_spPcdf', models.FloatField()),
+                ('past10mean_spLl', models.FloatField()),
+                ('past10mean_spDevscld', models.FloatField()),
+                ('past10mean_SCLAWTcentr_ta_a', models.FloatField()),
+                ('past10mean_SCLIDWTcentr_ta_a', models.FloatField()),
+                ('past10mean_SCLWTcentr_ta_a', models.FloatField()),
+                ('past10mean_centr_ta_a', models.FloatField()),
+                ('past10mean_SCLAWTcentr_ta_c', models.FloatField()),
+                ('past10mean_SCLIDWTcentr_ta_c', models.FloatField()),
+                ('past10mean_SCLWTcentr_ta_c', models.FloatField()),
+                ('past10mean_centr_ta_c', models.FloatField()),
+                ('past10mean_dirswitch_a', models.FloatField()),
+                ('past10sd_SCLAWTspeed', models.FloatField()),
+                ('past10sd_SCLIDWTspeed', models.FloatField()),
+                ('past10sd_SCLWTspeed', models.FloatField()),
+                ('past10sd_speed', models.FloatField()),
+                ('past10sd_MURHOTODscale', models.FloatField()),
+                ('past10sd_MURHOscale', models.FloatField()),
+                ('past10sd_spScale', models.FloatField()),
+                ('past10sd_MURHOTODshape', models.FloatField()),
+                ('past10sd_MURHOshape', models.FloatField()),
+                ('past10sd_spShape', models.FloatField()),
+                ('past10sd_MURHOTODspeedP', models.FloatField()),
+                ('past10sd_MURHOspeedP', models.FloatField()),
+                ('past10sd_spPcdf', models.FloatField()),
+                ('past10sd_spLl', models.FloatField()),
+                ('past10sd_spDevscld', models.FloatField()),
+                ('past10sd_SCLAWTcentr_ta_a', models.FloatField()),
+                ('past10sd_SCLIDWTcentr_ta_a', models.FloatField()),
+                ('past10sd_SCLWTcentr_ta_a', models.FloatField()),
+                ('past10sd_centr_ta_a', models.FloatField()),
+                ('past10sd_SCLAWTcentr_ta_c', models.FloatField()),
+                ('past10sd_SCLIDWTcentr_ta_c', models.FloatField()),
+                ('past10sd_SCLWTcentr_ta_c', models.FloatField()),
+                ('past10sd_centr_ta_c', models.FloatField()),
+                ('past10sd_dirswitch_a', models.FloatField()),
+                ('past20mean_SCLAWTspeed', models.FloatField()),
+                ('past20mean_SCLIDWTspeed', models.FloatField()),
+                ('past20mean_SCLWTspeed', models.FloatField()),
+                ('past20mean_speed', models.FloatField()),
+                ('past20mean_MURHOTODscale', models.FloatField()),
+                ('past20mean_MURHOscale', models.FloatField()),
+                ('past20mean_spScale', models.FloatField()),
+                ('past20mean_MURHOTODshape', models.FloatField()),
+                ('past20mean_MURHOshape', models.FloatField()),
+                ('past20mean_spShape', models.FloatField()),
+                ('past20mean_MURHOTODspeedP', models.FloatField()),
+                ('past20mean_MURHOspeedP', models.FloatField()),
+                ('past20mean_spPcdf', models.FloatField()),
+                ('past20mean_spLl', models.FloatField()),
+                ('past20mean_spDevscld', models.FloatField()),
+                ('past20mean_SCLAWTcentr_ta_a', models.FloatField()),
+                ('past20mean_SCLIDWTcentr_ta_a', models.FloatField()),
+                ('past20mean_SCLWTcentr_ta_a', models.FloatField()),
+                ('past20mean_centr_ta_a', models.FloatField()),
+                ('past20mean_SCLAWTcentr_ta_c', models.FloatField()),
+                ('past20mean_SCLIDWTcentr_ta_c', models.FloatField()),
+                ('past20mean_SCLWTcentr_ta_c', models.FloatField()),
+                ('past20mean_centr_ta_c', models.FloatField()),
+                ('past20mean_dirswitch_a', models.FloatField()),
+                ('past20sd_SCLAWTspeed', models.FloatField()),
+                ('past20sd_SCLIDWTspeed', models.FloatField()),
+                ('past20sd_SCLWTspeed', models.FloatField()),
+                ('past20sd_speed', models.FloatField()),
+                ('past20sd_MURHOTODscale', models.FloatField()),
+                ('past20sd_MURHOscale', models.FloatField()),
+                ('past20sd_spScale', models.FloatField()),
+                ('past20sd_MURHOTODshape', models.FloatField()),
+                ('past20sd_MURHOshape', models.FloatField()),
+                ('past20sd_spShape', models.FloatField()),
+                ('past20sd_MURHOTODspeedP', models.FloatField()),
+                ('past20sd_MURHOspeedP', models.FloatField()),
+                ('past20sd_spPcdf', models.FloatField()),
+                ('past20sd_spLl', models.FloatField()),
+                ('past20sd_spDevscld', models.FloatField()),
+                ('past20sd_SCLAWTcentr_ta_a', models.FloatField()),
+                ('past20sd_SCLIDWTcentr_ta_a', models.FloatField()),
+                ('past20sd_SCLWTcentr_ta_a', models.FloatField()),
+                ('past20sd_centr_ta_a', models.FloatField()),
+                ('past20sd_SCLAWTcentr_ta_c', models.FloatField()),
+                ('past20sd_SCLIDWTcentr_ta_c', models.FloatField()),
+                ('past20sd_SCLWTcentr_ta_c', models.FloatField()),
+                ('past20sd_centr_ta_c', models.FloatField()),
+                ('past20sd_dirswitch_a', models.FloatField()),
+            ],
+            options={
+                'db_table': 'animal_movement',
+            },
+        ),
+        migrations.CreateModel(
+            name='PredictionResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField()),
+                ('animal_id', models.FloatField()),
+                ('species', models.CharField(max_length=20)),
+                ('xgb_prediction', models.CharField(max_length=50)),
+                ('latitude', models.FloatField()),
+                ('longtitude', models.FloatField()),
+                ('image_path', models.CharField(blank=True, max_length=255, null=True)),
+                ('image_class_prediction', models.CharField(blank=True, max_length=50, null=True)),
+                ('probability', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'prediction_results',
+            },
+        ),
+    ]
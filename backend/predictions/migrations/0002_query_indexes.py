@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='animalmovement',
+            index=models.Index(fields=['datetime'], name='movement_datetime_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionresult',
+            index=models.Index(fields=['timestamp'], name='pred_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionresult',
+            index=models.Index(fields=['xgb_prediction', 'timestamp'], name='pred_xgb_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionresult',
+            index=models.Index(fields=['image_class_prediction', 'timestamp'], name='pred_image_ts_idx'),
+        ),
+    ]
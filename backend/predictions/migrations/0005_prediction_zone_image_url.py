@@ -0,0 +1,95 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:40
+
+import json
+import os
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copies of zone_mapper.zones / coordinate_to_zone and batch_writer.media_url
+# as they were when this migration was written, so later changes to the app
+# code can't change what it does.
+ZONES = {
+    "Z01": [-22.15, -22.10, 32.30, 32.35],
+    "Z02": [-22.15, -22.10, 32.15, 32.20],
+    "Z03": [-22.10, -22.05, 32.30, 32.35],
+    "Z04": [-22.10, -22.05, 32.15, 32.20],
+    "Z05": [-22.05, -22.00, 32.30, 32.35],
+    "Z06": [-22.05, -22.00, 32.15, 32.20],
+    "Z07": [-21.2, -21.1, 31.6, 31.7],
+    "Z08": [-21.1, -21.0, 31.7, 31.8],
+    "Z09": [-21.0, -20.9, 31.8, 31.9],
+    "Z10": [-20.9, -20.8, 31.9, 32.0],
+}
+BATCH_SIZE = 2000
+
+
+def zone_for(zones, lat, lon):
+    for zone_id, (min_lat, max_lat, min_lon, max_lon) in zones.items():
+        if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+            return zone_id
+    return None
+
+
+def media_url(image_path):
+    if not image_path:
+        return ""
+    try:
+        relative_path = os.path.relpath(image_path, settings.MEDIA_ROOT).replace("\\", "/")
+    except ValueError:
+        return ""
+    return f"{settings.MEDIA_URL}{relative_path}"
+
+
+def fill_zone_and_image_url(apps, schema_editor):
+    zones = ZONES
+    path = getattr(settings, 'CAMERA_ZONES_FILE', None)
+    if path:
+        with open(path) as f:
+            zones = json.load(f)
+
+    PredictionResult = apps.get_model('predictions', 'PredictionResult')
+    rows = PredictionResult.objects.only('id', 'latitude', 'longtitude', 'image_path').order_by('id')
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        row.zone = zone_for(zones, row.latitude, row.longtitude)
+        row.image_url = media_url(row.image_path)
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            PredictionResult.objects.bulk_update(batch, ['zone', 'image_url'])
+            batch = []
+    if batch:
+        PredictionResult.objects.bulk_update(batch, ['zone', 'image_url'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0004_live_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='predictionresult',
+            name='zone',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='predictionresult',
+            name='image_url',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.RunPython(fill_zone_and_image_url, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='predictionresult',
+            name='pred_xgb_ts_idx',
+        ),
+        migrations.AddIndex(
+            model_name='predictionresult',
+            index=models.Index(fields=['xgb_prediction', 'timestamp', 'id'], name='pred_xgb_ts_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionresult',
+            index=models.Index(fields=['zone', 'timestamp', 'id'], name='pred_zone_ts_id_idx'),
+        ),
+    ]
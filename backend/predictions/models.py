@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
 
@@ -275,6 +276,10 @@ class AnimalMovement(models.Model):
     past20sd_dirswitch_a = models.FloatField()
     class Meta:
         db_table = 'animal_movement'
+        indexes = [
+            # query_batches: distinct sorted timestamps and per-timestamp batches
+            models.Index(fields=['datetime'], name='movement_datetime_idx'),
+        ]
         
 
 class PredictionResult(models.Model):
@@ -287,9 +292,54 @@ class PredictionResult(models.Model):
     image_path = models.CharField(max_length=255, null=True, blank=True)
     image_class_prediction = models.CharField(max_length=50, null=True, blank=True)
     probability = models.FloatField(null=True, blank=True)
+    # Derived once when the row is written so history reads don't recompute them
+    zone = models.CharField(max_length=20, null=True, blank=True)
+    image_url = models.CharField(max_length=255, null=True, blank=True)
 
     class Meta:
         db_table = 'prediction_results'
+        indexes = [
+            # Latest batch lookups in the dashboard views
+            models.Index(fields=['timestamp'], name='pred_timestamp_idx'),
+            # Latest poacher by movement model / by camera trap; the id breaks
+            # timestamp ties for the keyset-paginated history
+            models.Index(fields=['xgb_prediction', 'timestamp', 'id'], name='pred_xgb_ts_id_idx'),
+            models.Index(fields=['zone', 'timestamp', 'id'], name='pred_zone_ts_id_idx'),
+            models.Index(fields=['image_class_prediction', 'timestamp'], name='pred_image_ts_idx'),
+        ]
 
     def __str__(self):
         return f"{self.species} at {self.timestamp} → {self.xgb_prediction}"
+
+
+
+class BatchSnapshot(models.Model):
+    """Precomputed response payload of a dashboard endpoint for the latest batch."""
+    endpoint = models.CharField(max_length=50, unique=True)
+    batch_id = models.CharField(max_length=50)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'batch_snapshots'
+
+    def __str__(self):
+        return f"{self.endpoint} @ {self.batch_id}"
+
+
+
+class LiveEvent(models.Model):
+    """
+    Event pushed to the live dashboard feed. The id doubles as the SSE event
+    id clients resume from; audience "all" also reaches the ranger channel.
+    """
+    kind = models.CharField(max_length=20)
+    audience = models.CharField(max_length=10, default="admin")
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'live_events'
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.audience})"
@@ -1,3 +1,613 @@
-from django.test import TestCase
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
 
-# Create your tests here.
+import cv2
+import numpy as np
+import pandas as pd
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from predictions.machine_learning.classification_memo import ClassificationMemo
+from predictions.machine_learning.feature_engine import BASE_FEATURES, DERIVED_COLUMNS, WINDOWS, FeatureEngine
+from predictions.machine_learning.image_cache import ImageCache
+from predictions.machine_learning.preprocessor import DROP_COLUMNS, FeaturePipeline, data_prep
+from predictions.machine_learning.zone_mapper import ZoneIndex, zones as BUILTIN_ZONES
+from predictions.models import AnimalMovement, LiveEvent, PredictionResult
+from predictions.utils.events import FileSpoolBackend, ResultBus, follow
+from predictions.utils.feature_store import BATCH_COLUMNS, FeatureStore
+from predictions.utils.history import history_page, history_queryset
+from predictions.utils.live_feed import REPLAY_LIMIT, event_stream, prune_events
+from predictions.utils.predict_tools import FEATURE_COLUMNS, fetch_batch_from_db, score_frame
+from predictions.utils.pipeline import BatchPipeline
+from predictions.utils.scheduler import BatchScheduler
+from predictions.utils.synthetic import movement_frame
+
+
+def linear_zone(zone_map, lat, lon):
+    """The original coordinate_to_zone: first zone in definition order, inclusive bounds."""
+    for zone_id, (min_lat, max_lat, min_lon, max_lon) in zone_map.items():
+        if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+            return zone_id
+    return None
+
+
+class ZoneIndexTests(SimpleTestCase):
+    def assertMatchesLinearScan(self, zone_map, lats, lons, **kwargs):
+        index = ZoneIndex(zone_map, **kwargs)
+        expected = [linear_zone(zone_map, lat, lon) for lat, lon in zip(lats, lons)]
+        self.assertEqual([index.lookup(lat, lon) for lat, lon in zip(lats, lons)], expected)
+        self.assertEqual(index.lookup_many(lats, lons).tolist(), expected)
+
+    def edge_points(self, zone_map):
+        # Corners and edge midpoints of every box, plus values a rounding step either side
+        lats, lons = [], []
+        for min_lat, max_lat, min_lon, max_lon in zone_map.values():
+            for lat in (min_lat, max_lat, (min_lat + max_lat) / 2):
+                for lon in (min_lon, max_lon, (min_lon + max_lon) / 2):
+                    for d_lat in (0.0, 1e-12, -1e-12):
+                        for d_lon in (0.0, 1e-12, -1e-12):
+                            lats.append(lat + d_lat)
+                            lons.append(lon + d_lon)
+        return lats, lons
+
+    def test_builtin_zones_random_points(self):
+        rng = np.random.default_rng(0)
+        lats = rng.uniform(-22.3, -20.6, 20000).tolist()
+        lons = rng.uniform(31.4, 32.5, 20000).tolist()
+        self.assertMatchesLinearScan(BUILTIN_ZONES, lats, lons)
+
+    def test_builtin_zones_edges(self):
+        self.assertMatchesLinearScan(BUILTIN_ZONES, *self.edge_points(BUILTIN_ZONES))
+
+    def test_grid_extent_rounding(self):
+        # (1.0 - 0) // 0.1 is 9 but floor(1.0 / 0.1) is 10: sizing and lookup must agree
+        zone_map = {"A": [0, 0.1, 0, 0.1], "B": [0.9, 1.0, 0, 0.1]}
+        self.assertMatchesLinearScan(zone_map, *self.edge_points(zone_map))
+        self.assertEqual(ZoneIndex(zone_map).lookup(1.0, 0.1), "B")
+
+    def test_edge_aligned_boxes_on_cell_boundaries(self):
+        # A checkerboard of touching boxes whose edges fall exactly on grid lines
+        step = 0.1
+        zone_map = {
+            f"Z{r}{c}": [r * step, (r + 1) * step, c * step, (c + 1) * step]
+            for r in range(7) for c in range(7)
+        }
+        rng = np.random.default_rng(1)
+        lats, lons = self.edge_points(zone_map)
+        lats += rng.uniform(-0.05, 0.75, 5000).tolist()
+        lons += rng.uniform(-0.05, 0.75, 5000).tolist()
+        for cell_size in (None, step, step / 3, 0.07, 1.0):
+            self.assertMatchesLinearScan(zone_map, lats, lons, cell_size=cell_size)
+
+    def test_overlapping_zones_first_wins(self):
+        zone_map = {"outer": [0, 1, 0, 1], "inner": [0.25, 0.5, 0.25, 0.5], "far": [5, 6, 5, 6]}
+        rng = np.random.default_rng(2)
+        lats = rng.uniform(-1, 7, 5000).tolist()
+        lons = rng.uniform(-1, 7, 5000).tolist()
+        self.assertMatchesLinearScan(zone_map, lats, lons)
+
+    def test_empty_index(self):
+        index = ZoneIndex({})
+        self.assertIsNone(index.lookup(0, 0))
+        self.assertEqual(index.lookup_many([0.0], [0.0]).tolist(), [None])
+
+
+@override_settings(HISTORY_PAGE_SIZE=7, HISTORY_MAX_PAGE_SIZE=10)
+class HistoryPagingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        rows = []
+        for minute in range(12):
+            # Several rows per timestamp, so pages split ties on the id
+            for n in range(5):
+                rows.append(PredictionResult(
+                    timestamp=start + timedelta(minutes=minute),
+                    animal_id=n,
+                    species="rhino" if n % 2 else "elephant",
+                    xgb_prediction="poacher" if n < 3 else "normal",
+                    latitude=0.0,
+                    longtitude=0.0,
+                    zone="Z01" if minute % 3 else "Z02",
+                ))
+        PredictionResult.objects.bulk_create(rows)
+
+    def walk(self, params):
+        ids, cursor, pages = [], None, 0
+        while True:
+            page, cursor = history_page(dict(params, **({'cursor': cursor} if cursor else {})))
+            ids += [row.id for row in page]
+            pages += 1
+            if cursor is None:
+                return ids, pages
+
+    def expected(self, params):
+        return list(history_queryset(params).values_list('id', flat=True))
+
+    def test_pages_cover_every_row_once_in_order(self):
+        for params in ({}, {'prediction': 'all'}, {'prediction': 'all', 'page_size': '1'},
+                       {'prediction': 'normal', 'page_size': '4'}, {'species': 'rhino,elephant'},
+                       {'zone': 'Z02', 'prediction': 'all', 'page_size': '3'},
+                       {'since': '2024-01-01T00:03:00Z', 'until': '2024-01-01T00:09:00Z', 'prediction': 'all'}):
+            with self.subTest(params=params):
+                ids, _ = self.walk(params)
+                self.assertEqual(ids, self.expected(params))
+                self.assertEqual(len(ids), len(set(ids)))
+
+    def test_filters(self):
+        rows = list(history_queryset({'since': '2024-01-01T00:03:00Z', 'until': '2024-01-01 00:05',
+                                      'zone': 'Z01', 'species': 'rhino'}))
+        self.assertTrue(rows)
+        for row in rows:
+            self.assertEqual((row.zone, row.species, row.xgb_prediction), ("Z01", "rhino", "poacher"))
+            self.assertEqual(row.timestamp.minute, 4)
+        self.assertEqual(history_queryset({}).count(), 36)
+        self.assertEqual(history_queryset({'prediction': 'all'}).count(), 60)
+
+    def test_page_size_default_and_cap(self):
+        self.assertEqual(len(history_page({})[0]), 7)
+        self.assertEqual(len(history_page({'page_size': '1000'})[0]), 10)
+        _, pages = self.walk({'prediction': 'all', 'page_size': '1000'})
+        self.assertEqual(pages, 6)
+
+    def test_last_page_has_no_cursor(self):
+        # Exactly one full page: the look-ahead row must not invent a next page
+        page, cursor = history_page({'zone': 'Z02', 'species': 'rhino', 'page_size': '4'})
+        self.assertEqual(len(page), 4)
+        self.assertIsNone(cursor)
+
+    def test_invalid_parameters(self):
+        for params in ({'cursor': 'junk'}, {'page_size': 'x'}, {'page_size': '0'},
+                       {'since': 'yesterday'}, {'prediction': 'maybe'}):
+            with self.subTest(params=params), self.assertRaises(ValueError):
+                history_page(params)
+        _, cursor = history_page({})
+        with self.assertRaises(ValueError):
+            history_page({'cursor': cursor[:-1] + ('A' if cursor[-1] != 'A' else 'B')})
+
+    def test_view(self):
+        response = self.client.get('/history/', {'page_size': '5'}, REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(len(body['poaching_detections']), 5)
+        self.assertIsNotNone(body['next_cursor'])
+        self.assertEqual(self.client.get('/history/', {'cursor': 'junk'}).status_code, 400)
+
+    def test_cursor_query_seeks_on_timestamp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("query plan check is SQLite-specific")
+        _, cursor = history_page({})
+        with CaptureQueriesContext(connection) as queries:
+            history_page({'cursor': cursor})
+        with connection.cursor() as c:
+            c.execute('EXPLAIN QUERY PLAN ' + queries[-1]['sql'])
+            plan = ' '.join(str(row[-1]) for row in c.fetchall())
+        self.assertIn('timestamp<', plan.replace(' ', ''))
+
+
+class FeatureStoreTests(TestCase):
+    def setUp(self):
+        self.frame = movement_frame(40, timestamps=2, seed=3)
+        AnimalMovement.objects.bulk_create(AnimalMovement(**row) for row in self.frame.to_dict('records'))
+        self.ts = self.frame['datetime'].iloc[0]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = FeatureStore(directory.name)
+
+    def test_read_matches_database(self):
+        self.store.write(fetch_batch_from_db(self.ts))
+        stored = self.store.read(self.ts)
+        expected = fetch_batch_from_db(self.ts)
+        self.assertEqual(list(stored.columns), BATCH_COLUMNS)
+        self.assertEqual(list(expected.columns), BATCH_COLUMNS)
+        pd.testing.assert_frame_equal(stored, expected, check_dtype=False, rtol=1e-6)
+
+    def test_partial_partition_falls_back(self):
+        # e.g. a crash after the database commit, or a resumed import
+        self.store.write(fetch_batch_from_db(self.ts).iloc[:25])
+        self.assertIsNone(self.store.read(self.ts))
+        self.assertFalse(self.store.is_complete(self.ts))
+
+    def test_rows_added_outside_the_store_fall_back(self):
+        self.store.write(fetch_batch_from_db(self.ts))
+        self.assertTrue(self.store.is_complete(self.ts))
+        extra = self.frame[self.frame['datetime'] == self.ts].iloc[:1].to_dict('records')[0]
+        AnimalMovement.objects.create(**extra)
+        self.assertIsNone(self.store.read(self.ts))
+
+    def test_write_replaces_the_partition(self):
+        batch = fetch_batch_from_db(self.ts)
+        self.store.write(batch)
+        self.store.write(batch)
+        self.assertEqual(self.store.stored_rows(self.ts), len(batch))
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class BatchSchedulerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        frame = movement_frame(6, timestamps=4, seed=5)
+        AnimalMovement.objects.bulk_create(AnimalMovement(**row) for row in frame.to_dict('records'))
+        cls.timestamps = sorted(set(AnimalMovement.objects.values_list('datetime', flat=True)))
+
+    def scheduler(self, process_batch=lambda ts: None, **kwargs):
+        clock = FakeClock()
+        return BatchScheduler(process_batch, clock=clock, sleep=clock.sleep, **kwargs), clock
+
+    def test_drains_backlog_in_order(self):
+        seen = []
+        scheduler, _ = self.scheduler(seen.append)
+        self.assertEqual(scheduler.run_once(), 4)
+        self.assertEqual(seen, self.timestamps)
+        self.assertEqual([m.backlog for m in scheduler.metrics], [3, 2, 1, 0])
+        self.assertEqual(scheduler.watermark, self.timestamps[-1])
+        self.assertEqual(scheduler.run_once(), 0)
+
+    def test_resumes_after_watermark(self):
+        seen = []
+        scheduler, _ = self.scheduler(seen.append, watermark=self.timestamps[1])
+        scheduler.run_once()
+        self.assertEqual(seen, self.timestamps[2:])
+
+    def test_failed_commit_is_retried(self):
+        failures = {self.timestamps[1]: 1}
+        seen = []
+
+        def process_batch(ts):
+            seen.append(ts)
+            if failures.get(ts):
+                failures[ts] -= 1
+                raise RuntimeError("database is locked")
+        scheduler, _ = self.scheduler(process_batch)
+        # The pass stops at the failed batch instead of recording it and moving on
+        self.assertEqual(scheduler.run_once(), 1)
+        self.assertEqual(scheduler.watermark, self.timestamps[0])
+        self.assertEqual(scheduler.run_once(), 3)
+        self.assertEqual(seen, self.timestamps[:2] + self.timestamps[1:])
+        self.assertEqual(scheduler.watermark, self.timestamps[-1])
+
+
+    def test_waits_for_next_tick_and_skips_missed_ones(self):
+        scheduler, clock = self.scheduler(interval=10)
+        scheduler.wait_for_next_tick()
+        self.assertEqual(clock.sleeps, [10])
+        clock.now += 3
+        scheduler.wait_for_next_tick()
+        self.assertEqual(clock.sleeps[-1], 7)
+        # A 25s batch overruns two ticks: wait for the next one, don't fire the missed ones
+        clock.now += 25
+        scheduler.wait_for_next_tick()
+        self.assertEqual(clock.sleeps[-1], 5)
+
+    def test_rejects_non_positive_interval(self):
+        for interval in (0, -1, float('nan')):
+            with self.subTest(interval=interval), self.assertRaises(ValueError):
+                self.scheduler(interval=interval)
+
+
+class StubPipeline(BatchPipeline):
+    """BatchPipeline with the database and model stages replaced."""
+
+    def __init__(self, commit, fail_scoring=(), **kwargs):
+        super().__init__(commit, **kwargs)
+        self.fail_scoring = set(fail_scoring)
+
+    def _fetch(self, batch):
+        batch.started_at = datetime.now(timezone.utc)
+        batch.started = 0.0
+
+    def _tabular(self, batch):
+        if batch.ts in self.fail_scoring:
+            raise RuntimeError("bad row")
+        batch.data = [batch.ts]
+
+    def _inference(self, batch):
+        pass
+
+
+class BatchPipelineTests(SimpleTestCase):
+    def run_pipeline(self, fail_commit=(), fail_scoring=()):
+        committed, recorded = [], []
+
+        def commit(ts, scored):
+            if ts in fail_commit:
+                raise RuntimeError("database is locked")
+            committed.append(ts)
+        pipeline = StubPipeline(commit, fail_scoring=fail_scoring,
+                                on_batch=lambda ts, *args: recorded.append(ts))
+        return pipeline.run(range(8)), committed, recorded
+
+    def test_scoring_failure_is_skipped(self):
+        completed, committed, recorded = self.run_pipeline(fail_scoring={3})
+        self.assertTrue(completed)
+        self.assertEqual(committed, [0, 1, 2, 4, 5, 6, 7])
+        self.assertEqual(recorded, list(range(8)))
+
+    def test_commit_failure_halts_before_recording(self):
+        completed, committed, recorded = self.run_pipeline(fail_commit={3})
+        self.assertFalse(completed)
+        self.assertEqual(committed, [0, 1, 2])
+        self.assertEqual(recorded, [0, 1, 2])
+
+
+class ImageCacheTests(SimpleTestCase):
+    ENTRY_BYTES = 224 * 224 * 3 + 128  # one .npy tensor with its header
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        self.images = []
+        for n in range(4):
+            path = os.path.join(self.root, f"{n}.jpg")
+            cv2.imwrite(path, np.full((300, 400, 3), n * 40, dtype=np.uint8))
+            self.images.append(path)
+
+    def cache(self, **kwargs):
+        return ImageCache(max_items=8, directory=os.path.join(self.root, 'cache'), **kwargs)
+
+    def disk_files(self, cache):
+        return {path for _, _, path in cache._disk_entries()}
+
+    def test_disk_tier_serves_a_fresh_cache(self):
+        first = self.cache()
+        array = first.get(self.images[0])
+        second = self.cache()
+        np.testing.assert_array_equal(second.get(self.images[0]), array)
+        self.assertEqual(second.stats()["disk_hits"], 1)
+
+    def test_disk_tier_evicts_least_recently_used(self):
+        cache = self.cache(max_disk_bytes=int(self.ENTRY_BYTES * 3.5))
+        for path in self.images[:3]:
+            cache.get(path)
+        paths = {path: cache._disk_path(cache.key(path)) for path in self.images}
+        for age, path in enumerate(reversed(self.images[:3])):
+            os.utime(paths[path], ns=(10 ** 18 - age * 10 ** 9,) * 2)
+        # Image 0 is the oldest file until a disk hit makes it the newest
+        cache.clear()
+        cache.get(self.images[0])
+        cache.get(self.images[3])
+
+        self.assertEqual(self.disk_files(cache), {paths[p] for p in (self.images[0], self.images[2], self.images[3])})
+        self.assertEqual(cache.stats()["disk_evictions"], 1)
+        self.assertLessEqual(cache._disk_bytes, cache.max_disk_bytes)
+
+    def test_disk_tier_unbounded_by_default(self):
+        cache = self.cache()
+        for path in self.images:
+            cache.get(path)
+        self.assertEqual(len(self.disk_files(cache)), 4)
+        self.assertIsNone(cache._disk_bytes)
+
+
+class ClassificationMemoTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'memo.sqlite3')
+
+    def test_entries_are_kept_per_model(self):
+        ClassificationMemo(self.path, model_hash='a').store({'img': [0.1, 0.2, 0.7]})
+        ClassificationMemo(self.path, model_hash='b').store({'img': [0.5, 0.4, 0.1]})
+        # Opening the memo for another model must not discard what the first one stored
+        memo = ClassificationMemo(self.path, model_hash='a')
+        np.testing.assert_allclose(memo.lookup(['img'])['img'], [0.1, 0.2, 0.7])
+        self.assertEqual(memo.lookup(['other']), {})
+
+    def test_prune_removes_other_models(self):
+        ClassificationMemo(self.path, model_hash='old').store({'img': [1.0, 0.0, 0.0]})
+        memo = ClassificationMemo(self.path, model_hash='new')
+        memo.store({'img': [0.0, 1.0, 0.0]})
+        self.assertEqual(memo.prune(older_than=0), 0)
+        self.assertEqual(memo.prune(), 1)
+        self.assertEqual(ClassificationMemo(self.path, model_hash='old').lookup(['img']), {})
+        self.assertIn('img', memo.lookup(['img']))
+
+
+def batch_features(frame, ddof=1):
+    """The rolling columns computed per animal with pandas, fixes in time order."""
+    index = frame.index
+    frame = frame.sort_values('datetime', kind='stable')
+    parts = []
+    for _, fixes in frame.groupby('animal_id', sort=False)[BASE_FEATURES]:
+        current_mean, current_sd = fixes.expanding().mean(), fixes.expanding().std(ddof=ddof)
+        blocks = {'currentmean': current_mean, 'currentsd': current_sd}
+        for window in WINDOWS:
+            rolling = fixes.rolling(window, min_periods=1)
+            blocks[f'past{window}mean'], blocks[f'past{window}sd'] = rolling.mean(), rolling.std(ddof=ddof)
+        for window in WINDOWS:
+            blocks[f'diff{window}mean'] = current_mean - blocks[f'past{window}mean']
+            blocks[f'diff{window}sd'] = current_sd - blocks[f'past{window}sd']
+        parts.append(pd.concat([block.add_prefix(f'{stat}_') for stat, block in blocks.items()], axis=1))
+    return pd.concat(parts).loc[index, DERIVED_COLUMNS].fillna(0.0)
+
+
+class FeatureEngineTests(SimpleTestCase):
+    def setUp(self):
+        frame = movement_frame(6, timestamps=30, seed=7)
+        # An animal reported twice at some timestamps, as a CSV export can have it
+        repeats = frame[(frame['animal_id'] == 2) & (frame.index % 4 == 0)].copy()
+        repeats[BASE_FEATURES] += 0.5
+        frame = pd.concat([frame, repeats], ignore_index=True)
+        # Rows out of time order, so update_frame has to sort them
+        self.frame = frame.sample(frac=1, random_state=0)
+
+    def assertMatchesBatch(self, derived, frame):
+        np.testing.assert_allclose(derived.loc[frame.index, DERIVED_COLUMNS].to_numpy(),
+                                   batch_features(frame).to_numpy(), rtol=1e-9, atol=1e-9)
+
+    def test_update_frame_matches_batch_features(self):
+        self.assertMatchesBatch(FeatureEngine().update_frame(self.frame), self.frame)
+
+    def test_chunks_resumed_from_saved_state(self):
+        ordered = self.frame.sort_values('datetime', kind='stable')
+        first, second = ordered.iloc[:70], ordered.iloc[70:]
+        engine = FeatureEngine(capacity=2)
+        derived = [engine.update_frame(first)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'engine.npz')
+            engine.save(path)
+            resumed = FeatureEngine.load(path)
+        self.assertEqual(int(resumed.count.sum()), len(first))
+        derived.append(resumed.update_frame(second))
+        self.assertMatchesBatch(pd.concat(derived), ordered)
+
+    def test_import_refuses_to_resume_without_state(self):
+        with self.assertRaises(CommandError):
+            call_command('import_data', 'unused.csv', '--derive-features', '--start-row', '10',
+                         '--no-feature-store')
+
+
+class FileSpoolBackendTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'events.jsonl')
+
+    def test_subscribers_receive_events_published_after_they_joined(self):
+        bus = ResultBus(FileSpoolBackend(self.path, poll_interval=0.01))
+        early, late = [], []
+        bus.subscribe(lambda topic, payload: early.append((topic, payload)))
+        bus.publish("batch", {"n": 1})
+        # Let the first event reach the file before the second subscriber joins
+        while os.path.getsize(self.path) == 0:
+            time.sleep(0.01)
+        bus.subscribe(lambda topic, payload: late.append((topic, payload)))
+        bus.publish("batch", {"n": 2})
+        bus.publish("alert", {"n": 3})
+        bus.close()
+
+        self.assertEqual(early, [("batch", {"n": 1}), ("batch", {"n": 2}), ("alert", {"n": 3})])
+        self.assertEqual(late, [("batch", {"n": 2}), ("alert", {"n": 3})])
+        self.assertEqual(bus.stats["delivered"], 3)
+
+    def test_follow_resumes_from_offset(self):
+        backend = FileSpoolBackend(self.path)
+        for n in range(3):
+            backend.deliver("batch", {"n": n})
+        backend.close()
+        stop = threading.Event()
+        stop.set()
+        records = list(follow(self.path, stop=stop))
+        self.assertEqual([record["payload"]["n"] for _, record in records], [0, 1, 2])
+        resumed = list(follow(self.path, offset=records[0][0], stop=stop))
+        self.assertEqual([record["payload"]["n"] for _, record in resumed], [1, 2])
+
+
+class FeaturePipelineTests(SimpleTestCase):
+    def setUp(self):
+        self.frame = movement_frame(200, timestamps=2, seed=11)
+        features = self.frame.drop(columns=DROP_COLUMNS, errors='ignore')
+        numeric = features.select_dtypes(include=['number'])
+        self.models = {
+            'standard_scaler': StandardScaler().fit(numeric * 3 + 1),
+            'label_encoder_sex': LabelEncoder().fit(self.frame['sex'].astype(str)),
+            'label_encoder_tod': LabelEncoder().fit(self.frame['ToD'].astype(str)),
+        }
+        patcher = mock.patch('predictions.machine_learning.preprocessor.get_model', self.models.get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pipeline = FeaturePipeline.from_registry()
+
+    def test_matches_data_prep(self):
+        expected = data_prep(self.frame)
+        np.testing.assert_allclose(self.pipeline.transform(self.frame), expected.to_numpy(dtype=np.float64),
+                                   rtol=1e-12, atol=1e-12)
+        self.assertEqual(self.pipeline.output_columns(self.frame.columns), list(expected.columns))
+
+    def test_column_order_and_dtype(self):
+        expected = data_prep(self.frame)
+        columns = list(reversed(expected.columns))
+        out = self.pipeline.transform(self.frame, columns=columns, dtype=np.float32)
+        self.assertEqual(out.dtype, np.float32)
+        np.testing.assert_allclose(out, expected[columns].to_numpy(dtype=np.float64), rtol=1e-5, atol=1e-5)
+
+    def test_unseen_label_is_rejected_like_data_prep(self):
+        frame = self.frame.copy()
+        frame.loc[frame.index[3], 'sex'] = 'unknown'
+        with self.assertRaises(ValueError):
+            data_prep(frame)
+        with self.assertRaises(ValueError):
+            self.pipeline.transform(frame)
+
+    def test_score_frame_without_booster_feature_names(self):
+        class Engine:
+            feature_names = None
+
+            def predict_proba(self, features):
+                self.features = features
+                return np.zeros(len(features))
+
+            def labels(self, proba):
+                return proba.astype(int)
+
+        engine = Engine()
+        models = dict(self.models, xgb_booster=engine, feature_pipeline=self.pipeline)
+        with mock.patch('predictions.utils.predict_tools.get_model', models.get):
+            score_frame(self.frame[BATCH_COLUMNS])
+        # The training order, not BATCH_COLUMNS with sex and ToD moved to the end
+        expected = data_prep(self.frame)[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        np.testing.assert_allclose(engine.features, expected, rtol=1e-5, atol=1e-5)
+
+    def test_columns_must_match_the_scaler(self):
+        with self.assertRaises(ValueError):
+            self.pipeline.transform(self.frame.drop(columns=[self.pipeline.scaled_columns[0]]))
+
+
+class LiveFeedTests(TestCase):
+    def replay(self, channel, last_event_id):
+        async def collect():
+            ids, stream = [], event_stream(channel, last_event_id)
+            try:
+                async for chunk in stream:
+                    if chunk.startswith("retry:"):
+                        return ids
+                    ids.append(int(chunk.split("\n", 1)[0][len("id: "):]))
+            finally:
+                await stream.aclose()
+        return async_to_sync(collect)()
+
+    def test_replay_covers_the_whole_gap(self):
+        LiveEvent.objects.bulk_create(
+            LiveEvent(kind="batch", audience="all" if n % 3 == 0 else "admin", payload={"n": n})
+            for n in range(REPLAY_LIMIT + 300)
+        )
+        ids = list(LiveEvent.objects.order_by('id').values_list('id', flat=True))
+        self.assertEqual(self.replay("admin", 0), ids)
+        self.assertEqual(self.replay("admin", ids[99]), ids[100:])
+        ranger = list(LiveEvent.objects.filter(audience="all").order_by('id').values_list('id', flat=True))
+        self.assertEqual(self.replay("ranger", 0), ranger)
+
+    @override_settings(LIVE_FEED_RETENTION_DAYS=7)
+    def test_prune_keeps_recent_events(self):
+        LiveEvent.objects.bulk_create(LiveEvent(kind="batch", payload={}) for _ in range(10))
+        now = datetime.now(timezone.utc)
+        old = list(LiveEvent.objects.order_by('id').values_list('id', flat=True))[:6]
+        LiveEvent.objects.filter(id__in=old).update(created_at=now - timedelta(days=8))
+        self.assertEqual(prune_events(now), 6)
+        self.assertEqual(LiveEvent.objects.count(), 4)
+        self.assertEqual(prune_events(now), 0)
+        with self.settings(LIVE_FEED_RETENTION_DAYS=None):
+            self.assertEqual(prune_events(now + timedelta(days=30)), 0)
+        self.assertEqual(prune_events(now + timedelta(days=30)), 4)
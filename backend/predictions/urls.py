@@ -1,7 +1,8 @@
 from django.urls import path
 from .views import (receive_prediction, map_view_data, 
                     get_xgb_results, get_image_results,
-                    validate_poacher, get_poaching_history, admin_notifications, ranger_notifications)
+                    validate_poacher, get_poaching_history, admin_notifications, ranger_notifications,
+                    live_feed, metrics)
 
 urlpatterns = [
     path('api/receive-prediction/', receive_prediction),
@@ -11,6 +12,8 @@ urlpatterns = [
     path('validate-poacher/', validate_poacher),
     path('history/', get_poaching_history),
     path('admin-notification/', admin_notifications),
-    path('ranger-notification/', ranger_notifications)
+    path('ranger-notification/', ranger_notifications),
+    path('live/', live_feed),
+    path('metrics/', metrics),
 
 ]
@@ -0,0 +1,92 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+
+from django.db import connections
+
+from predictions.utils.batch_engine import score_batch
+
+
+# Read by the OpenMP/BLAS runtimes and TensorFlow when they initialise, i.e. at
+# process start or first import; a worker setting them itself is too late
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "TF_NUM_INTRAOP_THREADS")
+
+
+@contextmanager
+def thread_env(threads):
+    """Sets ``THREAD_ENV_VARS`` for the processes started inside the block."""
+    saved = {var: os.environ.get(var) for var in THREAD_ENV_VARS}
+    os.environ.update({var: str(threads) for var in THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def _limit_tensorflow_threads(threads):
+    # Only where the configured image backend runs on TensorFlow itself; TFLite takes a thread count
+    from django.conf import settings
+    from predictions.machine_learning.predictor import image_model_name
+    if image_model_name() == 'ensemble_tflite':
+        if getattr(settings, 'IMAGE_CLASSIFIER_THREADS', None) is None:
+            settings.IMAGE_CLASSIFIER_THREADS = threads
+        return
+    try:
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    except ImportError:
+        pass
+    except RuntimeError as e:
+        # TensorFlow was already initialised in the parent before the fork
+        print(f"[Backfill Error] TensorFlow thread limits not applied: {e}")
+
+
+def _init_worker(settings_module, threads):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+    # Before any model loads: the threading options are fixed by the first TensorFlow op
+    _limit_tensorflow_threads(threads)
+
+    # Warm this worker's own model instances once, before its first batch
+    from predictions.machine_learning.registry import registry
+    engine = registry.get('xgb_booster')
+    engine.booster.set_param({'nthread': threads})
+    engine.nthread = threads
+    registry.warm_up(['feature_pipeline'])
+
+
+def backfill(timestamps, workers, window=None):
+    """
+    Scores ``timestamps`` on a pool of worker processes and yields
+    ``(ts, scored)`` strictly in input order, so a single caller can commit
+    the results deterministically. At most ``window`` batches are in flight.
+    """
+    window = window or workers * 2
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    # Forked workers must not share the parent's database connections
+    connections.close_all()
+
+    # Split the cores between workers instead of letting every runtime grab all of them.
+    # The pool starts workers on demand, so the variables stay set while it runs
+    with thread_env(threads), ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "backend.settings"), threads),
+    ) as pool:
+        remaining = iter(timestamps)
+        in_flight = deque((ts, pool.submit(score_batch, ts)) for ts in islice(remaining, window))
+        while in_flight:
+            ts, future = in_flight.popleft()
+            scored = future.result()
+            for next_ts in islice(remaining, 1):
+                in_flight.append((next_ts, pool.submit(score_batch, next_ts)))
+            yield ts, scored
@@ -0,0 +1,85 @@
+from django.db import transaction
+from predictions.machine_learning.zone_mapper import coordinates_to_zones
+from predictions.utils.batch_writer import PredictionBatchWriter
+from predictions.utils.live_feed import record_batch_events
+from predictions.utils.metrics import DB_WRITE_ROWS, DB_WRITE_SECONDS
+from predictions.utils.predict_tools import run_xgboost_on_batch, classify_images
+from predictions.utils.snapshots import publish_snapshots
+
+
+def score_batch(ts):
+    """
+    Tabular and image inference for one timestamp, without writing anything.
+    Returns ``(row, zone, image_result)`` triples, one per animal.
+    """
+    rows, zones = score_tabular(run_xgboost_on_batch(ts))
+    try:
+        # Classify every flagged camera image for this timestamp in one call
+        image_results = classify_images(flagged_image_keys(rows, zones))
+    except Exception as e:
+        image_results = image_stage_failed(ts, e)
+    return assemble(rows, zones, image_results)
+
+
+def image_stage_failed(ts, error):
+    """
+    Logs a failed image inference; the batch is still committed with its
+    tabular rows and no image results.
+    """
+    print(f"[Image Inference Error] {ts}: {error}")
+    return {}
+
+
+def score_tabular(batch_predictions):
+    """Adds camera zones to the XGBoost records of a batch."""
+    zones = coordinates_to_zones(
+        [row['latitude'] for row in batch_predictions],
+        [row['longtitude'] for row in batch_predictions],
+    )
+    return batch_predictions, zones
+
+
+def flagged_image_keys(rows, zones):
+    return [(zone, row['datetime']) for zone, row in zip(zones, rows) if row['prediction'] == 1]
+
+
+def assemble(rows, zones, image_results):
+    return [
+        (row, zone, image_results.get((zone, row['datetime']), {}) if row['prediction'] == 1 else {})
+        for zone, row in zip(zones, rows)
+    ]
+
+
+def payload_entry(row, zone, result):
+    return {
+        "animal_id": row.get("animal_id"),
+        "species": row.get("species"),
+        "datetime": str(row.get("datetime")),
+        "timestamp": str(row.get("datetime")),
+        "latitude": row.get("latitude"),
+        "longtitude": row.get("longtitude"),
+        "prediction": "poacher" if row.get("prediction") == 1 else "normal",
+        "zone": zone,
+        "image_url": result.get("image_path"),
+        "class_name": result.get("class_name"),
+        "probability": result.get("probability")
+    }
+
+
+def commit_batch(ts, scored, chunk_size=500):
+    """
+    Persists a scored batch. Rows, dashboard snapshots and live events become
+    visible together. Returns the number of rows saved and the batch payload.
+    """
+    writer = PredictionBatchWriter(chunk_size=chunk_size)
+    payload = []
+    for row, zone, result in scored:
+        writer.add(row, result, zone)
+        payload.append(payload_entry(row, zone, result))
+
+    with DB_WRITE_SECONDS.time(), transaction.atomic():
+        saved = writer.flush()
+        publish_snapshots(ts.isoformat())
+        record_batch_events(ts, payload)
+    DB_WRITE_ROWS.inc(saved)
+    return saved, payload
@@ -0,0 +1,54 @@
+import os
+from django.conf import settings
+from django.db import transaction
+from predictions.models import PredictionResult
+
+
+def media_url(image_path):
+    """URL the dashboard loads a camera image from, or "" when there is none."""
+    if not image_path:
+        return ""
+    try:
+        relative_path = os.path.relpath(image_path, settings.MEDIA_ROOT).replace("\\", "/")
+    except ValueError:
+        return ""  # e.g. on another drive than MEDIA_ROOT
+    return f"{settings.MEDIA_URL}{relative_path}"
+
+
+class PredictionBatchWriter:
+    """
+    Collects one timestamp's results and persists them with bulk_create
+    inside a single transaction, instead of one INSERT per animal.
+    """
+
+    def __init__(self, chunk_size=500):
+        self.chunk_size = chunk_size
+        self._pending = []
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, row, result=None, zone=None):
+        result = result or {}
+        self._pending.append(PredictionResult(
+            timestamp=row.get("datetime"),
+            animal_id=row.get("animal_id"),
+            species=row.get("species"),
+            xgb_prediction="poacher" if row.get("prediction") == 1 else "normal",
+            latitude=row.get("latitude"),
+            longtitude=row.get("longtitude"),
+            image_path=result.get("image_path"),
+            image_class_prediction=result.get("class_name"),
+            probability=result.get("probability"),
+            zone=zone,
+            image_url=media_url(result.get("image_path")),
+        ))
+
+    def flush(self):
+        """Writes everything collected so far and returns the number of rows."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, []
+        with transaction.atomic():
+            PredictionResult.objects.bulk_create(pending, batch_size=self.chunk_size)
+        return len(pending)
@@ -0,0 +1,38 @@
+import hashlib
+from functools import wraps
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+from predictions.utils.snapshots import batch_version
+
+
+def _version(request):
+    # etag_func and last_modified_func both need it; look it up once per request
+    if not hasattr(request, '_batch_version'):
+        request._batch_version = batch_version()
+    return request._batch_version
+
+
+def batch_etag(request, *args, **kwargs):
+    tag, _ = _version(request)
+    return hashlib.md5(tag.encode()).hexdigest()
+
+
+def batch_last_modified(request, *args, **kwargs):
+    _, updated_at = _version(request)
+    return updated_at
+
+
+def batch_conditional(view):
+    """
+    Adds a strong ETag and Last-Modified derived from the latest prediction
+    batch. A matching If-None-Match gets a 304 after only the version check,
+    before the view runs. Place it under ``@api_view``.
+    """
+    @condition(etag_func=batch_etag, last_modified_func=batch_last_modified)
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        # Make browsers revalidate on every poll instead of serving a stale copy
+        patch_cache_control(response, no_cache=True)
+        return response
+    return wrapped
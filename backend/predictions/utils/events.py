@@ -0,0 +1,182 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+
+class InMemoryBackend:
+    """Delivers events to callbacks registered in the publishing process."""
+
+    def __init__(self):
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def deliver(self, topic, payload):
+        for callback in list(self._subscribers):
+            callback(topic, payload)
+
+    def close(self):
+        pass
+
+
+class FileSpoolBackend:
+    """
+    Appends events as JSON lines to a local spool file, so consumers in other
+    processes (web tier, alerting, archiving) can tail it with ``follow``.
+    ``subscribe`` does the same in this process, on a follower thread per
+    callback.
+    """
+
+    def __init__(self, path, poll_interval=0.5):
+        self.path = str(path)
+        self.poll_interval = poll_interval
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._stop = threading.Event()
+        self._followers = []
+
+    def subscribe(self, callback):
+        """Calls ``callback(topic, payload)`` for every event delivered from now on."""
+        # Like the in-memory backend, a subscriber only sees events published after it joined
+        offset = os.path.getsize(self.path)
+        follower = threading.Thread(
+            target=self._follow, args=(callback, offset), name="result-bus-follower", daemon=True
+        )
+        self._followers.append(follower)
+        follower.start()
+
+    def _follow(self, callback, offset):
+        for _, record in follow(self.path, offset, self.poll_interval, self._stop):
+            try:
+                callback(record["topic"], record["payload"])
+            except Exception as e:
+                print(f"[ResultBus Error] {e}")
+
+    def deliver(self, topic, payload):
+        record = {"topic": topic, "published_at": time.time(), "payload": payload}
+        self._file.write(json.dumps(record, cls=DjangoJSONEncoder) + "\n")
+        self._file.flush()
+
+    def close(self, timeout=5):
+        # Followers finish the events already written before they stop
+        self._stop.set()
+        for follower in self._followers:
+            follower.join(timeout)
+        self._file.close()
+
+
+def follow(path, offset=0, poll_interval=0.5, stop=None):
+    """
+    Yields ``(offset, record)`` for every event in a spool file, waiting for
+    new ones until ``stop`` is set and the events written so far are read.
+    Resume a consumer by passing the last offset it handled.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        f.seek(offset)
+        while True:
+            line = f.readline()
+            if not line or not line.endswith("\n"):
+                if stop is not None and stop.is_set():
+                    return
+                # Nothing new, or a line still being written: retry from the same place
+                f.seek(offset)
+                if stop is not None:
+                    stop.wait(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+                continue
+            offset = f.tell()
+            yield offset, json.loads(line)
+
+
+BACKENDS = {
+    "memory": InMemoryBackend,
+    "file": FileSpoolBackend,
+}
+
+
+class ResultBus:
+    """
+    In-process publication of batch results. ``publish`` only enqueues;
+    a worker thread hands events to the backend. When the bounded queue is
+    full, publishers wait up to ``put_timeout`` and then drop the event, so
+    a stuck consumer can never stall the batch loop.
+    """
+
+    def __init__(self, backend, queue_size=100, put_timeout=1.0):
+        self.backend = backend
+        self.put_timeout = put_timeout
+        self.stats = {"published": 0, "delivered": 0, "dropped": 0, "errors": 0}
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._run, name="result-bus", daemon=True)
+        self._worker.start()
+
+    def subscribe(self, callback):
+        self.backend.subscribe(callback)
+
+    def publish(self, topic, payload):
+        """Returns False when the event was dropped under backpressure."""
+        try:
+            self._queue.put((topic, payload), timeout=self.put_timeout)
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+        self.stats["published"] += 1
+        return True
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self.backend.deliver(*item)
+                self.stats["delivered"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"[ResultBus Error] {e}")
+
+    def close(self, timeout=5):
+        """Delivers whatever is still queued, then stops the worker."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._worker.join(timeout)
+        self.backend.close()
+
+
+def build_backend(name, **options):
+    backend_cls = BACKENDS[name] if name in BACKENDS else import_string(name)
+    return backend_cls(**options)
+
+
+_bus = None
+
+
+def get_result_bus():
+    """The process-wide bus configured by ``settings.RESULT_BUS``."""
+    global _bus
+    if _bus is None:
+        config = getattr(settings, 'RESULT_BUS', {})
+        _bus = ResultBus(
+            build_backend(config.get("BACKEND", "memory"), **config.get("OPTIONS", {})),
+            queue_size=config.get("QUEUE_SIZE", 100),
+            put_timeout=config.get("PUT_TIMEOUT", 1.0),
+        )
+    return _bus
+
+
+def close_result_bus():
+    """Flushes and shuts down the process-wide bus, if one was started."""
+    global _bus
+    if _bus is not None:
+        _bus.close()
+        _bus = None
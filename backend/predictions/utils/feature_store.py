@@ -0,0 +1,168 @@
+import json
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import models
+
+from predictions.models import AnimalMovement
+
+# Kept at full precision: they are returned with the predictions and drive zone lookup
+EXACT_COLUMNS = ['animal_id', 'latitude', 'longtitude']
+STRING_COLUMNS = [
+    field.attname for field in AnimalMovement._meta.concrete_fields
+    if isinstance(field, models.CharField)
+]
+# Every other non-key column is a numeric feature, stored as one float32 matrix
+MATRIX_COLUMNS = [
+    field.attname for field in AnimalMovement._meta.concrete_fields
+    if not field.primary_key and not isinstance(field, (models.CharField, models.DateTimeField))
+    and field.attname not in EXACT_COLUMNS
+]
+# Column order of every fetched batch, from the store or the database alike; it is
+# the order a partition is laid out in, so reads stay zero-copy
+BATCH_COLUMNS = MATRIX_COLUMNS + ['datetime'] + EXACT_COLUMNS + STRING_COLUMNS
+STORE_VERSION = 1
+PARTITION_FORMAT = '%Y%m%dT%H%M%S%fZ'
+
+
+def partition_name(ts):
+    return pd.Timestamp(ts).tz_convert('UTC').strftime(PARTITION_FORMAT)
+
+
+class FeatureStore:
+    """
+    Columnar copy of AnimalMovement, one directory per ``datetime``. The
+    numeric features of a timestamp are a single float32 ``matrix.npy``;
+    ids, coordinates and the categorical columns are one ``.npy`` each.
+    Reads memory-map the files, so a batch is a slice of the page cache
+    rather than rows decoded through the ORM.
+
+    The store is a read path only: AnimalMovement stays the source of
+    truth. A partition is served only while it holds as many rows as the
+    table has for its timestamp, so one left partial by a crash or made
+    stale by rows added outside import_data falls back to the database.
+    """
+
+    def __init__(self, root):
+        self.root = str(root)
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        manifest = os.path.join(self.root, 'manifest.json')
+        layout = {"version": STORE_VERSION, "matrix": MATRIX_COLUMNS, "strings": STRING_COLUMNS,
+                  "exact": EXACT_COLUMNS}
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                # A store written for another schema is ignored rather than misread
+                self.compatible = json.load(f) == layout
+        else:
+            with open(manifest, 'w') as f:
+                json.dump(layout, f, indent=2)
+            self.compatible = True
+
+    def partition_path(self, ts):
+        return os.path.join(self.root, partition_name(ts))
+
+    def has(self, ts):
+        return self.compatible and os.path.exists(os.path.join(self.partition_path(ts), 'matrix.npy'))
+
+    def stored_rows(self, ts):
+        """Rows in the partition for ``ts``, or None if there is none."""
+        if not self.has(ts):
+            return None
+        try:
+            return np.load(os.path.join(self.partition_path(ts), 'matrix.npy'), mmap_mode='r').shape[0]
+        except FileNotFoundError:
+            return None  # replaced while we were opening it
+
+    def is_complete(self, ts):
+        """True when the partition for ``ts`` holds every AnimalMovement row of it."""
+        stored = self.stored_rows(ts)
+        return stored is not None and stored == AnimalMovement.objects.filter(datetime=ts).count()
+
+    def write(self, frame):
+        """
+        Replaces the partitions of every timestamp in ``frame`` (AnimalMovement
+        columns, datetime parsed) with its rows, so pass all rows of a
+        timestamp at once.
+        """
+        if not self.compatible:
+            raise ValueError(f"Feature store at {self.root} was written for a different schema")
+        written = 0
+        for ts, rows in frame.groupby('datetime', sort=False):
+            with self._lock:
+                self._write_partition(ts, rows)
+            written += len(rows)
+        return written
+
+    def _write_partition(self, ts, rows):
+        final = self.partition_path(ts)
+        tmp = f"{final}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(tmp)
+        np.save(os.path.join(tmp, 'matrix.npy'), rows[MATRIX_COLUMNS].to_numpy(dtype=np.float32))
+        for column in EXACT_COLUMNS:
+            np.save(os.path.join(tmp, f'{column}.npy'), rows[column].to_numpy())
+        for column in STRING_COLUMNS:
+            np.save(os.path.join(tmp, f'{column}.npy'), rows[column].to_numpy(dtype=str))
+
+        # Swap the directories so readers see either the old or the new partition
+        old = None
+        if os.path.exists(final):
+            old = f"{final}.{uuid.uuid4().hex}.old"
+            os.rename(final, old)
+        os.rename(tmp, final)
+        if old:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def read(self, ts):
+        """
+        The stored rows for ``ts`` as a DataFrame whose numeric features are a
+        view over the memory-mapped matrix, in ``BATCH_COLUMNS`` order. None
+        if there is no partition or it doesn't match the table.
+        """
+        if not self.has(ts):
+            return None
+        path = self.partition_path(ts)
+        try:
+            matrix = np.load(os.path.join(path, 'matrix.npy'), mmap_mode='r')
+            extra = {
+                column: np.load(os.path.join(path, f'{column}.npy'), mmap_mode='r')
+                for column in EXACT_COLUMNS + STRING_COLUMNS
+            }
+        except FileNotFoundError:
+            return None  # replaced while we were opening it
+        if len(matrix) != AnimalMovement.objects.filter(datetime=ts).count():
+            return None
+
+        # Built from the 2-D block without copying; the other columns are added around it
+        frame = pd.DataFrame(matrix, columns=MATRIX_COLUMNS, copy=False)
+        frame['datetime'] = pd.Timestamp(ts)
+        for column, values in extra.items():
+            frame[column] = np.asarray(values, dtype=object) if values.dtype.kind == 'U' else np.asarray(values)
+        return frame
+
+    def timestamps(self):
+        names = [name for name in os.listdir(self.root) if name.endswith('Z')]
+        return sorted(
+            datetime.strptime(name, PARTITION_FORMAT).replace(tzinfo=timezone.utc) for name in names
+        )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_feature_store():
+    """The store at ``settings.FEATURE_STORE_DIR``, or None when disabled."""
+    global _store
+    root = getattr(settings, 'FEATURE_STORE_DIR', None)
+    if root and _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = FeatureStore(root)
+    return _store
@@ -0,0 +1,102 @@
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from predictions.models import PredictionResult
+
+CURSOR_SALT = 'predictions.history.cursor'
+PREDICTIONS = ('poacher', 'normal')
+
+
+def encode_cursor(row):
+    """Opaque, signed position just after ``row`` in newest-first order."""
+    return signing.dumps([row.timestamp.isoformat(), row.id], salt=CURSOR_SALT)
+
+
+def decode_cursor(cursor):
+    try:
+        timestamp, row_id = signing.loads(cursor, salt=CURSOR_SALT)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_instant(value, name):
+    """An ISO 8601 datetime or date (midnight); naive values use TIME_ZONE."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"'{name}' must be an ISO 8601 date or datetime")
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def page_size(value):
+    default = getattr(settings, 'HISTORY_PAGE_SIZE', 20)
+    limit = getattr(settings, 'HISTORY_MAX_PAGE_SIZE', 100)
+    if not value:
+        return default
+    try:
+        size = int(value)
+    except ValueError:
+        raise ValueError("'page_size' must be an integer")
+    if size < 1:
+        raise ValueError("'page_size' must be at least 1")
+    return min(size, limit)
+
+
+def history_queryset(params):
+    """
+    Filtered, newest-first PredictionResult rows for the query parameters
+    ``since`` (inclusive), ``until`` (exclusive), ``zone`` and ``species``
+    (comma-separated lists) and ``prediction`` (poacher by default, or
+    normal, or all). Raises ValueError on invalid parameters.
+    """
+    rows = PredictionResult.objects.all()
+
+    prediction = params.get('prediction') or 'poacher'
+    if prediction != 'all':
+        if prediction not in PREDICTIONS:
+            raise ValueError(f"'prediction' must be one of {', '.join(PREDICTIONS)} or all")
+        rows = rows.filter(xgb_prediction=prediction)
+    if params.get('since'):
+        rows = rows.filter(timestamp__gte=parse_instant(params['since'], 'since'))
+    if params.get('until'):
+        rows = rows.filter(timestamp__lt=parse_instant(params['until'], 'until'))
+    if params.get('zone'):
+        rows = rows.filter(zone__in=params['zone'].split(','))
+    if params.get('species'):
+        rows = rows.filter(species__in=params['species'].split(','))
+
+    return rows.order_by('-timestamp', '-id')
+
+
+def history_page(params):
+    """
+    One page of ``history_queryset(params)`` after ``params['cursor']``,
+    and the cursor of the next page (None on the last one).
+
+    The position is a (timestamp, id) keyset rather than an OFFSET, so the
+    database seeks straight to it through the (…, timestamp, id) indexes
+    and every page costs the same however deep it is.
+    """
+    rows = history_queryset(params)
+    size = page_size(params.get('page_size'))
+    if params.get('cursor'):
+        timestamp, row_id = decode_cursor(params['cursor'])
+        # The plain bound is what the index can seek on; the OR only settles timestamp ties
+        rows = rows.filter(timestamp__lte=timestamp).filter(
+            Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=row_id)
+        )
+
+    # One extra row tells whether another page follows
+    page = list(rows[:size + 1])
+    next_cursor = encode_cursor(page[size - 1]) if len(page) > size else None
+    return page[:size], next_cursor
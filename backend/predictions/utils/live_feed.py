@@ -0,0 +1,200 @@
+import asyncio
+import json
+import weakref
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Max
+from django.utils import timezone
+
+from predictions.models import LiveEvent
+
+# Which event audiences each channel receives, matching the notification views
+CHANNEL_AUDIENCES = {
+    "admin": ("admin", "all"),
+    "ranger": ("all",),
+}
+REPLAY_LIMIT = 500
+KEEPALIVE_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+def record_batch_events(ts, rows):
+    """
+    Stores the live events for one committed batch. ``rows`` are the
+    per-animal result dicts built by query_batches.
+    """
+    poachers = [row for row in rows if row["prediction"] == "poacher"]
+    images = [row for row in poachers if row.get("class_name")]
+
+    # Every dashboard refetches its results on this; batch_id names the snapshots it was published as
+    events = [LiveEvent(kind="batch", audience="all", payload={
+        "batch_id": ts.isoformat(),
+        "timestamp": ts,
+        "count": len(rows),
+        "poachers": len(poachers),
+    })]
+    if poachers:
+        events.append(LiveEvent(kind="alert", audience="admin", payload={
+            "type": "xgb",
+            "message": "Movement anomaly detected",
+            "timestamp": ts,
+        }))
+    if images:
+        events.append(LiveEvent(kind="image", audience="admin", payload={
+            "timestamp": ts,
+            "image_results": [
+                {
+                    "class_name": row["class_name"],
+                    "probability": row["probability"],
+                    "zone": row["zone"],
+                    "image_url": row["image_url"],
+                }
+                for row in images
+            ],
+        }))
+    if any(row["class_name"] == "poacher" for row in images):
+        events.append(LiveEvent(kind="alert", audience="all", payload={
+            "type": "image",
+            "message": "Poacher detected",
+            "timestamp": ts,
+        }))
+
+    LiveEvent.objects.bulk_create(events)
+    prune_events()
+    return events
+
+
+def prune_events(now=None):
+    """
+    Deletes events older than ``settings.LIVE_FEED_RETENTION_DAYS`` (kept
+    forever when None); returns how many. Ids grow with creation time, so
+    the cut is an id bound found by walking the oldest rows, of which only
+    the expired ones are read.
+    """
+    days = getattr(settings, 'LIVE_FEED_RETENTION_DAYS', 7)
+    if days is None:
+        return 0
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    expired = LiveEvent.objects.all()
+    for event_id, created_at in LiveEvent.objects.order_by('id').values_list('id', 'created_at').iterator():
+        if created_at >= cutoff:
+            expired = expired.filter(id__lt=event_id)
+            break
+    return expired.delete()[0]
+
+
+def format_event(event):
+    data = json.dumps(event.payload, cls=DjangoJSONEncoder)
+    return f"id: {event.id}\nevent: {event.kind}\ndata: {data}\n\n"
+
+
+class LiveFeedHub:
+    """
+    One per event loop: polls the events table once for all connected
+    clients and fans new rows out to their queues.
+    """
+
+    def __init__(self, poll_interval):
+        self.poll_interval = poll_interval
+        self.subscribers = set()
+        self.cursor = None
+        self._task = None
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self):
+        """Returns a queue and the last event id already covered by the hub."""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        async with self._lock:
+            if self._task is None or self._task.done():
+                # Nothing was polled while idle: start from the newest event instead of
+                # pushing the whole gap as live (clients replay it via Last-Event-ID)
+                latest = await LiveEvent.objects.aaggregate(last=Max('id'))
+                self.cursor = latest['last'] or 0
+                self.subscribers.add(queue)
+                self._task = asyncio.create_task(self._run())
+            else:
+                self.subscribers.add(queue)
+            return queue, self.cursor
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def _deliver(self, event):
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too slow to keep up: end its stream, EventSource reconnects and replays
+                self.unsubscribe(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def _run(self):
+        while self.subscribers:
+            # Drain everything committed since the last poll before sleeping again
+            while True:
+                events = [
+                    event async for event in
+                    LiveEvent.objects.filter(id__gt=self.cursor).order_by('id')[:REPLAY_LIMIT]
+                ]
+                for event in events:
+                    self._deliver(event)
+                if events:
+                    self.cursor = events[-1].id
+                if len(events) < REPLAY_LIMIT:
+                    break
+            await asyncio.sleep(self.poll_interval)
+
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_hub():
+    loop = asyncio.get_running_loop()
+    if loop not in _hubs:
+        _hubs[loop] = LiveFeedHub(getattr(settings, 'LIVE_FEED_POLL_INTERVAL', 0.5))
+    return _hubs[loop]
+
+
+async def event_stream(channel, last_event_id=None):
+    """
+    Server-sent events for ``channel``. With ``last_event_id``, missed events
+    are replayed from the database before switching to live delivery.
+    """
+    audiences = CHANNEL_AUDIENCES[channel]
+    hub = get_hub()
+    queue, cursor = await hub.subscribe()
+    try:
+        last = last_event_id
+        # Page through the whole gap up to where live delivery takes over
+        while last is not None:
+            missed = [
+                event async for event in
+                LiveEvent.objects
+                .filter(id__gt=last, id__lte=cursor, audience__in=audiences)
+                .order_by('id')[:REPLAY_LIMIT]
+            ]
+            for event in missed:
+                yield format_event(event)
+                last = event.id
+            if len(missed) < REPLAY_LIMIT:
+                break
+
+        yield "retry: 2000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                break
+            if last is not None and event.id <= last:
+                continue
+            if event.audience in audiences:
+                yield format_event(event)
+            last = event.id
+    finally:
+        hub.unsubscribe(queue)
@@ -0,0 +1,330 @@
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+# Seconds; spans a cached image lookup up to a slow full batch
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Metric:
+    """
+    A named family of series, one per tuple of label values. Updates take a
+    per-metric lock and touch a dict entry, so they are cheap enough to sit on
+    every hot path.
+    """
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(value) for value in labels)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, labels=()):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            series = dict(self._series)
+        for key, value in series.items():
+            yield self.name + '_total', key, (), value
+
+    def snapshot(self):
+        with self._lock:
+            return [{"labels": dict(zip(self.labelnames, key)), "value": value}
+                    for key, value in self._series.items()]
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, labels=()):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def samples(self):
+        with self._lock:
+            series = dict(self._series)
+        for key, value in series.items():
+            yield self.name, key, (), value
+
+    snapshot = Counter.snapshot
+
+
+class Histogram(Metric):
+    """Observations counted into fixed buckets, plus their sum and count."""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, labels=()):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), sum, count
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, labels=()):
+        """Context manager observing the seconds spent inside it."""
+        return Timer(self, labels)
+
+    def samples(self):
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in series.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                yield self.name + '_bucket', key, (('le', _format_value(bound)),), cumulative
+            yield self.name + '_sum', key, (), total
+            yield self.name + '_count', key, (), count
+
+    def snapshot(self):
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        return [
+            {
+                "labels": dict(zip(self.labelnames, key)),
+                "count": count,
+                "sum": total,
+                "mean": total / count if count else None,
+                "buckets": dict(zip([_format_value(b) for b in self.buckets + (math.inf,)], counts)),
+            }
+            for key, (counts, total, count) in series.items()
+        ]
+
+
+class Timer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram, labels=()):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, self.labels)
+        return False
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _register(cls, name, documentation, labelnames, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, documentation, labelnames, **kwargs)
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} is already registered with a different type or labels")
+        return metric
+
+
+def counter(name, documentation, labelnames=()):
+    return _register(Counter, name, documentation, labelnames)
+
+
+def gauge(name, documentation, labelnames=()):
+    return _register(Gauge, name, documentation, labelnames)
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return _register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+
+def render_prometheus():
+    """Every registered metric in the Prometheus text exposition format (0.0.4)."""
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, key, extra, value in metric.samples():
+            lines.append(f"{name}{_format_labels(metric.labelnames, key, extra)} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+def snapshot():
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    return {
+        "time": time.time(),
+        "pid": os.getpid(),
+        "metrics": {
+            metric.name: {"type": metric.kind, "help": metric.documentation, "series": metric.snapshot()}
+            for metric in metrics
+        },
+    }
+
+
+def dump_json(path):
+    """Writes ``snapshot()`` to ``path``, replacing it atomically."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(snapshot(), f, indent=2)
+    os.replace(tmp, path)
+
+
+class JsonDumper:
+    """Background thread writing ``snapshot()`` to a file every ``interval`` seconds."""
+
+    def __init__(self, path, interval=60):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-json-dump', daemon=True)
+
+    def start(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._dump()
+
+    def _dump(self):
+        try:
+            dump_json(self.path)
+        except OSError as e:
+            print(f"[Metrics Error] {self.path}: {e}")
+
+    def stop(self):
+        """Stops the thread and writes a final snapshot."""
+        self._stop.set()
+        self._thread.join()
+        self._dump()
+
+
+_dumper = None
+
+
+def start_json_dump():
+    """
+    Starts the periodic dump configured by ``settings.METRICS['JSON_DUMP']``
+    (``{pid}`` in the path is replaced so processes don't overwrite each
+    other). Does nothing when unset or already running.
+    """
+    global _dumper
+    config = getattr(settings, 'METRICS', {})
+    path = config.get('JSON_DUMP')
+    with _registry_lock:
+        if path and _dumper is None:
+            _dumper = JsonDumper(str(path).format(pid=os.getpid()), config.get('DUMP_INTERVAL', 60)).start()
+    return _dumper
+
+
+def stop_json_dump():
+    global _dumper
+    with _registry_lock:
+        dumper, _dumper = _dumper, None
+    if dumper is not None:
+        dumper.stop()
+
+
+# Hot paths
+BATCH_FETCH_SECONDS = histogram(
+    'ecoguard_batch_fetch_seconds', "Time to load one timestamp's movement rows", ['source'])
+FEATURE_PREP_SECONDS = histogram(
+    'ecoguard_feature_prep_seconds', "Time to build the XGBoost feature matrix for a batch")
+XGBOOST_PREDICT_SECONDS = histogram(
+    'ecoguard_xgboost_predict_seconds', "Time spent in XGBoost predict for a batch")
+XGBOOST_ROWS = counter('ecoguard_xgboost_rows', "Rows scored by XGBoost")
+XGBOOST_ERRORS = counter('ecoguard_xgboost_errors', "Batches XGBoost failed to score")
+IMAGE_DECODE_SECONDS = histogram(
+    'ecoguard_image_decode_seconds', "Time to decode and resize one camera image, cache included")
+IMAGE_PREDICT_SECONDS = histogram(
+    'ecoguard_image_predict_seconds', "Time spent in one image model predict call", ['backend'])
+IMAGE_PREDICT_IMAGES = counter('ecoguard_image_predict_images', "Images run through the image model", ['backend'])
+DB_WRITE_SECONDS = histogram(
+    'ecoguard_db_write_seconds', "Time to commit a scored batch: rows, snapshots and live events")
+DB_WRITE_ROWS = counter('ecoguard_db_write_rows', "PredictionResult rows written")
+
+# Batches
+BATCHES = counter('ecoguard_batches', "Timestamps processed")
+BATCH_SECONDS = histogram('ecoguard_batch_seconds', "End-to-end processing time of one timestamp")
+BATCH_LAG = gauge('ecoguard_batch_lag_seconds', "Delay between the last batch timestamp and the start of its processing")
+BATCH_BACKLOG = gauge('ecoguard_batch_backlog', "Timestamps pending after the last batch")
+PIPELINE_STAGE_SECONDS = histogram(
+    'ecoguard_pipeline_stage_seconds', "Time a pipelined batch spent in each stage", ['stage'])
+
+# API
+HTTP_REQUESTS = counter('ecoguard_http_requests', "HTTP requests served", ['method', 'view', 'status'])
+HTTP_REQUEST_SECONDS = histogram(
+    'ecoguard_http_request_seconds', "Time to produce a response, middleware included", ['method', 'view'])
+
+
+class MetricsMiddleware:
+    """
+    Times every request and counts responses by view route and status.
+    Streaming responses (the live feed) are timed until their headers are
+    ready, not until the stream ends. Put it first in ``MIDDLEWARE``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        start_json_dump()
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+        match = request.resolver_match
+        # The route pattern, not the path, keeps the number of series bounded
+        view = match.route if match else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(elapsed, (request.method, view))
+        HTTP_REQUESTS.inc(labels=(request.method, view, response.status_code))
+        return response
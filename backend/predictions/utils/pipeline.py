@@ -0,0 +1,191 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.db import connections
+from django.utils import timezone
+
+from predictions.utils.batch_engine import assemble, flagged_image_keys, image_stage_failed, score_tabular
+from predictions.utils.predict_tools import (
+    classify_decoded, decode_images, fetch_batch, recall_classifications,
+    resolve_image_paths, score_frame,
+)
+from predictions.utils.metrics import PIPELINE_STAGE_SECONDS
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    name: str
+    processed: int = 0
+    errors: int = 0
+    busy: float = 0.0         # seconds spent working on batches
+    max_latency: float = 0.0  # slowest single batch, in seconds
+    wait: float = 0.0         # seconds batches sat in this stage's input queue
+    queue_depth: int = 0      # batches waiting in the input queue right now
+    max_queue_depth: int = 0
+
+    def as_dict(self, elapsed=None):
+        stats = {
+            "processed": self.processed,
+            "errors": self.errors,
+            "avg_latency": self.busy / self.processed if self.processed else 0.0,
+            "max_latency": self.max_latency,
+            "avg_wait": self.wait / self.processed if self.processed else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+        }
+        if elapsed:
+            # Fraction of the run this stage was busy; the highest one is the bottleneck
+            stats["occupancy"] = self.busy / elapsed
+        return stats
+
+
+@dataclass
+class _Batch:
+    ts: object
+    index: int
+    started_at: object
+    started: float
+    data: object = None
+    queued: float = 0.0
+    failed: bool = False
+
+
+class BatchPipeline:
+    """
+    Runs fetch -> tabular inference -> image inference -> persist as stages
+    on their own threads, joined by bounded queues, so batch t+1 is read and
+    decoded while batch t is still being classified and written. Image
+    decoding fans out to a thread pool from the tabular stage; a single
+    inference thread owns the image model.
+
+    ``commit(ts, scored)`` runs on the writer thread in timestamp order and
+    ``on_batch(ts, started_at, processing_time, index)`` after each commit.
+    A batch that fails to score is passed on and reported without being
+    committed; one that fails to commit halts the run, so ``on_batch`` is
+    never called for it or anything after it.
+    """
+
+    def __init__(self, commit, on_batch=None, queue_size=2, decode_workers=4):
+        self.commit = commit
+        self.on_batch = on_batch
+        self.queue_size = queue_size
+        self.decode_workers = decode_workers
+        self.stats = {
+            name: StageStats(name) for name in ("fetch", "tabular", "inference", "writer")
+        }
+        self.elapsed = 0.0
+        self.halted = False
+
+    def run(self, timestamps):
+        """
+        Pushes ``timestamps`` through every stage; returns once all are
+        written, or False when a commit failed and the rest were dropped.
+        """
+        started = time.perf_counter()
+        self.halted = False
+        source = queue.Queue()
+        for index, ts in enumerate(timestamps):
+            source.put(_Batch(ts, index, None, 0.0, queued=time.perf_counter()))
+        source.put(_DONE)
+
+        queues = [source] + [queue.Queue(maxsize=self.queue_size) for _ in range(3)]
+        with ThreadPoolExecutor(self.decode_workers, thread_name_prefix="decode") as decode_pool:
+            self._decode_pool = decode_pool
+            stages = list(self.stats.values())
+            steps = [self._fetch, self._tabular, self._inference, self._write]
+            threads = [
+                threading.Thread(
+                    target=self._stage,
+                    args=(stats, step, queues[i], queues[i + 1] if i < 3 else None,
+                          stages[i + 1] if i < 3 else None),
+                    name=f"pipeline-{stats.name}",
+                    daemon=True,
+                )
+                for i, (stats, step) in enumerate(zip(stages, steps))
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.elapsed += time.perf_counter() - started
+        return not self.halted
+
+    def summary(self):
+        return {name: stats.as_dict(self.elapsed) for name, stats in self.stats.items()}
+
+    def _stage(self, stats, step, inbox, outbox, downstream):
+        try:
+            while True:
+                batch = inbox.get()
+                if batch is _DONE:
+                    break
+                stats.queue_depth = inbox.qsize()
+                stats.wait += time.perf_counter() - batch.queued
+
+                start = time.perf_counter()
+                if self.halted:
+                    # Drain what is in flight without doing the work
+                    batch.failed = True
+                elif not batch.failed:
+                    try:
+                        step(batch)
+                    except Exception as e:
+                        print(f"[Pipeline Error] {stats.name} {batch.ts}: {e}")
+                        batch.failed = True
+                        batch.data = None
+                        stats.errors += 1
+                        if outbox is None:
+                            # Not committed: later commits must not move the watermark past it
+                            self.halted = True
+                latency = time.perf_counter() - start
+                PIPELINE_STAGE_SECONDS.observe(latency, (stats.name,))
+                stats.busy += latency
+                stats.max_latency = max(stats.max_latency, latency)
+                stats.processed += 1
+
+                if outbox is not None:
+                    batch.queued = time.perf_counter()
+                    outbox.put(batch)
+                    downstream.queue_depth = outbox.qsize()
+                    downstream.max_queue_depth = max(downstream.max_queue_depth, downstream.queue_depth)
+                elif self.on_batch and not self.halted:
+                    # Scoring failures still get here, so a bad row can't stall the loop
+                    self.on_batch(batch.ts, batch.started_at,
+                                  time.perf_counter() - batch.started, batch.index)
+        finally:
+            if outbox is not None:
+                outbox.put(_DONE)
+            # Each stage thread holds its own database connection
+            connections.close_all()
+
+    def _fetch(self, batch):
+        batch.started_at = timezone.now()
+        batch.started = time.perf_counter()
+        batch.data = fetch_batch(batch.ts)
+
+    def _tabular(self, batch):
+        rows, zones = score_tabular(score_frame(batch.data))
+        try:
+            # Images classified before by the same model skip decoding and inference
+            known, paths = recall_classifications(resolve_image_paths(flagged_image_keys(rows, zones)))
+            futures = decode_images(paths, self._decode_pool)
+        except Exception as e:
+            known, paths, futures = image_stage_failed(batch.ts, e), {}, {}
+        batch.data = (rows, zones, known, paths, futures)
+
+    def _inference(self, batch):
+        rows, zones, image_results, paths, futures = batch.data
+        # Same handling as score_batch: a failure drops the batch's image results, not its rows
+        try:
+            decoded = {key: future.result() for key, future in futures.items()}
+            image_results.update(classify_decoded(paths, decoded))
+        except Exception as e:
+            image_results = image_stage_failed(batch.ts, e)
+        batch.data = assemble(rows, zones, image_results)
+
+    def _write(self, batch):
+        self.commit(batch.ts, batch.data)
@@ -1,69 +1,216 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-import pickle
 from django.conf import settings
 from predictions.models import AnimalMovement
-from predictions.machine_learning.preprocessor import data_prep, preprocess_image
+from predictions.machine_learning.classification_memo import file_digest, get_classification_memo
+from predictions.machine_learning.preprocessor import preprocess_image
 from predictions.machine_learning.predictor import image_classifier
-
-# Load once
-with open(os.path.join(settings.BASE_DIR, "predictions/machine_learning/models/xgboost_poacher_model.pkl"), 'rb') as file:
-    xgb_model = pickle.load(file)
+from predictions.machine_learning.registry import get_model
+from predictions.utils.feature_store import BATCH_COLUMNS, get_feature_store
+from predictions.utils.metrics import (
+    BATCH_FETCH_SECONDS, FEATURE_PREP_SECONDS, XGBOOST_ERRORS, XGBOOST_PREDICT_SECONDS, XGBOOST_ROWS,
+)
 
 class_names = ['elephant', 'poacher', 'rhino']
 
 
-def run_xgboost_on_batch(ts):
-    results = []
-    qs = AnimalMovement.objects.filter(datetime=ts)
-    df_raw = pd.DataFrame(list(qs.values()))
+# Columns that identify a row; everything else on AnimalMovement is a model feature
+ID_COLUMNS = ['animal_id', 'species', 'datetime', 'latitude', 'longtitude']
+FEATURE_COLUMNS = [
+    field.attname for field in AnimalMovement._meta.concrete_fields
+    if field.attname not in ID_COLUMNS and not field.primary_key
+]
+
+
+def fetch_batch(ts):
+    """
+    Loads one timestamp as a DataFrame holding only the identifying and
+    feature columns: memory-mapped from the feature store when it holds the
+    timestamp, otherwise read from AnimalMovement.
+    """
+    store = get_feature_store()
+    if store is not None:
+        start = time.perf_counter()
+        frame = store.read(ts)
+        if frame is not None:
+            BATCH_FETCH_SECONDS.observe(time.perf_counter() - start, ('feature_store',))
+            return frame
+    with BATCH_FETCH_SECONDS.time(('database',)):
+        return fetch_batch_from_db(ts)
+
+
+def fetch_batch_from_db(ts):
+    """``fetch_batch`` through the ORM, built column-wise from value tuples."""
+    rows = AnimalMovement.objects.filter(datetime=ts).values_list(*BATCH_COLUMNS)
+    return pd.DataFrame.from_records(list(rows), columns=BATCH_COLUMNS)
+
+
+def run_xgboost_on_batch(ts, as_frame=False):
+    """
+    Scores every animal at ``ts`` with the native booster. Returns a list of
+    records by default, or the identifying columns plus ``prediction`` and
+    ``xgb_probability`` columns when ``as_frame``.
+    """
+    return score_frame(fetch_batch(ts), as_frame=as_frame)
+
+
+def score_frame(df_raw, as_frame=False):
+    """Scores an already fetched batch; see ``run_xgboost_on_batch``."""
+    empty = pd.DataFrame(columns=ID_COLUMNS + ['prediction']) if as_frame else []
     if df_raw.empty:
-        return []
+        return empty
 
     try:
-        df_preprocessed = data_prep(df_raw)
-        preds = xgb_model.predict(df_preprocessed)
-        df_raw['prediction'] = preds
-
-        df_print = df_raw[['datetime', 'species', 'prediction']]
-        print(df_print.head())
-
-        # Return all predictions, not only poachers
-        for _, row in df_raw.iterrows():
-            results.append({
-                "animal_id": row["animal_id"],
-                "species": row["species"],
-                "datetime": row["datetime"],
-                "latitude": row["latitude"],
-                "longtitude": row["longtitude"],
-                "prediction": int(row["prediction"]),
-            })
+        engine = get_model('xgb_booster')
+        with FEATURE_PREP_SECONDS.time():
+            # Boosters saved without feature names get the training (table) order, never
+            # whatever order the batch frame happens to be in
+            features = get_model('feature_pipeline').transform(
+                df_raw, columns=engine.feature_names or FEATURE_COLUMNS, dtype=np.float32
+            )
+        with XGBOOST_PREDICT_SECONDS.time():
+            proba = engine.predict_proba(features)
+        XGBOOST_ROWS.inc(len(df_raw))
+
+        results = df_raw[ID_COLUMNS].copy()
+        results['prediction'] = engine.labels(proba)
+        if proba.ndim == 1:
+            results['xgb_probability'] = proba.astype(float)
+
+        print(results[['datetime', 'species', 'prediction']].head())
     except Exception as e:
         print(f"[XGBoost Error] {e}")
+        XGBOOST_ERRORS.inc()
+        return empty
 
-    return results
-
+    # Return all predictions, not only poachers
+    return results if as_frame else results.to_dict('records')
 
 
-def classify_image(zone, datetime_str):
+def image_path_for(zone, datetime_str):
     dt_obj = pd.to_datetime(datetime_str)
     img_name = dt_obj.strftime('%Y-%m-%d_%H-%M-%S') + ".jpg"
-    image_path = os.path.join(settings.BASE_DIR, 'media', 'camera_zones', zone, img_name)
+    return os.path.join(settings.MEDIA_ROOT, 'camera_zones', zone, img_name)
+
+
+def _decode(image_path):
+    try:
+        return preprocess_image(image_path)
+    except Exception as e:
+        print(f"[Image Decode Error] {image_path}: {e}")
+        return None
+
+
+def _to_result(zone, datetime_str, image_path, probs):
+    class_index = int(probs.argmax())
+    return {
+        "zone": zone,
+        "datetime": datetime_str,
+        "image_path": image_path,
+        "class_name": class_names[class_index],
+        "probability": float(probs[class_index])
+    }
+
+
+def classify_image(zone, datetime_str):
+    image_path = image_path_for(zone, datetime_str)
 
     if not os.path.exists(image_path):
         raise FileNotFoundError(f"Image not found: {image_path}")
 
+    known, remaining = recall_classifications({(zone, datetime_str): image_path})
+    if known:
+        return known[(zone, datetime_str)]
+
     img_tensor = preprocess_image(image_path)
     predictions = image_classifier(img_tensor)
+    remember_classifications(remaining, predictions)
+
+    return _to_result(zone, datetime_str, image_path, predictions[0])
+
+
+def resolve_image_paths(keys):
+    """
+    Deduplicated (zone, datetime) keys mapped to the camera images that
+    exist; keys without a zone or image are left out.
+    """
+    paths = {}
+    for zone, datetime_str in dict.fromkeys(keys):
+        if zone is None:
+            continue
+        image_path = image_path_for(zone, datetime_str)
+        if os.path.exists(image_path):
+            paths[(zone, datetime_str)] = image_path
+    return paths
+
+
+def recall_classifications(paths):
+    """
+    Splits key -> image path into results already memoized for the current
+    image model and the paths that still need inference.
+    """
+    memo = get_classification_memo()
+    if memo is None or not paths:
+        return {}, paths
+
+    hashes = {key: file_digest(path) for key, path in paths.items()}
+    known = memo.lookup(hashes.values())
+    results = {
+        key: _to_result(key[0], key[1], paths[key], known[image_hash])
+        for key, image_hash in hashes.items() if image_hash in known
+    }
+    remaining = {key: path for key, path in paths.items() if key not in results}
+    return results, remaining
+
+
+def remember_classifications(paths, predictions):
+    """Memoizes model outputs, given in the same order as ``paths``."""
+    memo = get_classification_memo()
+    if memo is not None:
+        memo.store({file_digest(path): probs for path, probs in zip(paths.values(), predictions)})
 
-    class_index = predictions.argmax()
-    class_name = class_names[class_index]
-    probability = float(predictions[0][class_index])
+
+def decode_images(paths, pool):
+    """Starts decoding every image on ``pool``; returns key -> future."""
+    return {key: pool.submit(_decode, path) for key, path in paths.items()}
+
+
+def classify_decoded(paths, decoded):
+    """
+    Runs one predict call over the decoded tensors (key -> tensor, None for
+    images that failed to decode) and returns key -> result.
+    """
+    decoded = {key: tensor for key, tensor in decoded.items() if tensor is not None}
+    if not decoded:
+        return {}
+
+    predictions = image_classifier(np.concatenate(list(decoded.values())))
+    remember_classifications({key: paths[key] for key in decoded}, predictions)
 
     return {
-        "zone": zone,
-        "datetime": datetime_str,
-        "image_path": image_path,
-        "class_name": class_name,
-        "probability": probability
+        key: _to_result(key[0], key[1], paths[key], probs)
+        for key, probs in zip(decoded, predictions)
     }
+
+
+def classify_images(keys, max_workers=4):
+    """
+    Classifies the camera images for many (zone, datetime) keys at once.
+
+    Keys are deduplicated and memoized results reused; the remaining images
+    are decoded in parallel and stacked into one tensor for a single predict
+    call. Returns a mapping of key -> result; keys without a zone or readable
+    image are left out.
+    """
+    results, paths = recall_classifications(resolve_image_paths(keys))
+    if not paths:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = decode_images(paths, pool)
+        decoded = {key: future.result() for key, future in futures.items()}
+    results.update(classify_decoded(paths, decoded))
+    return results
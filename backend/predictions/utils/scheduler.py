@@ -0,0 +1,129 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from django.db.models import Max
+from django.utils import timezone
+
+from predictions.models import AnimalMovement, PredictionResult
+from predictions.utils.metrics import BATCH_BACKLOG, BATCH_LAG, BATCH_SECONDS, BATCHES
+
+
+@dataclass
+class BatchMetrics:
+    timestamp: object
+    started_at: object
+    lag: float              # seconds between the batch timestamp and the start of processing
+    processing_time: float  # seconds spent inside the batch callback
+    backlog: int            # timestamps still pending after this batch
+
+
+class BatchScheduler:
+    """
+    Drives batch processing off a watermark of processed timestamps.
+
+    Every timestamp newer than the watermark is processed back to back, so a
+    backlog is drained at full speed. Once caught up, the scheduler only waits
+    until the next wall-clock tick before looking for new timestamps again.
+    """
+
+    def __init__(self, process_batch, interval=60, watermark=None, history=1000,
+                 on_batch=None, process_pending=None, clock=time.monotonic, sleep=time.sleep):
+        if not interval > 0:
+            raise ValueError(f"interval must be a positive number of seconds, got {interval}")
+        self.process_batch = process_batch
+        # Optional replacement for the one-by-one loop; it must call record() per batch
+        self.process_pending = process_pending
+        self.interval = interval
+        self.watermark = watermark
+        self.metrics = deque(maxlen=history)
+        self.on_batch = on_batch
+        self._clock = clock
+        self._sleep = sleep
+        self._next_tick = None
+
+    @staticmethod
+    def resume_watermark():
+        """Latest timestamp already persisted as a prediction, if any."""
+        return PredictionResult.objects.aggregate(ts=Max('timestamp'))['ts']
+
+    def pending(self):
+        timestamps = (
+            AnimalMovement.objects
+            .values_list('datetime', flat=True)
+            .distinct()
+            .order_by('datetime')
+        )
+        if self.watermark is not None:
+            timestamps = timestamps.filter(datetime__gt=self.watermark)
+        return list(timestamps)
+
+    def run_once(self):
+        """
+        Processes every pending timestamp and returns how many were handled.
+        A batch that raises is not recorded and ends the pass, so the next
+        tick retries it: the watermark never moves past an uncommitted batch.
+        """
+        pending = self.pending()
+        if self.process_pending:
+            self.process_pending(pending)
+            return len(pending)
+        for index, ts in enumerate(pending):
+            started_at = timezone.now()
+            start = self._clock()
+            try:
+                self.process_batch(ts)
+            except Exception as e:
+                # process_batch handles scoring errors itself; what reaches here failed to commit
+                print(f"[Batch Error] {ts}: {e}; retrying on the next tick")
+                return index
+            self.record(ts, started_at, self._clock() - start, len(pending) - index - 1)
+        return len(pending)
+
+    def record(self, ts, started_at, processing_time, backlog):
+        """Marks ``ts`` as processed and stores its metrics."""
+        metrics = BatchMetrics(
+            timestamp=ts,
+            started_at=started_at,
+            lag=(started_at - ts).total_seconds(),
+            processing_time=processing_time,
+            backlog=backlog,
+        )
+        self.watermark = ts
+        self.metrics.append(metrics)
+        BATCHES.inc()
+        BATCH_SECONDS.observe(processing_time)
+        BATCH_LAG.set(metrics.lag)
+        BATCH_BACKLOG.set(backlog)
+        if self.on_batch:
+            self.on_batch(metrics)
+        return metrics
+
+    def wait_for_next_tick(self):
+        now = self._clock()
+        if self._next_tick is None:
+            self._next_tick = now
+        # Skip ticks missed while catching up instead of firing them in a burst
+        while self._next_tick <= now:
+            self._next_tick += self.interval
+        self._sleep(self._next_tick - now)
+
+    def run(self, once=False):
+        while True:
+            self.run_once()
+            if once:
+                return
+            self.wait_for_next_tick()
+
+    def summary(self):
+        if not self.metrics:
+            return {"batches": 0}
+        times = [m.processing_time for m in self.metrics]
+        lags = [m.lag for m in self.metrics]
+        return {
+            "batches": len(self.metrics),
+            "avg_processing_time": sum(times) / len(times),
+            "max_processing_time": max(times),
+            "avg_lag": sum(lags) / len(lags),
+            "max_lag": max(lags),
+        }
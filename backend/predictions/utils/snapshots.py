@@ -0,0 +1,170 @@
+from django.db import transaction
+from django.db.models import Max
+from predictions.models import BatchSnapshot, PredictionResult
+
+
+def build_map_view_payload():
+    """
+    Rhino and elephant coordinates for the latest prediction batch.
+    """
+    latest_timestamp = (
+        PredictionResult.objects
+        .order_by('-timestamp')
+        .values_list('timestamp', flat=True)
+        .first()
+    )
+
+    if not latest_timestamp:
+        return {
+            "rhinos": [],
+            "elephants": [],
+            "latest_timestamp": None
+        }
+
+    results = PredictionResult.objects.filter(
+        timestamp=latest_timestamp,
+        species__in=['rhino', 'elephant']
+    )
+
+    rhinos, elephants = [], []
+
+    for row in results:
+        entry = {
+            "id": row.animal_id,
+            "latitude": row.latitude,
+            "longitude": row.longtitude,
+        }
+        if row.species.lower() == 'rhino':
+            rhinos.append(entry)
+        elif row.species.lower() == 'elephant':
+            elephants.append(entry)
+
+    return {
+        "rhinos": rhinos,
+        "elephants": elephants,
+        "latest_timestamp": latest_timestamp
+    }
+
+
+def build_xgb_results_payload():
+    """
+    All XGB predictions for the most recent timestamp.
+    """
+    latest_ts = (
+        PredictionResult.objects
+        .order_by('-timestamp')
+        .values_list('timestamp', flat=True)
+        .distinct()
+        .first()
+    )
+
+    if not latest_ts:
+        return {"xgb_results": []}
+
+    recent_preds = PredictionResult.objects.filter(timestamp=latest_ts)
+    data = [
+        {
+            "id": pred.id,
+            "species": pred.species,
+            "prediction": pred.xgb_prediction,
+            "latitude": pred.latitude,
+            "longtitude": pred.longtitude,
+            "timestamp": pred.timestamp,
+        }
+        for pred in recent_preds
+    ]
+
+    return {"xgb_results": data}
+
+
+def build_image_results_payload():
+    """
+    Image classification results for the most recent poacher detection.
+    """
+    recent_poacher = (
+        PredictionResult.objects
+        .filter(xgb_prediction="poacher")
+        .order_by('-timestamp')
+        .first()
+    )
+    if not recent_poacher:
+        return {
+            "message": "Camera Trap Off, No Poachers Detected For Now",
+        }
+
+    all_with_ts = PredictionResult.objects.filter(timestamp=recent_poacher.timestamp)
+    results = []
+
+    for row in all_with_ts:
+        if row.image_class_prediction and row.image_path:
+            results.append({
+                "class_name": row.image_class_prediction,
+                "probability": row.probability,
+                "zone": row.zone,
+                "datetime": row.timestamp,
+                "image_url": row.image_url or "",
+            })
+
+    return {"image_results": results}
+
+
+# Endpoint name -> payload builder for every snapshotted view
+SNAPSHOT_BUILDERS = {
+    "mapview": build_map_view_payload,
+    "xgb-results": build_xgb_results_payload,
+    "image-results": build_image_results_payload,
+}
+
+
+def publish_snapshots(batch_id=None):
+    """
+    Recomputes every endpoint payload and swaps them in atomically. Called
+    by query_batches when it commits a batch, and after manual edits. The
+    batch id defaults to the latest stored timestamp.
+    """
+    if batch_id is None:
+        latest = PredictionResult.objects.order_by('-timestamp').values_list('timestamp', flat=True).first()
+        batch_id = latest.isoformat() if latest else ""
+    with transaction.atomic():
+        for endpoint, build in SNAPSHOT_BUILDERS.items():
+            BatchSnapshot.objects.update_or_create(
+                endpoint=endpoint,
+                defaults={"batch_id": str(batch_id), "payload": build()},
+            )
+
+
+def snapshot_payload(endpoint):
+    """
+    The stored payload for ``endpoint``, or a live computation when no batch
+    has been published yet.
+    """
+    payload = (
+        BatchSnapshot.objects
+        .filter(endpoint=endpoint)
+        .values_list('payload', flat=True)
+        .first()
+    )
+    if payload is None:
+        payload = SNAPSHOT_BUILDERS[endpoint]()
+    return payload
+
+
+def batch_version():
+    """
+    Version tag and modification time of the published batch. Reads a single
+    snapshot row, or the max id/timestamp before any batch was published.
+    """
+    latest = (
+        BatchSnapshot.objects
+        .order_by('-updated_at')
+        .values_list('batch_id', 'updated_at')
+        .first()
+    )
+    if latest:
+        batch_id, updated_at = latest
+        return f"{batch_id}@{updated_at.timestamp()}", updated_at
+
+    stats = PredictionResult.objects.aggregate(last_id=Max('id'), last_ts=Max('timestamp'))
+    if stats['last_id'] is None:
+        return "empty", None
+    return f"{stats['last_ts'].isoformat()}#{stats['last_id']}", None
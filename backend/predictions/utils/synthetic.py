@@ -0,0 +1,80 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from predictions.machine_learning.registry import get_model
+from predictions.machine_learning.zone_mapper import get_zone_index
+from predictions.utils.predict_tools import FEATURE_COLUMNS, image_path_for
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SPECIES = ['rhino', 'elephant']
+
+
+def categories(name, fallback):
+    # Labels the fitted encoders accept, so generated rows go through data_prep
+    try:
+        return [str(label) for label in get_model(name).classes_]
+    except Exception:
+        return fallback
+
+
+def movement_frame(rows, timestamps=1, seed=0, start=START, in_zone=0.7):
+    """
+    Seeded AnimalMovement rows: ``rows`` animals at each of ``timestamps``
+    one-minute steps. ``in_zone`` of the fixes fall inside a camera zone.
+    """
+    rng = np.random.default_rng(seed)
+    total = rows * timestamps
+    frame = pd.DataFrame(
+        rng.normal(size=(total, len(FEATURE_COLUMNS))).astype(np.float64),
+        columns=FEATURE_COLUMNS,
+    )
+    frame['sex'] = rng.choice(categories('label_encoder_sex', ['F', 'M']), total)
+    frame['ToD'] = rng.choice(categories('label_encoder_tod', ['day', 'night']), total)
+    frame.insert(0, 'datetime', np.repeat([start + timedelta(minutes=i) for i in range(timestamps)], rows))
+    frame.insert(1, 'animal_id', np.tile(np.arange(rows), timestamps))
+    frame.insert(2, 'species', rng.choice(SPECIES, total))
+
+    bounds = get_zone_index().bounds
+    picked = bounds[rng.integers(len(bounds), size=total)]
+    lat = rng.uniform(picked[:, 0], picked[:, 1])
+    lon = rng.uniform(picked[:, 2], picked[:, 3])
+    # The rest are scattered over the whole area, mostly outside any zone
+    outside = rng.random(total) >= in_zone
+    lat[outside] = rng.uniform(bounds[:, 0].min() - 1, bounds[:, 1].max() + 1, outside.sum())
+    lon[outside] = rng.uniform(bounds[:, 2].min() - 1, bounds[:, 3].max() + 1, outside.sum())
+    frame['latitude'] = lat
+    frame['longtitude'] = lon
+    return frame
+
+
+def camera_image(rng, height, width):
+    """Smooth shapes plus sensor noise: compresses and decodes like a real photo."""
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    channels = [
+        127 + 100 * np.sin(x / rng.uniform(40, 200) + rng.uniform(0, 6))
+        * np.cos(y / rng.uniform(40, 200) + rng.uniform(0, 6))
+        for _ in range(3)
+    ]
+    image = np.stack(channels, axis=-1) + rng.normal(0, 8, (height, width, 3))
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def write_camera_images(timestamps, zones=None, seed=0, size=(720, 1280)):
+    """
+    Writes a JPEG for every (zone, timestamp) where ``image_path_for``
+    looks for it, under ``settings.MEDIA_ROOT``. Returns the paths.
+    """
+    rng = np.random.default_rng(seed)
+    zones = zones if zones is not None else get_zone_index().ids
+    paths = []
+    for ts in timestamps:
+        for zone in zones:
+            path = image_path_for(zone, ts)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            cv2.imwrite(path, camera_image(rng, *size), [cv2.IMWRITE_JPEG_QUALITY, 90])
+            paths.append(path)
+    return paths
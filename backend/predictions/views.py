@@ -1,9 +1,14 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.conf import settings
-import os
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
 from .models import PredictionResult
-from predictions.machine_learning.zone_mapper import coordinate_to_zone
+from predictions.utils.conditional import batch_conditional
+from predictions.utils.history import history_page
+from predictions.utils.live_feed import CHANNEL_AUDIENCES, event_stream
+from predictions.utils.metrics import render_prometheus
+from predictions.utils.snapshots import publish_snapshots, snapshot_payload
 
 @api_view(['POST'])
 def receive_prediction(request):
@@ -11,117 +16,30 @@ def receive_prediction(request):
     return Response({"message": "Predictions received successfully"}, status=201)
 
 @api_view(['GET'])
+@batch_conditional
 def map_view_data(request):
     """
     Returns rhino and elephant coordinates for the latest prediction batch.
     """
-    latest_timestamp = (
-        PredictionResult.objects
-        .order_by('-timestamp')
-        .values_list('timestamp', flat=True)
-        .first()
-    )
-
-    if not latest_timestamp:
-        return Response({
-            "rhinos": [],
-            "elephants": [],
-            "latest_timestamp": None
-        })
-
-    results = PredictionResult.objects.filter(
-        timestamp=latest_timestamp,
-        species__in=['rhino', 'elephant']
-    )
-
-    rhinos, elephants = [], []
-
-    for row in results:
-        entry = {
-            "id": row.animal_id,
-            "latitude": row.latitude,
-            "longitude": row.longtitude,
-        }
-        if row.species.lower() == 'rhino':
-            rhinos.append(entry)
-        elif row.species.lower() == 'elephant':
-            elephants.append(entry)
-
-    return Response({
-        "rhinos": rhinos,
-        "elephants": elephants,
-        "latest_timestamp": latest_timestamp
-    })
+    return Response(snapshot_payload("mapview"))
 
 
 @api_view(['GET'])
+@batch_conditional
 def get_xgb_results(request):
     """
     Returns all XGB predictions for the most recent timestamp.
     """
-    latest_ts = (
-        PredictionResult.objects
-        .order_by('-timestamp')
-        .values_list('timestamp', flat=True)
-        .distinct()
-        .first()
-    )
-
-    if not latest_ts:
-        return Response({"xgb_results": []})
-
-    recent_preds = PredictionResult.objects.filter(timestamp=latest_ts)
-    data = [
-        {
-            "id": pred.id,
-            "species": pred.species,
-            "prediction": pred.xgb_prediction,
-            "latitude": pred.latitude,
-            "longtitude": pred.longtitude,
-            "timestamp": pred.timestamp,
-        }
-        for pred in recent_preds
-    ]
-
-    return Response({"xgb_results": data})
+    return Response(snapshot_payload("xgb-results"))
 
 
 @api_view(['GET'])
+@batch_conditional
 def get_image_results(request):
     """
     Returns image classification results for the most recent poacher detection.
     """
-    recent_poacher = (
-        PredictionResult.objects
-        .filter(xgb_prediction="poacher")
-        .order_by('-timestamp')
-        .first()
-    )
-    if not recent_poacher:
-        return Response({
-            "message": "Camera Trap Off, No Poachers Detected For Now",
-        })
-
-    all_with_ts = PredictionResult.objects.filter(timestamp=recent_poacher.timestamp)
-    results = []
-
-    for row in all_with_ts:
-        if row.image_class_prediction and row.image_path:
-            try:
-                relative_path = os.path.relpath(row.image_path, settings.MEDIA_ROOT).replace("\\", "/")
-                image_url = f"{settings.MEDIA_URL}{relative_path}"
-            except Exception:
-                image_url = ""  # fallback if conversion fails
-
-            results.append({
-                "class_name": row.image_class_prediction,
-                "probability": row.probability,
-                "zone": coordinate_to_zone(row.latitude, row.longtitude),
-                "datetime": row.timestamp,
-                "image_url": image_url,
-            })
-
-    return Response({"image_results": results})
+    return Response(snapshot_payload("image-results"))
 
 
 @api_view(['POST'])
@@ -141,46 +59,44 @@ def validate_poacher(request):
 
     latest.image_class_prediction = "poacher"
     latest.save()
+    publish_snapshots()
 
     return Response({"message": "Image classification updated to poacher"})
 
 @api_view(['GET'])
+@batch_conditional
 def get_poaching_history(request):
     """
-    Returns latest poaching detections (with all relevant fields).
+    Returns poaching detections newest first, one page at a time. Filters:
+    ``since``/``until`` (ISO 8601), ``zone``, ``species`` and ``prediction``
+    (poacher by default, normal or all). Pass ``next_cursor`` back as
+    ``cursor`` for the following page; ``page_size`` is capped server-side.
     """
-    # Filter for poacher predictions, latest 20 entries
-    poaching_detections = (
-        PredictionResult.objects
-        .filter(xgb_prediction="poacher")
-        .order_by('-timestamp')[:20]
-    )
-
-    results = []
-    for row in poaching_detections:
-        try:
-            relative_path = os.path.relpath(row.image_path, settings.MEDIA_ROOT).replace("\\", "/")
-            image_url = f"{settings.MEDIA_URL}{relative_path}"
-        except Exception:
-            image_url = ""
+    try:
+        rows, next_cursor = history_page(request.query_params)
+    except ValueError as e:
+        return Response({"message": str(e)}, status=400)
 
-        results.append({
+    results = [
+        {
             "id": row.id,
             "timestamp": row.timestamp,
             "species": row.species,
             "xgb_prediction": row.xgb_prediction,
             "image_class_prediction": row.image_class_prediction,
-            "image_url": image_url,
-            "zone": coordinate_to_zone(row.latitude, row.longtitude),
+            "image_url": row.image_url or "",
+            "zone": row.zone,
             "latitude": row.latitude,
             "longtitude": row.longtitude,
             "pred_probability": row.probability
-            
-        })
+        }
+        for row in rows
+    ]
 
-    return Response({"poaching_detections": results})
+    return Response({"poaching_detections": results, "next_cursor": next_cursor})
 
 @api_view(['GET'])
+@batch_conditional
 def admin_notifications(request):
     """
     Admin notifications:
@@ -229,6 +145,7 @@ def admin_notifications(request):
 
 
 @api_view(['GET'])
+@batch_conditional
 def ranger_notifications(request):
     """
     Ranger notifications:
@@ -257,3 +174,44 @@ def ranger_notifications(request):
             }
         ]
     })
+
+
+async def live_feed(request):
+    """
+    Server-sent event stream of batch results, poacher alerts and image
+    results. ``?channel=admin|ranger`` selects the audience; reconnecting
+    clients resume via the Last-Event-ID header. Needs an ASGI server.
+    """
+    if not isinstance(request, ASGIRequest):
+        # WSGI collects an async stream into a list before sending it, so it would never answer
+        return JsonResponse({"message": "live/ needs an ASGI server, e.g. uvicorn backend.asgi:application"},
+                            status=501)
+
+    channel = request.GET.get("channel", "admin")
+    if channel not in CHANNEL_AUDIENCES:
+        return JsonResponse({"message": f"Unknown channel '{channel}'"}, status=400)
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    response = StreamingHttpResponse(
+        event_stream(channel, last_event_id),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # don't let a reverse proxy buffer the stream
+    return response
+
+
+def metrics(request):
+    """
+    Counters and latency histograms of this process in the Prometheus text
+    format, for clients in ``settings.METRICS['ALLOWED_IPS']``.
+    """
+    allowed = getattr(settings, 'METRICS', {}).get('ALLOWED_IPS')
+    if allowed is not None and request.META.get('REMOTE_ADDR') not in allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
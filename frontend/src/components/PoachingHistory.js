@@ -1,33 +1,31 @@
-import React, { useEffect, useState } from 'react';
+import React, { useState } from 'react';
 import './PoachingHistory.css';
 import CacheBustedImage from './CacheBustedImage'; // Import the new component
+import { useLiveRefresh } from './useLiveRefresh';
 
-const PoachingHistory = ({ fetchPoachingData }) => {
+const PoachingHistory = ({ fetchPoachingData, channel = 'admin' }) => {
   const [detections, setDetections] = useState([]);
   const [showImage, setShowImage] = useState(false);
   const [imageUrl, setImageUrl] = useState('');
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
 
-  useEffect(() => {
-    const fetchData = async () => {
-      setLoading(true);
-      setError(null);
-      try {
-        const data = await fetchPoachingData();
-        setDetections(data.poaching_detections || []);
-      } catch (error) {
-        console.error('Failed to fetch poaching detections:', error);
-        setError('Failed to load poaching detections.');
-      } finally {
-        setLoading(false);
-      }
-    };
+  // New detections arrive with batches; poll every 60s while the stream is down
+  const fetchData = async () => {
+    setLoading(true);
+    setError(null);
+    try {
+      const data = await fetchPoachingData();
+      setDetections(data.poaching_detections || []);
+    } catch (error) {
+      console.error('Failed to fetch poaching detections:', error);
+      setError('Failed to load poaching detections.');
+    } finally {
+      setLoading(false);
+    }
+  };
 
-    fetchData();
-    const interval = setInterval(fetchData, 60000); // Refresh every 60s
-    return () => clearInterval(interval);
-  }, [fetchPoachingData]);
+  useLiveRefresh(channel, ['batch'], fetchData, 60000);
 
   const openImage = (url) => {
     setImageUrl(url);
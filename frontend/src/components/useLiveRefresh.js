@@ -0,0 +1,64 @@
+import { useEffect, useRef } from "react";
+import { liveFeed } from "../endpoint/api";
+
+// One stream per channel, shared by every component on the page
+const streams = {};
+
+const openStream = (channel) => {
+  if (!streams[channel]) streams[channel] = { source: liveFeed(channel), users: 0 };
+  streams[channel].users += 1;
+  return streams[channel].source;
+};
+
+const closeStream = (channel) => {
+  const stream = streams[channel];
+  stream.users -= 1;
+  if (stream.users === 0) {
+    stream.source.close();
+    delete streams[channel];
+  }
+};
+
+// Calls refresh() on mount and whenever the live feed pushes one of the given
+// events; polls every pollMs instead while the stream is unavailable.
+export const useLiveRefresh = (channel, events, refresh, pollMs) => {
+  const refreshRef = useRef(refresh);
+  refreshRef.current = refresh;
+  const eventKey = events.join(",");
+
+  useEffect(() => {
+    const run = () => refreshRef.current();
+    run();
+
+    let interval = null;
+    const startPolling = () => {
+      if (interval === null) interval = setInterval(run, pollMs);
+    };
+    const stopPolling = () => {
+      if (interval !== null) clearInterval(interval);
+      interval = null;
+    };
+
+    if (typeof EventSource === "undefined") {
+      startPolling();
+      return stopPolling;
+    }
+    const source = openStream(channel);
+    const names = eventKey.split(",");
+    names.forEach((name) => source.addEventListener(name, run));
+    // The browser keeps retrying the stream; poll until it is back
+    const onOpen = () => {
+      stopPolling();
+      run();
+    };
+    source.addEventListener("error", startPolling);
+    source.addEventListener("open", onOpen);
+    return () => {
+      names.forEach((name) => source.removeEventListener(name, run));
+      source.removeEventListener("error", startPolling);
+      source.removeEventListener("open", onOpen);
+      closeStream(channel);
+      stopPolling();
+    };
+  }, [channel, eventKey, pollMs]);
+};
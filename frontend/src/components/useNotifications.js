@@ -1,5 +1,6 @@
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { adminNot, rangerNot } from "../endpoint/api";
+import { useLiveRefresh } from "./useLiveRefresh";
 
 export const useNotifications = (role = "admin") => {
   const [notifications, setNotifications] = useState([]);
@@ -39,11 +40,8 @@ export const useNotifications = (role = "admin") => {
     }
   };
 
-  useEffect(() => {
-    fetchNotifications();
-    const interval = setInterval(fetchNotifications, 5000);
-    return () => clearInterval(interval);
-  }, [role]);
+  // Refresh when the server pushes a new alert; poll every 5s while streaming isn't available
+  useLiveRefresh(role === "admin" ? "admin" : "ranger", ["alert"], fetchNotifications, 5000);
 
   const markAsRead = () => {
     if (notifications.length > 0) {
@@ -15,6 +15,7 @@ const HISTORY_URL = `${BASE_URL}history/`
 const USERS_URL = `${BASE_URL}users/`
 const ADMIN_NOTIFICATION = `${BASE_URL}admin-notification/`
 const RANGER_NOTIFICATION = `${BASE_URL}ranger-notification/`
+const LIVE_FEED_URL = `${BASE_URL}live/`
 
 export   const login = async (username, password) => {
     const response = await axios.post(LOGIN_URL,
@@ -166,4 +167,9 @@ export const rangerNot = async () => {
     const res =  await fetch(RANGER_NOTIFICATION);
     if (!res.ok) throw new Error('Failed to fetch notification');
     return await res.json();
-}
\ No newline at end of file
+}
+
+export const liveFeed = (channel) => {
+    // Server-sent events; the browser reconnects and resumes on its own
+    return new EventSource(`${LIVE_FEED_URL}?channel=${channel}`);
+}
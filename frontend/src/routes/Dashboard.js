@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react';
+import React, { useState } from 'react';
 import { MapContainer, TileLayer, Marker, Popup } from 'react-leaflet';
 import L from 'leaflet';
 import 'leaflet/dist/leaflet.css';
@@ -7,6 +7,7 @@ import './Dashboard.css';
 import PoachingHistory from '../components/PoachingHistory';
 import CacheBustedImage from '../components/CacheBustedImage'; // Import the new component
 import { mapview, getImageResults, getXgbResults, validatePoacher, getLastPoachingDetections } from '../endpoint/api.js';
+import { useLiveRefresh } from '../components/useLiveRefresh';
 import 'leaflet.awesome-markers';
 
 // FontAwesome icon component
@@ -27,89 +28,81 @@ const Dashboard = () => {
   const [showImage, setShowImage] = useState(false);
   const [imageResultRaw, setImageResultRaw] = useState(null);
 
-  // Fetch animal locations for the map
-  useEffect(() => {
-    const fetchMapData = async () => {
-      try {
-        const mapData = await mapview();
-        setElephantLocations(mapData.elephants || []);
-        setRhinoLocations(mapData.rhinos || []);
-      } catch (err) {
-        console.error("Error fetching map data:", err);
-      }
-    };
-
-    fetchMapData();
-    const interval = setInterval(fetchMapData, 15000);
-    return () => clearInterval(interval);
-  }, []);
-
-  // Fetch XGBoost and image classification results
-  useEffect(() => {
-    const fetchPredictions = async () => {
-      try {
-        const xgbResponse = await getXgbResults();
-        const xgbResults = xgbResponse.xgb_results || [];
-
-        if (xgbResults.length === 0) {
-          setXgbPredictions([]);
-        } else {
-          const poacherPreds = xgbResults.filter(p => p.prediction === 'poacher');
-
-          if (poacherPreds.length > 0) {
-            setXgbPredictions(poacherPreds.map(p => ({
-              id: p.id,
-              prediction: p.prediction,
-              species: p.species,
-              latitude: p.latitude.toFixed(6),
-              longtitude: p.longtitude.toFixed(6),
-              timestamp: p.timestamp,
-            })));
-          } else {
-            const speciesSet = new Set(xgbResults.map(p => p.species));
-            const summary = Array.from(speciesSet).map((species, idx) => ({
-              id: idx,
-              prediction: 'normal',
-              species,
-              latitude: '',
-              longtitude: '',
-              timestamp: '',
-            }));
-            setXgbPredictions(summary);
-          }
-        }
+  // Fetch animal locations for the map after every committed batch
+  const fetchMapData = async () => {
+    try {
+      const mapData = await mapview();
+      setElephantLocations(mapData.elephants || []);
+      setRhinoLocations(mapData.rhinos || []);
+    } catch (err) {
+      console.error("Error fetching map data:", err);
+    }
+  };
 
-        // Image classification
-        const imageResponse = await getImageResults();
-        const imageResults = imageResponse.image_results || [];
+  useLiveRefresh('admin', ['batch'], fetchMapData, 15000);
 
-        if (imageResults.length === 0) {
-          setImageClassPredictions([{ id: 0, detail: 'Awaiting image classification...', confidence: null }]);
-          setImageBaseUrl('');
-          setShowImage(false);
-          setImageResultRaw(null);
-        } else {
-          setImageClassPredictions(imageResults.map((p, index) => ({
-            id: index,
-            detail: `${p.class_name.toUpperCase()} — ${(p.probability * 100).toFixed(1)}%`,
-            class_name: p.class_name.toLowerCase(),
-            confidence: p.probability,
+  // Fetch XGBoost and image classification results after every committed batch (its images come with it)
+  const fetchPredictions = async () => {
+    try {
+      const xgbResponse = await getXgbResults();
+      const xgbResults = xgbResponse.xgb_results || [];
+
+      if (xgbResults.length === 0) {
+        setXgbPredictions([]);
+      } else {
+        const poacherPreds = xgbResults.filter(p => p.prediction === 'poacher');
+
+        if (poacherPreds.length > 0) {
+          setXgbPredictions(poacherPreds.map(p => ({
+            id: p.id,
+            prediction: p.prediction,
+            species: p.species,
+            latitude: p.latitude.toFixed(6),
+            longtitude: p.longtitude.toFixed(6),
+            timestamp: p.timestamp,
           })));
-          setImageResultRaw(imageResults[0]);
-          if (imageResults[0].image_url) {
-            // Store the base URL without cache busting parameters
-            setImageBaseUrl(`http://localhost:8000${imageResults[0].image_url}`);
-          }
+        } else {
+          const speciesSet = new Set(xgbResults.map(p => p.species));
+          const summary = Array.from(speciesSet).map((species, idx) => ({
+            id: idx,
+            prediction: 'normal',
+            species,
+            latitude: '',
+            longtitude: '',
+            timestamp: '',
+          }));
+          setXgbPredictions(summary);
+        }
+      }
+
+      // Image classification
+      const imageResponse = await getImageResults();
+      const imageResults = imageResponse.image_results || [];
+
+      if (imageResults.length === 0) {
+        setImageClassPredictions([{ id: 0, detail: 'Awaiting image classification...', confidence: null }]);
+        setImageBaseUrl('');
+        setShowImage(false);
+        setImageResultRaw(null);
+      } else {
+        setImageClassPredictions(imageResults.map((p, index) => ({
+          id: index,
+          detail: `${p.class_name.toUpperCase()} — ${(p.probability * 100).toFixed(1)}%`,
+          class_name: p.class_name.toLowerCase(),
+          confidence: p.probability,
+        })));
+        setImageResultRaw(imageResults[0]);
+        if (imageResults[0].image_url) {
+          // Store the base URL without cache busting parameters
+          setImageBaseUrl(`http://localhost:8000${imageResults[0].image_url}`);
         }
-      } catch (error) {
-        console.error('Polling failed:', error);
       }
-    };
+    } catch (error) {
+      console.error('Polling failed:', error);
+    }
+  };
 
-    fetchPredictions();
-    const intervalId = setInterval(fetchPredictions, 5000);
-    return () => clearInterval(intervalId);
-  }, []);
+  useLiveRefresh('admin', ['batch'], fetchPredictions, 5000);
 
   // Button handlers
   const handleIgnore = () => alert("Ignored.");
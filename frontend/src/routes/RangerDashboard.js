@@ -5,6 +5,7 @@ import 'leaflet/dist/leaflet.css';
 import './RangerDashboard.css';
 import { getImageResults, getXgbResults, mapview } from '../endpoint/api';
 import { useNotifications } from '../components/useNotifications';
+import { useLiveRefresh } from '../components/useLiveRefresh';
 
 const poacherIcon = L.icon({
   iconUrl: 'https://cdn-icons-png.flaticon.com/512/684/684908.png',
@@ -49,70 +50,62 @@ const RangerDashboard = ({ username = 'Ranger', onLogout }) => {
     }
   }, [count]);
 
-  // Fetch animal locations
-  useEffect(() => {
-    const fetchAnimalLocations = async () => {
-      try {
-        const data = await mapview();
-        setElephantLocations(data.elephants || []);
-        setRhinoLocations(data.rhinos || []);
-      } catch (error) {
-        console.error('Error fetching animal locations:', error);
-      }
-    };
+  // Fetch animal locations after every committed batch
+  const fetchAnimalLocations = async () => {
+    try {
+      const data = await mapview();
+      setElephantLocations(data.elephants || []);
+      setRhinoLocations(data.rhinos || []);
+    } catch (error) {
+      console.error('Error fetching animal locations:', error);
+    }
+  };
 
-    fetchAnimalLocations();
-    const interval = setInterval(fetchAnimalLocations, 50000);
-    return () => clearInterval(interval);
-  }, []);
+  useLiveRefresh('ranger', ['batch'], fetchAnimalLocations, 50000);
 
-  // Fetch poacher detection and image results
-  useEffect(() => {
-    const fetchPoacherData = async () => {
-      try {
-        const xgbResponse = await getXgbResults();
-        const xgbResults = xgbResponse.xgb_results || [];
-        const poacherPreds = xgbResults.filter((p) => p.prediction === 'poacher');
+  // Fetch poacher detection and image results after every committed batch
+  const fetchPoacherData = async () => {
+    try {
+      const xgbResponse = await getXgbResults();
+      const xgbResults = xgbResponse.xgb_results || [];
+      const poacherPreds = xgbResults.filter((p) => p.prediction === 'poacher');
 
-        if (poacherPreds.length === 0) {
-          // No movement-based poacher prediction
-          setPoacherDetected(false);
-          setPoacherLocation(null);
-          setPoacherImageUrl('');
-          return;
-        }
+      if (poacherPreds.length === 0) {
+        // No movement-based poacher prediction
+        setPoacherDetected(false);
+        setPoacherLocation(null);
+        setPoacherImageUrl('');
+        return;
+      }
 
-        // Now check the image classifier
-        const imageResponse = await getImageResults();
-        const imageResults = imageResponse.image_results || [];
-        const poacherImage = imageResults.find(
-          (ir) => ir.class_name.toLowerCase() === 'poacher'
-        );
+      // Now check the image classifier
+      const imageResponse = await getImageResults();
+      const imageResults = imageResponse.image_results || [];
+      const poacherImage = imageResults.find(
+        (ir) => ir.class_name.toLowerCase() === 'poacher'
+      );
 
-        if (poacherImage && poacherImage.image_url) {
-          // Only set detection true if image classifier confirms poacher
-          const poacher = poacherPreds[0];
-          setPoacherLocation({ lat: poacher.latitude, lng: poacher.longtitude });
-          setPoacherDetected(true);
-          setPoacherImageUrl(`http://localhost:8000${poacherImage.image_url}`);
-        } else {
-          // Movement suggested poacher, but no image confirmation
-          setPoacherDetected(false);
-          setPoacherLocation(null);
-          setPoacherImageUrl('');
-        }
-      } catch (error) {
-        console.error('Error fetching poacher data:', error);
+      if (poacherImage && poacherImage.image_url) {
+        // Only set detection true if image classifier confirms poacher
+        const poacher = poacherPreds[0];
+        setPoacherLocation({ lat: poacher.latitude, lng: poacher.longtitude });
+        setPoacherDetected(true);
+        setPoacherImageUrl(`http://localhost:8000${poacherImage.image_url}`);
+      } else {
+        // Movement suggested poacher, but no image confirmation
         setPoacherDetected(false);
         setPoacherLocation(null);
         setPoacherImageUrl('');
       }
-    };
+    } catch (error) {
+      console.error('Error fetching poacher data:', error);
+      setPoacherDetected(false);
+      setPoacherLocation(null);
+      setPoacherImageUrl('');
+    }
+  };
 
-    fetchPoacherData();
-    const interval = setInterval(fetchPoacherData, 60000);
-    return () => clearInterval(interval);
-  }, []);
+  useLiveRefresh('ranger', ['batch'], fetchPoacherData, 60000);
 
   // Clear notification when poacher popup viewed
   const onPoacherPopupOpen = () => {